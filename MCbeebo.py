@@ -6,7 +6,6 @@ import re
 import asyncio
 import random
 import json
-import requests
 import logging
 from discord.ui import Button, View
 from discord.ext import commands, tasks
@@ -15,6 +14,10 @@ from python_aternos import Client
 from exaroton import Exaroton
 from dotenv import load_dotenv
 from discord.ext.commands import cooldown, BucketType, Context
+from cogs.exaroton_api import close_client
+from cogs.mojang import close_resolver
+from cogs.storage import get_storage, close_storage
+from cogs.data_cache import close_cache
 
 # commit 27ce7b6
 
@@ -45,11 +48,7 @@ EXAROTON_SERVER_ID = os.getenv("EXAROTON_SERVER_ID")
 exaroton_client = Exaroton(EXAROTON_TOKEN)
 ANNOUNCEMENT_CHANNEL_ID = 1383563592447557722
 GUILD_ID = 1046624035464810496
-STATUS_CHANNEL_ID = 1383563592447557722
 DEV_LOG_CHANNEL_ID = 1369314903701065768
-SUGGESTIONS_FILE = "suggestions.json"
-MC_SERVER_PORT = int(os.getenv("MC_SERVER_PORT", 50430))
-MC_SERVER_IP = os.getenv("MC_SERVER_IP")
 DEV_USER_ID = [546650815297880066, 448896936481652777, 424532190290771998, 858462569043722271]
 COOLDOWN_SECONDS = 600
 cooldowns = {}  # Maps user_id to last suggestion timestamp
@@ -59,7 +58,6 @@ intents.message_content = True
 intents.presences = True
 intents.members = True
 bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
-last_status = "offline"
 boot_time = time.time()
 
 @bot.event
@@ -73,57 +71,23 @@ async def on_ready():
             color=0xb0c0ff
         )
         await channel.send(embed=embed)
-    check_server_status.start()
 
-@tasks.loop(hours=8)
-async def check_server_status():
-    global last_status
-    channel = bot.get_channel(CHANNEL_ID)
-    server = JavaServer.lookup(SERVER_ADDRESS)
-
-    try:
-        status = server.status()
-        if last_status == "offline":
-            embed = discord.Embed(title="**Minecraft Server is ONLINE!**", color=0xb0c0ff)
-            embed.add_field(name="Java IP", value="termite.exaroton.me", inline=False)
-            embed.add_field(name="Players", value=f"{status.players.online}/{status.players.max}", inline=False)
-
-            if status.players.online > 0:
-                players = ', '.join([player.name for player in status.players.sample]) if status.players.sample else "Unknown players"
-                embed.add_field(name="Who's Online", value=players, inline=False)
-
-            embed.set_footer(text="Summon the squad before Termite falls asleep.")
-            await channel.send(content=ROLE_TO_TAG, embed=embed)
-            last_status = "online"
-        else:
-            print("Server still online. No alert sent.")
-    except:
-        print("Server is offline or unreachable.")
-        if last_status == "online":
-            embed = discord.Embed(title="**Termite is OFFLINE or SLEEPING**", color=0xff5555)
-            embed.set_footer(text="Someone needs to manually start it or join to wake it up.")
-            await channel.send(content="<@&1368225900486721616>", embed=embed)
-        last_status = "offline"
-
-@commands.command(name="mcstatus", aliases=["mcserverstatus"])
-async def mcserver_status(self, ctx):
-    await ctx.trigger_typing()
-
-    headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-    url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
+@bot.command(name="mcstatus", aliases=["mcserverstatus"])
+async def mcserver_status(ctx):
+    await ctx.typing()
 
+    exaroton_cog = bot.get_cog("ExarotonCog")
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        api_snapshot = await exaroton_cog.status_service.get_api()
+        data = api_snapshot.server.raw
     except Exception as e:
         print(f"[Exaroton API Error] {e}")
         await ctx.send("❌ Failed to fetch server status from Exaroton.")
         return
 
-    motd = data.get("motd", {}).get("clean", ["Unknown MOTD"])[0]
+    motd = api_snapshot.motd
     status_text = data.get("statusText", "Offline")
-    time_started = data.get("timeStarted")
+    time_started = api_snapshot.server.time_started
 
     # Calculate uptime
     uptime_str = "Unavailable"
@@ -138,15 +102,12 @@ async def mcserver_status(self, ctx):
         except Exception as e:
             print(f"[Uptime Parse Error] {e}")
 
-    # Try JavaServer status check
-    try:
-        server = JavaServer.lookup(SERVER_ADDRESS)
-        status = server.status(retries=1)
-        online_players = [p.name for p in status.players.sample] if status.players.sample else []
-        players_str = ", ".join(online_players) if online_players else "Nobody online"
-        player_count_str = f"{status.players.online}/{status.players.max}"
-    except Exception as e:
-        print(f"[JavaServer Error] {e}")
+    # Player list from the shared status snapshot
+    snapshot = await exaroton_cog.status_service.get()
+    if snapshot.source != "None":
+        players_str = ", ".join(snapshot.players) if snapshot.players else "Nobody online"
+        player_count_str = f"{len(snapshot.players)}/{snapshot.max_players}"
+    else:
         players_str = "Unavailable"
         player_count_str = "?"
 
@@ -159,16 +120,11 @@ async def mcserver_status(self, ctx):
     embed.add_field(name="Uptime", value=uptime_str, inline=True)
     embed.add_field(name="Players Online", value=player_count_str, inline=False)
     embed.add_field(name="Who's Online", value=players_str, inline=False)
+    embed.set_footer(text=f"Updated {snapshot.age_text()}")
 
     await ctx.send(embed=embed)
 
 
-    await ctx.send(embed=embed)
-    print(json.dumps(data, indent=2))
-
-
-
-
 @bot.command()
 async def listcommands(ctx):
     cmds = [cmd.name for cmd in bot.commands]
@@ -780,16 +736,6 @@ async def help(ctx):
     embed.set_footer(text="Bot made for keeping the realm alive and the squad notified.")
     await ctx.send(embed=embed)
 
-@tasks.loop(time=datetime.time(hour=3, minute=0, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))))  # 3AM EST
-async def daily_server_status():
-    channel = bot.get_channel(STATUS_CHANNEL_ID)
-    try:
-        server = JavaServer.lookup(f"{MC_SERVER_IP}:{MC_SERVER_PORT}")
-        status = server.status()
-        await channel.send(f"🟢 Minecraft server is online with {status.players.online} player(s).")
-    except Exception as e:
-        await channel.send(f"🔴 Minecraft server is offline or unreachable.\nError: `{e}`")
-
 @bot.command()
 async def githelp(ctx):
     if ctx.author.id not in [546650815297880066, 448896936481652777]:
@@ -806,20 +752,10 @@ async def githelp(ctx):
     await ctx.send(embed=embed)
 
 # --- Suggestion Collection ---
-def load_suggestions():
-    if not os.path.exists(SUGGESTIONS_FILE):
-        return []
-    with open(SUGGESTIONS_FILE, "r") as f:
-        return json.load(f)
-
-def save_suggestions(suggestions):
-    with open(SUGGESTIONS_FILE, "w") as f:
-        json.dump(suggestions, f, indent=2)
-
 @bot.command()
 async def suggest(ctx, action=None, *, arg=None):
     """Submit or manage suggestions for the bot"""
-    suggestions = load_suggestions()
+    storage = get_storage()
     now = time.time()  # Capture time once
 
     # Cooldown check first
@@ -850,14 +786,10 @@ async def suggest(ctx, action=None, *, arg=None):
     # Add suggestion
     if action not in ["view", "delete"]:
         message = f"{action} {arg}" if arg else action
-        suggestion = {
-            "user": str(ctx.author),
-            "user_id": user_id,
-            "message": message,
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        suggestions.append(suggestion)
-        save_suggestions(suggestions)
+        await storage.execute(
+            "INSERT INTO suggestions (user, user_id, message, timestamp) VALUES (?, ?, ?, ?)",
+            (str(ctx.author), user_id, message, datetime.datetime.utcnow().isoformat())
+        )
 
         # Log to dev channel
         log_channel = bot.get_channel(DEV_LOG_CHANNEL_ID)
@@ -886,12 +818,14 @@ async def suggest(ctx, action=None, *, arg=None):
 
     # View suggestions
     if action == "view":
-        filtered = suggestions
         if arg:
-            arg = arg.lower()
-            filtered = [s for s in suggestions 
-                       if arg in s["message"].lower() or 
-                       arg in s["user"].lower()]
+            filtered = await storage.fetchall(
+                "SELECT user, message FROM suggestions "
+                "WHERE instr(lower(message), :q) OR instr(lower(user), :q) ORDER BY id",
+                {"q": arg.lower()}
+            )
+        else:
+            filtered = await storage.fetchall("SELECT user, message FROM suggestions ORDER BY id")
 
         if not filtered:
             await ctx.send("No suggestions found.")
@@ -962,9 +896,11 @@ async def suggest(ctx, action=None, *, arg=None):
             return
 
         index = int(arg) - 1
-        if 0 <= index < len(suggestions):
-            deleted = suggestions.pop(index)
-            save_suggestions(suggestions)
+        deleted = await storage.fetchone(
+            "SELECT id, user FROM suggestions ORDER BY id LIMIT 1 OFFSET ?", (index,)
+        ) if index >= 0 else None
+        if deleted:
+            await storage.execute("DELETE FROM suggestions WHERE id = ?", (deleted["id"],))
             await ctx.send(f"🗑️ Deleted suggestion #{index + 1} by {deleted['user']}.")
         else:
             await ctx.send("Invalid suggestion index.")
@@ -972,12 +908,8 @@ async def suggest(ctx, action=None, *, arg=None):
 versionfix_cooldown = 0  # Shared cooldown for version fix
 EXAROTON_TOKEN = os.getenv("EXAROTON_TOKEN")
 exaroton = Exaroton(EXAROTON_TOKEN)
-challenge_file = "data/challenges.json"
 if not os.path.exists("data"):
     os.makedirs("data")
-if not os.path.exists(challenge_file):
-    with open(challenge_file, "w") as f:
-        json.dump({}, f)
 
 @bot.command()
 @commands.is_owner()
@@ -1018,46 +950,42 @@ async def challenge(ctx):
 
 @challenge.command(name="start")
 async def start_challenge(ctx, *, name: str):
-    with open(challenge_file, "r") as f:
-        data = json.load(f)
-    data[name] = []
-    with open(challenge_file, "w") as f:
-        json.dump(data, f, indent=2)
+    def start(db):
+        # Restarting a challenge clears its entries but keeps its place in the order
+        db.execute("INSERT OR IGNORE INTO challenges (name) VALUES (?)", (name,))
+        db.execute(
+            "DELETE FROM challenge_entries WHERE challenge_id = (SELECT id FROM challenges WHERE name = ?)", (name,)
+        )
+    await get_storage().transaction(start)
     await ctx.send(f"✅ Challenge **{name}** started!")
 
 @challenge.command(name="submit")
 async def submit_challenge(ctx, *, proof: str):
-    with open(challenge_file, "r") as f:
-        data = json.load(f)
-    if not data:
+    storage = get_storage()
+    latest = await storage.fetchone("SELECT id, name FROM challenges ORDER BY id DESC LIMIT 1")
+    if not latest:
         await ctx.send("⚠️ No active challenges.")
         return
-    latest = list(data.keys())[-1]
-    data[latest].append({
-        "user": str(ctx.author),
-        "proof": proof,
-        "timestamp": datetime.datetime.utcnow().isoformat()
-    })
-    with open(challenge_file, "w") as f:
-        json.dump(data, f, indent=2)
-    await ctx.send(f"✅ Submission added to **{latest}**!")
+    await storage.execute(
+        "INSERT INTO challenge_entries (challenge_id, user, proof, timestamp) VALUES (?, ?, ?, ?)",
+        (latest["id"], str(ctx.author), proof, datetime.datetime.utcnow().isoformat())
+    )
+    await ctx.send(f"✅ Submission added to **{latest['name']}**!")
 
 @challenge.command(name="leaderboard")
 async def challenge_leaderboard(ctx):
-    with open(challenge_file, "r") as f:
-        data = json.load(f)
-    if not data:
+    storage = get_storage()
+    latest = await storage.fetchone("SELECT id, name FROM challenges ORDER BY id DESC LIMIT 1")
+    if not latest:
         await ctx.send("⚠️ No challenges found.")
         return
-    latest = list(data.keys())[-1]
-    entries = data[latest]
-    leaderboard = {}
-    for entry in entries:
-        user = entry["user"]
-        leaderboard[user] = leaderboard.get(user, 0) + 1
-    sorted_lb = sorted(leaderboard.items(), key=lambda x: x[1], reverse=True)
-    desc = "\n".join([f"**{i+1}. {u}** — {c} entries" for i, (u, c) in enumerate(sorted_lb)])
-    embed = discord.Embed(title=f"🏆 {latest} Leaderboard", description=desc or "No entries yet.", color=0xffc300)
+    sorted_lb = await storage.fetchall(
+        "SELECT user, COUNT(*) AS entries FROM challenge_entries WHERE challenge_id = ? "
+        "GROUP BY user ORDER BY entries DESC, MIN(id)",
+        (latest["id"],)
+    )
+    desc = "\n".join([f"**{i+1}. {row['user']}** — {row['entries']} entries" for i, row in enumerate(sorted_lb)])
+    embed = discord.Embed(title=f"🏆 {latest['name']} Leaderboard", description=desc or "No entries yet.", color=0xffc300)
     await ctx.send(embed=embed)
 
 @bot.command(aliases=["mcerror"])
@@ -1182,6 +1110,14 @@ async def main():
     await bot.load_extension("cogs.utils")
     await bot.load_extension("cogs.helpcog")
     await bot.load_extension("cogs.admin")
-    await bot.start(TOKEN)
-
-asyncio.run(main())
+    try:
+        await bot.start(TOKEN)
+    finally:
+        await close_client()
+        await close_resolver()
+        await close_storage()
+        await close_cache()
+
+# Guarded so worker processes (the !pinmap renderer) can import this module without starting the bot
+if __name__ == "__main__":
+    asyncio.run(main())
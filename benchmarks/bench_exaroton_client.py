@@ -0,0 +1,67 @@
+"""Event-loop stall benchmark: blocking `requests` vs the shared async Exaroton client.
+
+Spins up a fake Exaroton API on localhost with configurable latency, then issues the
+same number of server lookups both ways while a heartbeat task measures how long the
+event loop was unable to run.
+
+    python -m benchmarks.bench_exaroton_client --calls 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_exaroton import FakeExaroton  # noqa: E402
+from benchmarks.stall_monitor import StallMonitor, HEARTBEAT_SECONDS  # noqa: E402
+from cogs.exaroton_api import ExarotonClient  # noqa: E402
+
+async def run_blocking(base_url: str, calls: int):
+    import requests
+
+    async def one():
+        # Mirrors the old cog code: a synchronous call straight on the event loop
+        requests.get(f"{base_url}/servers/fake", headers={"Authorization": "Bearer x"}, timeout=10)
+
+    with StallMonitor() as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(calls)))
+        await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+        elapsed = time.perf_counter() - started
+    return elapsed, monitor
+
+
+async def run_async(base_url: str, calls: int):
+    client = ExarotonClient(token="x", server_id="fake", base_url=base_url)
+    try:
+        with StallMonitor() as monitor:
+            started = time.perf_counter()
+            await asyncio.gather(*(client.get_server() for _ in range(calls)))
+            await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+            elapsed = time.perf_counter() - started
+    finally:
+        await client.close()
+    return elapsed, monitor
+
+
+async def main(calls: int, latency: float):
+    # The fake runs on its own thread so the blocking "before" run can't starve it
+    base_url, stop = FakeExaroton(latency=latency).start_in_thread()
+    try:
+        print(f"{calls} server lookups against fake API ({latency * 1000:.0f} ms latency)\n")
+        print(f"{'mode':<18}{'wall (s)':>10}{'stalled (s)':>14}{'worst stall (ms)':>19}")
+        for label, runner_fn in (("requests (before)", run_blocking), ("aiohttp (after)", run_async)):
+            elapsed, monitor = await runner_fn(base_url, calls)
+            print(f"{label:<18}{elapsed:>10.3f}{monitor.total:>14.3f}{monitor.worst * 1000:>19.1f}")
+    finally:
+        stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake API latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.latency))
@@ -0,0 +1,107 @@
+"""Mojang lookup benchmark: one GET per name vs the cached, batched MojangResolver.
+
+Replays a burst of !linkmc / !checkuuid style lookups (names repeat, some don't
+exist) against a local Mojang stand-in that enforces a request window, then
+replays it again to show the warm cache. Every answer is checked against the
+stand-in's players.
+
+    python -m benchmarks.bench_mojang
+    python -m benchmarks.bench_mojang --lookups 1000 --names 300 --limit 60 --period 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_mojang import FakeMojang  # noqa: E402
+from cogs.mojang import MojangAPIError, MojangResolver  # noqa: E402
+
+
+async def run_per_name(base_url, lookups):
+    """The old access pattern (one uncached GET per command), minus the event-loop blocking."""
+    answers, failed = {}, 0
+    async with aiohttp.ClientSession() as session:
+        async def one(name):
+            nonlocal failed
+            async with session.get(f"{base_url}/users/profiles/minecraft/{name}") as resp:
+                if resp.status == 200:
+                    answers[name] = (await resp.json())["id"]
+                elif resp.status == 404:
+                    answers[name] = None
+                else:
+                    failed += 1
+        await asyncio.gather(*(one(name) for name in lookups))
+    return answers, failed
+
+
+async def run_resolver(resolver, lookups):
+    answers, failed = {}, 0
+
+    async def one(name):
+        nonlocal failed
+        try:
+            profile = await resolver.resolve(name)
+            answers[name] = profile.uuid if profile else None
+        except MojangAPIError:
+            failed += 1
+    await asyncio.gather(*(one(name) for name in lookups))
+    return answers, failed
+
+
+async def main(args):
+    rng = random.Random(7)
+    fake = FakeMojang(latency=args.latency, limit=args.limit, period=args.period)
+    real = [f"Player{i}" for i in range(args.names)]
+    ghosts = [f"Ghost{i}" for i in range(args.names // 5)]
+    for name in real:
+        fake.add_player(name)
+    lookups = [rng.choice(real + ghosts) for _ in range(args.lookups)]
+    lookups = [name.upper() if rng.random() < 0.2 else name for name in lookups]  # names are case-insensitive
+    expected = {name: fake.players.get(name.lower(), (None, None))[1] for name in lookups}
+
+    base_url = await fake.start()
+    print(f"{args.lookups} lookups of {len(set(n.lower() for n in lookups))} distinct names, "
+          f"Mojang stand-in allows {args.limit} requests / {args.period:g}s\n")
+    print(f"{'mode':<22}{'wall (s)':>10}{'requests':>10}{'429s':>7}{'failed':>8}{'wrong':>7}")
+
+    def report(label, started, before, answers, failed):
+        wrong = sum(1 for name, pid in answers.items() if pid != expected[name])
+        print(f"{label:<22}{time.perf_counter() - started:>10.3f}{fake.request_count - before[0]:>10}"
+              f"{fake.rate_limited - before[1]:>7}{failed:>8}{wrong:>7}")
+        return wrong
+
+    resolver = MojangResolver(base_url=base_url, rate=args.limit / args.period, burst=min(args.limit, 10))
+    wrong = 0
+    try:
+        before, started = (fake.request_count, fake.rate_limited), time.perf_counter()
+        wrong += report("per-name GET (before)", started, before, *await run_per_name(base_url, lookups))
+        fake._window.clear()  # give the resolver the same fresh window
+
+        for label in ("resolver (cold)", "resolver (warm)"):
+            before, started = (fake.request_count, fake.rate_limited), time.perf_counter()
+            answers, failed = await run_resolver(resolver, lookups)
+            wrong += report(label, started, before, answers, failed)
+            if failed:
+                wrong += failed
+        print(f"\nresolver cache hits: {resolver.cache_hits}")
+    finally:
+        await resolver.close()
+        await fake.stop()
+    print("PASS" if not wrong else "FAIL")
+    return wrong
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=300)
+    parser.add_argument("--names", type=int, default=80)
+    parser.add_argument("--limit", type=int, default=30, help="stand-in requests allowed per period")
+    parser.add_argument("--period", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in latency in seconds")
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
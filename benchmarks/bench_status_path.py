@@ -0,0 +1,249 @@
+"""Status-path latency benchmark: fetch_server_status and the status commands against local fakes.
+
+Each scenario stands up a fake Exaroton API, a fake Server List Ping responder and a
+stubbed scraper (each with its own latency and failure injection), builds a real
+ExarotonCog pointed at them, and fires calls at a fixed concurrency. It reports
+p50/p95/p99 latency, event-loop lag and how many outbound requests each source saw.
+
+    python -m benchmarks.bench_status_path
+    python -m benchmarks.bench_status_path --scenario mc-down --mode command --requests 200 --concurrency 50
+    python -m benchmarks.bench_status_path --mc-latency 0.05 --api-failure 0.5 --scenario custom
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The scraper is always stubbed here; don't require Playwright just to import the cog
+try:
+    import playwright.async_api  # noqa: F401
+except ImportError:
+    stub = types.ModuleType("playwright.async_api")
+    stub.async_playwright = None
+    sys.modules["playwright.async_api"] = stub
+    sys.modules.setdefault("playwright", types.ModuleType("playwright"))
+
+from benchmarks.fake_exaroton import FakeExaroton  # noqa: E402
+from benchmarks.fake_minecraft import FakeMinecraft  # noqa: E402
+from benchmarks.stall_monitor import StallMonitor, HEARTBEAT_SECONDS  # noqa: E402
+import cogs.exaroton as exaroton  # noqa: E402
+from cogs.exaroton_api import ExarotonClient, STATUS_ONLINE  # noqa: E402
+
+
+@dataclass
+class Scenario:
+    name: str
+    mc_latency: float = 0.01
+    mc_failure: float = 0.0
+    mc_hang: bool = False  # failures hang until mcstatus times out instead of dropping
+    api_latency: float = 0.05
+    api_failure: float = 0.0
+    scraper_latency: float = 1.5
+    scraper_failure: float = 0.0
+    online: bool = True
+
+
+SCENARIOS = {
+    "healthy": Scenario("healthy"),
+    "api-slow": Scenario("api-slow", api_latency=1.0),
+    "mc-down": Scenario("mc-down", mc_failure=1.0),
+    "mc-hang": Scenario("mc-hang", mc_failure=1.0, mc_hang=True),
+    "flaky": Scenario("flaky", mc_failure=0.3, api_failure=0.3, scraper_failure=0.3),
+    "all-down": Scenario("all-down", mc_failure=1.0, api_failure=1.0),
+    "asleep": Scenario("asleep", mc_failure=1.0, online=False),
+}
+
+
+class StubScraper:
+    """Stands in for BrowserPool + scrape_status."""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.request_count = 0
+
+    @asynccontextmanager
+    async def page(self):
+        yield None
+
+    async def close(self):
+        pass
+
+    async def scrape(self, page=None):
+        self.request_count += 1
+        await asyncio.sleep(self.scenario.scraper_latency)
+        if random_fail(self.scenario.scraper_failure):
+            raise RuntimeError("injected failure")
+        return {"status": "Online", "players": ["Vinny"], "motd": "A fake Termite"}
+
+
+def random_fail(rate: float) -> bool:
+    return bool(rate) and random.random() < rate
+
+
+class FakeContext:
+    def __init__(self):
+        self.author = types.SimpleNamespace(id=exaroton.DEV_USER_ID[0], roles=[])
+        self.message = types.SimpleNamespace(author=self.author, guild=None, channel=None)
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+    async def typing(self):
+        pass
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def build_cog(scenario: Scenario, api_url: str, ws_url: str, mc_address: str, scraper: StubScraper, ttl: float):
+    bot = types.SimpleNamespace(get_channel=lambda _id: None, get_cog=lambda _name: None)
+    os.environ.setdefault("CHANNEL_ID", "0")
+    cog = exaroton.ExarotonCog(bot)
+    # Only the status path is under test: no background polling, sampling or streaming
+    cog.sample_credits.cancel()
+    await cog.scheduler.stop()
+    await cog.stream.stop()
+    await cog.browser_pool.close()
+
+    cog.api = ExarotonClient(token="x", server_id="fake", base_url=api_url)
+    cog.browser_pool = scraper
+    cog.server_address = mc_address
+    cog.status_service.set_ttl(ttl)
+    return cog
+
+
+async def drive(label, call, requests: int, concurrency: int):
+    latencies, errors = [], 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    with StallMonitor() as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+        wall = time.perf_counter() - started
+    return {
+        "label": label,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "errors": errors,
+        "wall": wall,
+        "lag_worst": monitor.worst * 1000,
+        "lag_p99": percentile(monitor.stalls, 99) * 1000,
+    }
+
+
+async def run_scenario(scenario: Scenario, mode: str, requests: int, concurrency: int, ttl: float):
+    fake_api = FakeExaroton(latency=scenario.api_latency, failure_rate=scenario.api_failure)
+    fake_api.server["status"] = STATUS_ONLINE if scenario.online else 0
+    fake_api.server["players"] = {"max": 20, "count": 1 if scenario.online else 0, "list": ["Vinny"] if scenario.online else []}
+    fake_mc = FakeMinecraft(latency=scenario.mc_latency, failure_rate=scenario.mc_failure, hang=scenario.mc_hang, players=["Vinny"])
+    scraper = StubScraper(scenario)
+
+    api_url = await fake_api.start()
+    host, port = await fake_mc.start()
+    workdir = tempfile.TemporaryDirectory()
+    cwd = os.getcwd()
+    os.chdir(workdir.name)  # status history and JSON data files land in a throwaway dir
+    original_scrape = exaroton.scrape_status
+    exaroton.scrape_status = scraper.scrape
+    cog = None
+    rows = []
+    try:
+        cog = await build_cog(scenario, api_url, fake_api.ws_url, f"{host}:{port}", scraper, ttl)
+        runs = []
+        if mode in ("probe", "both"):
+            runs.append(("fetch_server_status", cog.fetch_server_status))
+        if mode in ("command", "both"):
+            runs.append(("!status", lambda: exaroton.ExarotonCog.status.callback(cog, FakeContext())))
+            runs.append(("!players", lambda: exaroton.ExarotonCog.server_players.callback(cog, FakeContext())))
+
+        for label, call in runs:
+            for breaker in cog.breakers.values():
+                breaker.reset()
+            before = (fake_api.request_count, fake_mc.request_count, scraper.request_count)
+            row = await drive(label, call, requests, concurrency)
+            row.update(
+                api=fake_api.request_count - before[0],
+                mc=fake_mc.request_count - before[1],
+                scraper=scraper.request_count - before[2],
+            )
+            rows.append(row)
+    finally:
+        exaroton.scrape_status = original_scrape
+        if cog:
+            # Shielded refreshes can outlive the calls that started them
+            inflight = [c._inflight for c in (cog.status_service.status, cog.status_service.api) if c._inflight]
+            await asyncio.gather(*inflight, return_exceptions=True)
+            await cog.api.close()
+            cog.history.close()
+        os.chdir(cwd)
+        workdir.cleanup()
+        await fake_mc.stop()
+        await fake_api.stop()
+    return rows
+
+
+async def main(args):
+    if args.scenario == "custom":
+        scenarios = [Scenario(
+            "custom",
+            mc_latency=args.mc_latency, mc_failure=args.mc_failure, mc_hang=args.mc_hang,
+            api_latency=args.api_latency, api_failure=args.api_failure,
+            scraper_latency=args.scraper_latency, scraper_failure=args.scraper_failure,
+        )]
+    elif args.scenario == "all":
+        scenarios = list(SCENARIOS.values())
+    else:
+        scenarios = [SCENARIOS[args.scenario]]
+
+    print(f"{args.requests} calls per run, concurrency {args.concurrency}, status cache TTL {args.ttl:g}s\n")
+    header = (f"{'scenario':<10}{'call':<21}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'err':>5}"
+              f"{'lag p99':>9}{'lag max':>9}{'api':>6}{'mc':>6}{'scrape':>7}")
+    print(header)
+    print("-" * len(header))
+    for scenario in scenarios:
+        for row in await run_scenario(scenario, args.mode, args.requests, args.concurrency, args.ttl):
+            print(f"{scenario.name:<10}{row['label']:<21}{row['p50']:>8.1f}{row['p95']:>8.1f}{row['p99']:>8.1f}"
+                  f"{row['errors']:>5}{row['lag_p99']:>9.1f}{row['lag_worst']:>9.1f}"
+                  f"{row['api']:>6}{row['mc']:>6}{row['scraper']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", default="all", choices=["all", "custom", *SCENARIOS])
+    parser.add_argument("--mode", default="both", choices=["probe", "command", "both"],
+                        help="probe = uncached fetch_server_status; command = !status/!players through the cache")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--ttl", type=float, default=exaroton.STATUS_CACHE_TTL_SECONDS, help="status cache TTL in seconds")
+    custom = Scenario("custom")
+    for field_name in ("mc_latency", "mc_failure", "api_latency", "api_failure", "scraper_latency", "scraper_failure"):
+        parser.add_argument(f"--{field_name.replace('_', '-')}", type=float, default=getattr(custom, field_name))
+    parser.add_argument("--mc-hang", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""Websocket subscriber check: ExarotonStream against the local Exaroton stand-in.
+
+Pushes status changes over the fake's websocket and drops the connection mid-way,
+checking that the subscriber applies each push, starts the online-only streams,
+and reconnects on its own:
+
+  * initial status     the status sent on connect reaches on_status
+  * push online        a pushed status updates ServerInfo and starts console/tick/heap
+  * reconnect          after the fake drops every socket, the stream is connected again
+  * push after drop    a status pushed on the new socket is applied too
+
+    python -m benchmarks.check_exaroton_stream
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_exaroton import FakeExaroton  # noqa: E402
+import cogs.exaroton_stream as exaroton_stream  # noqa: E402
+from cogs.exaroton_api import STATUS_OFFLINE, STATUS_ONLINE  # noqa: E402
+
+TIMEOUT_SECONDS = 5
+
+
+async def wait_for(condition, timeout: float = TIMEOUT_SECONDS) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def main():
+    exaroton_stream.BACKOFF_INITIAL_SECONDS = 0.2  # keep the reconnect wait short
+    fake = FakeExaroton()
+    await fake.start()
+    pushed = []
+
+    async def on_status(server):
+        pushed.append((server.status, list(server.players)))
+
+    stream = exaroton_stream.ExarotonStream(on_status=on_status, token="x", url=fake.ws_url)
+    stream.start()
+    failed = 0
+
+    def report(name, ok, detail):
+        nonlocal failed
+        failed += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name:<18}{detail}")
+
+    try:
+        ok = await wait_for(lambda: stream.connected and pushed)
+        report("initial status", ok, f"connected={stream.connected}, pushes={pushed}")
+
+        await fake.set_status(STATUS_ONLINE, players=["Vinny", "Toast"])
+        ok = await wait_for(lambda: stream.server.status == STATUS_ONLINE
+                            and set(fake.started_streams) >= set(exaroton_stream.STREAMS))
+        report("push online", ok and stream.server.players == ["Vinny", "Toast"],
+               f"status={stream.server.status}, players={stream.server.players}, started={sorted(set(fake.started_streams))}")
+
+        before = stream.reconnects
+        await fake.drop_connections()
+        ok = await wait_for(lambda: stream.reconnects > before and stream.connected and fake.sockets)
+        report("reconnect", ok, f"reconnects={stream.reconnects}, connected={stream.connected}")
+
+        await fake.set_status(STATUS_OFFLINE, players=[])
+        ok = await wait_for(lambda: stream.server.status == STATUS_OFFLINE and pushed[-1] == (STATUS_OFFLINE, []))
+        report("push after drop", ok, f"status={stream.server.status}, last push={pushed[-1]}")
+    finally:
+        await stream.stop()
+        await fake.stop()
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
@@ -0,0 +1,126 @@
+"""Local stand-in for the Exaroton API: REST endpoints plus the server websocket.
+
+    fake = FakeExaroton(latency=0.05)
+    base_url = await fake.start()          # http://127.0.0.1:<port>/v1
+    ws_url = fake.ws_url                   # ws://127.0.0.1:<port>/v1/servers/fake/websocket
+    await fake.set_status(1, players=["Vinny"])   # pushed to every websocket subscriber
+
+`start_in_thread()` runs it on its own loop, for benchmarks that block the caller's loop.
+"""
+import asyncio
+import json
+import random
+import threading
+
+from aiohttp import web, WSMsgType
+
+SERVER_ID = "fake"
+
+
+class FakeExaroton:
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, credits: float = 420.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.credits = credits
+        self.request_count = 0
+        self.server = {
+            "id": SERVER_ID,
+            "name": "Termite",
+            "address": "termite.exaroton.me",
+            "motd": "A fake Termite",
+            "status": 0,
+            "players": {"max": 20, "count": 0, "list": []},
+        }
+        self.sockets = set()
+        self.started_streams = []
+        self._runner = None
+        self.base_url = None
+        self.ws_url = None
+
+    async def _delay_or_fail(self):
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise web.HTTPServiceUnavailable(text="injected failure")
+
+    def _ok(self, data):
+        return web.json_response({"success": True, "error": None, "data": data})
+
+    async def _get_server(self, request):
+        await self._delay_or_fail()
+        return self._ok(self.server)
+
+    async def _get_credits(self, request):
+        await self._delay_or_fail()
+        return self._ok({"credits": self.credits})
+
+    async def _restart(self, request):
+        await self._delay_or_fail()
+        return web.Response(status=204)
+
+    async def _websocket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        try:
+            await ws.send_str(json.dumps({"type": "connected"}))
+            await ws.send_str(json.dumps({"type": "ready", "data": {"serverId": SERVER_ID}}))
+            await ws.send_str(json.dumps({"stream": "status", "type": "status", "data": self.server}))
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    payload = json.loads(msg.data)
+                    if payload.get("type") == "start":
+                        self.started_streams.append(payload.get("stream"))
+                        await ws.send_str(json.dumps({"stream": payload.get("stream"), "type": "started"}))
+        finally:
+            self.sockets.discard(ws)
+        return ws
+
+    async def broadcast(self, message: dict):
+        for ws in list(self.sockets):
+            await ws.send_str(json.dumps(message))
+
+    async def set_status(self, status: int, players=None):
+        self.server["status"] = status
+        if players is not None:
+            self.server["players"]["list"] = list(players)
+            self.server["players"]["count"] = len(players)
+        await self.broadcast({"stream": "status", "type": "status", "data": self.server})
+
+    async def drop_connections(self):
+        """Close every websocket, to exercise the subscriber's reconnect path."""
+        for ws in list(self.sockets):
+            await ws.close()
+
+    async def start(self, port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get("/v1/servers/{server_id}", self._get_server)
+        app.router.add_post("/v1/servers/{server_id}/restart", self._restart)
+        app.router.add_get("/v1/servers/{server_id}/websocket", self._websocket)
+        app.router.add_get("/v1/credits", self._get_credits)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{bound_port}/v1"
+        self.ws_url = f"ws://127.0.0.1:{bound_port}/v1/servers/{SERVER_ID}/websocket"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, port: int = 0):
+        """Serve from a dedicated thread/loop. Returns (base_url, stop)."""
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        base_url = asyncio.run_coroutine_threadsafe(self.start(port), loop).result()
+
+        def stop():
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+        return base_url, stop
@@ -0,0 +1,103 @@
+"""Minimal Minecraft Java Server List Ping responder, for pointing mcstatus at localhost.
+
+    fake = FakeMinecraft(latency=0.02, players=["Vinny"])
+    host, port = await fake.start()
+    status = await (await JavaServer.async_lookup(f"{host}:{port}")).async_status()
+
+`failure_rate` makes that share of connections either drop straight away or hang
+(`hang=True`), which is what a sleeping Exaroton server looks like to mcstatus.
+"""
+import asyncio
+import json
+import random
+import struct
+
+
+def _varint(value: int) -> bytes:
+    out = b""
+    value &= 0xFFFFFFFF
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out += bytes([byte | 0x80])
+        else:
+            return out + bytes([byte])
+
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    result = 0
+    for shift in range(0, 35, 7):
+        byte = (await reader.readexactly(1))[0]
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result
+    raise ValueError("VarInt too long")
+
+
+async def _read_packet(reader: asyncio.StreamReader) -> bytes:
+    return await reader.readexactly(await _read_varint(reader))
+
+
+def _packet(packet_id: int, payload: bytes) -> bytes:
+    body = _varint(packet_id) + payload
+    return _varint(len(body)) + body
+
+
+class FakeMinecraft:
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, hang: bool = False,
+                 players=None, max_players: int = 20, motd: str = "A fake Termite"):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.hang = hang
+        self.players = list(players or [])
+        self.max_players = max_players
+        self.motd = motd
+        self.request_count = 0
+        self._server = None
+        self._closing = asyncio.Event()
+
+    def _status_json(self) -> bytes:
+        return json.dumps({
+            "version": {"name": "1.21.1", "protocol": 767},
+            "players": {
+                "max": self.max_players,
+                "online": len(self.players),
+                "sample": [{"name": name, "id": f"00000000-0000-0000-0000-{i:012d}"} for i, name in enumerate(self.players)],
+            },
+            "description": {"text": self.motd},
+        }).encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.request_count += 1
+        try:
+            if self.failure_rate and random.random() < self.failure_rate:
+                if self.hang:
+                    await self._closing.wait()
+                return
+            await _read_packet(reader)  # handshake
+            while True:
+                packet = await _read_packet(reader)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if packet[:1] == b"\x00":  # status request
+                    payload = self._status_json()
+                    writer.write(_packet(0x00, _varint(len(payload)) + payload))
+                elif packet[:1] == b"\x01":  # ping: echo the token back
+                    writer.write(_packet(0x01, packet[1:9] or struct.pack(">q", 0)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            self._closing.set()
+            await self._server.wait_closed()
+            self._server = None
@@ -0,0 +1,83 @@
+"""Local stand-in for the Mojang profile API, with Mojang's rate limiting.
+
+    fake = FakeMojang({"Vinny": "0f1e..."}, latency=0.05, limit=600, period=600)
+    base_url = await fake.start()          # http://127.0.0.1:<port>
+    resolver = MojangResolver(base_url=base_url)
+
+Serves the single-name GET /users/profiles/minecraft/<name> the bot used to call
+and the bulk POST /profiles/minecraft it calls now. Every request (either kind)
+spends one slot of a sliding `limit`-per-`period` window; past it, 429 with Retry-After.
+"""
+import asyncio
+import time
+import uuid
+from collections import deque
+
+from aiohttp import web
+
+BULK_LIMIT = 10
+
+
+class FakeMojang:
+    def __init__(self, players: dict = None, latency: float = 0.0, limit: int = 600, period: float = 600.0):
+        self.players = {name.lower(): (name, pid) for name, pid in (players or {}).items()}
+        self.latency = latency
+        self.limit = limit
+        self.period = period
+        self.request_count = 0
+        self.rate_limited = 0
+        self.names_asked = 0
+        self._window = deque()
+        self._runner = None
+        self.base_url = None
+
+    def add_player(self, name: str, pid: str = None) -> str:
+        pid = pid or uuid.uuid4().hex
+        self.players[name.lower()] = (name, pid)
+        return pid
+
+    async def _admit(self):
+        self.request_count += 1
+        now = time.monotonic()
+        while self._window and self._window[0] <= now - self.period:
+            self._window.popleft()
+        if len(self._window) >= self.limit:
+            self.rate_limited += 1
+            retry_after = max(1, int(self._window[0] + self.period - now + 0.999))
+            raise web.HTTPTooManyRequests(headers={"Retry-After": str(retry_after)})
+        self._window.append(now)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _single(self, request):
+        await self._admit()
+        self.names_asked += 1
+        found = self.players.get(request.match_info["name"].lower())
+        if found is None:
+            return web.Response(status=404)
+        return web.json_response({"id": found[1], "name": found[0]})
+
+    async def _bulk(self, request):
+        await self._admit()
+        names = await request.json()
+        if not isinstance(names, list) or len(names) > BULK_LIMIT:
+            raise web.HTTPBadRequest(text="bad batch")
+        self.names_asked += len(names)
+        found = [self.players[n.lower()] for n in names if n.lower() in self.players]
+        return web.json_response([{"id": pid, "name": name} for name, pid in found])
+
+    async def start(self, port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get("/users/profiles/minecraft/{name}", self._single)
+        app.router.add_post("/profiles/minecraft", self._bulk)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,34 @@
+"""Event-loop lag probe shared by the benchmarks."""
+import asyncio
+
+HEARTBEAT_SECONDS = 0.01
+
+
+class StallMonitor:
+    """Heartbeat that records how late each tick fires — i.e. how long the loop was blocked."""
+
+    def __init__(self):
+        self.stalls = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + HEARTBEAT_SECONDS
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            self.stalls.append(max(0.0, loop.time() - expected))
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    @property
+    def total(self):
+        return sum(s for s in self.stalls if s > HEARTBEAT_SECONDS)
+
+    @property
+    def worst(self):
+        return max(self.stalls, default=0.0)
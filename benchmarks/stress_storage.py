@@ -0,0 +1,177 @@
+"""Concurrency stress test for the storage layers: proves concurrent mutations don't lose updates.
+
+Fires many overlapping writers at the real code paths and then checks the totals:
+
+  * PinPoint.add_pin           every concurrent !mark gets its own id, none overwritten, all indexed,
+                               and deleting the newest pin doesn't free its id
+  * ExarotonCog.add_donation   N donations of 1 credit add up to N, in SQLite and on the leaderboard
+  * LinkStore.claim            N racing claims of one MC username: exactly one wins, and the
+                               name and UUID indexes point at the winner
+  * DataCache.transaction      N read-await-write increments of one JSON value add up to N,
+                               a raising transaction leaves no trace, and the flushed file agrees
+
+A naive get/await/put run is included as a control, to show the harness catches lost updates.
+
+    python -m benchmarks.stress_storage
+    python -m benchmarks.stress_storage --writers 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Only the storage helpers are exercised; don't require Playwright just to import the cogs
+try:
+    import playwright.async_api  # noqa: F401
+except ImportError:
+    stub = types.ModuleType("playwright.async_api")
+    stub.async_playwright = None
+    sys.modules["playwright.async_api"] = stub
+    sys.modules.setdefault("playwright", types.ModuleType("playwright"))
+
+from cogs.data_cache import DataCache  # noqa: E402
+from cogs.storage import Storage  # noqa: E402
+import cogs.storage as storage_module  # noqa: E402
+
+
+async def gather_limited(coros, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(coro):
+        async with gate:
+            return await coro
+    return await asyncio.gather(*(one(c) for c in coros))
+
+
+async def yield_a_bit():
+    # Enough to let other writers interleave between the read and the write
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+async def stress_pins(storage, writers, concurrency):
+    from cogs.pin_index import SpatialIndex, TextIndex
+    from cogs.pin_map import TileCache
+    from cogs.pinpoint import PinPoint
+    cog = types.SimpleNamespace(storage=storage, spatial=SpatialIndex(), text=TextIndex(), tiles=TileCache())
+    ids = await gather_limited(
+        [PinPoint.add_pin(cog, i, 64, -i, f"pin {i}", 1, 1) for i in range(writers)], concurrency
+    )
+    rows = await storage.fetchval("SELECT COUNT(*) FROM pins")
+    indexed = len(cog.spatial)
+    # Deleting the newest pin must not free its id for the next mark
+    await PinPoint.delete_pin(cog, max(ids))
+    next_id = await PinPoint.add_pin(cog, 0, 64, 0, "after delete", 1, 1)
+    ok = len(set(ids)) == writers and rows == writers and indexed == writers and next_id > max(ids)
+    return ok, (f"{len(set(ids))} unique ids, {rows} rows, {indexed} indexed for {writers} marks; "
+                f"next id after deleting {max(ids)} is {next_id}")
+
+
+async def stress_donations(storage, writers, concurrency):
+    from cogs.exaroton import ExarotonCog
+    from cogs.ranked_index import RankedIndex
+    cog = types.SimpleNamespace(storage=storage, donor_ranks=RankedIndex("donations", "user_id", "total"))
+    await gather_limited([ExarotonCog.add_donation(cog, 42, 1.0) for _ in range(writers)], concurrency)
+    total = await storage.fetchval("SELECT total FROM donations WHERE user_id = '42'")
+    ranked = cog.donor_ranks.score(42)
+    return total == writers == ranked, f"total {total:g} ({ranked:g} on the leaderboard) for {writers} donations of 1"
+
+
+async def stress_links(storage, writers, concurrency):
+    from cogs.links import LinkStore
+    links = LinkStore(storage)
+    results = await gather_limited(
+        [links.claim(1000 + i, "Vinny" if i % 2 else "vinny", "uuid") for i in range(writers)], concurrency
+    )
+    winners = sum(1 for conflict in results if conflict is None)
+    rows = await storage.fetchval("SELECT COUNT(*) FROM mc_links WHERE username = 'Vinny' COLLATE NOCASE")
+    # The reverse indexes must agree with the table: same owner by name and by UUID, and a reload finds it too
+    owner = links.whois("VINNY")
+    reloaded = LinkStore(storage)
+    await reloaded.load()
+    ok = winners == 1 and rows == 1 and owner is not None and owner == links.by_uuid("uuid") == reloaded.whois("vinny")
+    return ok, f"{winners} claim(s) succeeded, {rows} link row(s), indexed to {owner and owner['discord_id']}"
+
+
+async def stress_cache(cache, path, writers, concurrency):
+    async def increment():
+        async with cache.transaction(path) as data:
+            value = data.get("n", 0)
+            await yield_a_bit()
+            data["n"] = value + 1
+
+    async def fail_midway():
+        try:
+            async with cache.transaction(path) as data:
+                data["n"] = -1
+                data["junk"] = True
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+    await gather_limited([increment() for _ in range(writers)] + [fail_midway() for _ in range(10)], concurrency)
+    await cache.close()
+    with open(path) as f:
+        on_disk = json.load(f)
+    ok = cache.get(path).get("n") == writers and on_disk == {"n": writers}
+    return ok, f"in memory {cache.get(path)}, on disk {on_disk}, {cache.metrics()['flushes']} flush(es)"
+
+
+async def control_naive(cache, path, writers, concurrency):
+    async def increment():
+        data = cache.get(path)
+        value = data.get("n", 0)
+        await yield_a_bit()
+        data["n"] = value + 1
+        cache.mark_dirty(path)
+
+    await gather_limited([increment() for _ in range(writers)], concurrency)
+    lost = writers - cache.get(path).get("n", 0)
+    await cache.close()
+    # The control passes when it *does* lose updates, i.e. the test can see the race
+    return lost > 0 or concurrency == 1, f"{lost} of {writers} updates lost without a transaction"
+
+
+async def main(args):
+    workdir = tempfile.TemporaryDirectory()
+    cwd = os.getcwd()
+    os.chdir(workdir.name)  # keep the one-shot JSON import away from the real data/ files
+    storage = Storage(os.path.join(workdir.name, "stress.db"))
+    storage_module._storage = storage  # cog helpers that call get_storage() use this one too
+    cache_path = os.path.join(workdir.name, "counter.json")
+    control_path = os.path.join(workdir.name, "control.json")
+
+    checks = [
+        ("pins", lambda: stress_pins(storage, args.writers, args.concurrency)),
+        ("donations", lambda: stress_donations(storage, args.writers, args.concurrency)),
+        ("link claims", lambda: stress_links(storage, args.writers, args.concurrency)),
+        ("cache txn", lambda: stress_cache(DataCache(debounce=0.01), cache_path, args.writers, args.concurrency)),
+        ("control", lambda: control_naive(DataCache(debounce=0.01), control_path, args.writers, args.concurrency)),
+    ]
+    print(f"{args.writers} writers per check, concurrency {args.concurrency}\n")
+    failed = 0
+    try:
+        for name, check in checks:
+            started = time.perf_counter()
+            ok, detail = await check()
+            failed += not ok
+            print(f"{'PASS' if ok else 'FAIL'}  {name:<12}{(time.perf_counter() - started) * 1000:>8.1f} ms  {detail}")
+    finally:
+        await storage.close()
+        storage_module._storage = None
+        os.chdir(cwd)
+        workdir.cleanup()
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
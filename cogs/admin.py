@@ -1,28 +1,38 @@
 import discord
 from discord.ext import commands
 from cogs.utils import UtilsCog
-import requests
+from cogs.exaroton_api import get_client
+from cogs.data_cache import get_cache
 import os
 import time
 
-EXAROTON_TOKEN = os.getenv("EXAROTON_TOKEN")
-EXAROTON_SERVER_ID = os.getenv("EXAROTON_SERVER_ID")
 GRAND_USER_ID = [448896936481652777, 858462569043722271]
 cooldowns = {}
 COOLDOWN_SECONDS = 30
 
-HEADERS = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-EXAROTON_BASE = "https://api.exaroton.com/v1/servers"
-
-def get_server_data():
-    url = f"{EXAROTON_BASE}/{EXAROTON_SERVER_ID}"
-    response = requests.get(url, headers=HEADERS)
-    return response.json() if response.status_code == 200 else None
+async def get_server_data():
+    try:
+        return (await get_client().get_server()).raw
+    except Exception as e:
+        print(f"[Exaroton API Error] {e}")
+        return None
 
 class AdminCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def fetch_server_data(self):
+        """Returns (raw server data, age text), preferring the shared status cache."""
+        exaroton = self.bot.get_cog("ExarotonCog")
+        if not exaroton:
+            return await get_server_data(), "just now"
+        try:
+            snapshot = await exaroton.status_service.get_api()
+            return snapshot.server.raw, snapshot.age_text()
+        except Exception as e:
+            print(f"[Exaroton API Error] {e}")
+            return None, None
+
     def dev_check(self, user_id):
         return user_id in GRAND_USER_ID
 
@@ -53,7 +63,7 @@ class AdminCog(commands.Cog):
         if await self.handle_cooldown(ctx):
             return
 
-        data = get_server_data()
+        data, age = await self.fetch_server_data()
         if not data or "host" not in data:
             await ctx.send("❌ Could not fetch uptime information.")
             return
@@ -61,26 +71,24 @@ class AdminCog(commands.Cog):
         uptime = data["host"].get("uptime", 0)
         minutes = uptime // 60
         hours = minutes // 60
-        await ctx.send(f"<:beebo:1383282292478312519> Server has been online for **{hours}h {minutes % 60}m**.")
+        await ctx.send(f"<:beebo:1383282292478312519> Server has been online for **{hours}h {minutes % 60}m**. _(updated {age})_")
 
     @commands.command(name="projectedburn", aliases=["burnproject", "burner"])
     async def projected_burn(self, ctx):
         if await self.handle_cooldown(ctx):
             return
 
-        data = get_server_data()
-        if not data:
-            await ctx.send("🔥 Couldn't fetch burn rate info.")
-            return
-
-        credit_balance = float(data.get("credits", 0))
-        burn_rate = float(data.get("settings", {}).get("creditPerHour", 0))
-        if burn_rate == 0:
+        exaroton = self.bot.get_cog("ExarotonCog")
+        try:
+            forecast = await exaroton.forecaster.forecast()
+        except Exception as e:
+            print(f"[Burn Forecast Error] {e}")
+            forecast = None
+        if not forecast or forecast.balance is None:
             await ctx.send("🔥 Burn rate is not currently available.")
             return
 
-        hours_left = credit_balance / burn_rate
-        await ctx.send(f"🔥 With **{credit_balance:.2f}** credits and a burn rate of **{burn_rate:.2f}/hr**, the server can run for approximately **{hours_left:.1f} hours**.")
+        await ctx.send(f"🔥 With **{forecast.balance:.2f}** credits and a burn rate of **{forecast.rate:.2f}/hr** online, the server can run for approximately {forecast.runway_text()}.")
 
 
     @commands.command(name="sessionlength", aliases=["session"])
@@ -88,14 +96,14 @@ class AdminCog(commands.Cog):
         if await self.handle_cooldown(ctx):
             return
 
-        data = get_server_data()
+        data, age = await self.fetch_server_data()
         if not data or "host" not in data:
             await ctx.send("❌ Could not fetch session data.")
             return
 
         uptime = data["host"].get("uptime", 0)
         minutes = uptime // 60
-        await ctx.send(f"⏱️ Current session length is **{minutes} minutes**.")
+        await ctx.send(f"⏱️ Current session length is **{minutes} minutes**. _(updated {age})_")
 
     @commands.command(name="restartserver")
     async def restart_server(self, ctx):
@@ -103,12 +111,45 @@ class AdminCog(commands.Cog):
             await ctx.send("🚫 You don't have permission to restart the server.")
             return
 
-        url = f"{EXAROTON_BASE}/{EXAROTON_SERVER_ID}/restart"
-        response = requests.post(url, headers=HEADERS)
-        if response.status_code == 204:
+        try:
+            await get_client().restart_server()
             await ctx.send("🔄 Restarting the server...")
-        else:
+        except Exception as e:
+            print(f"[Restart Error] {e}")
             await ctx.send("❌ Failed to restart the server.")
 
+    @commands.command(name="datacache", aliases=["cachestats"])
+    async def data_cache(self, ctx):
+        """Dev-only: write-back cache flush counts and bytes written per data file."""
+        if not self.dev_check(ctx.author.id):
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        metrics = get_cache().metrics()
+        embed = discord.Embed(
+            title="🗄️ Data File Cache",
+            description=f"**{metrics['flushes']}** flushes • **{metrics['bytes_written'] / 1024:.1f} KiB** written • **{metrics['dirty']}** dirty",
+            color=0x462f80
+        )
+        for path, stats in sorted(metrics["files"].items())[:24]:
+            value = f"{stats['flushes']} flushes • {stats['bytes_written']:,} B • {stats['hits']} hits"
+            if stats["last_flush"]:
+                value += f"\nLast flush <t:{int(stats['last_flush'])}:R>"
+            if stats["dirty"]:
+                value += "\n✏️ Pending flush"
+            if stats["last_error"]:
+                value += f"\n⚠️ {stats['last_error'][:100]}"
+            embed.add_field(name=path, value=value, inline=False)
+
+        challonge = self.bot.get_cog("ChallongeCog")
+        journals = [challonge.alerted, challonge.optouts] if challonge else []
+        if journals:
+            lines = [
+                f"`{j.name}` seq {j.seq} • {j.tail} in tail • {j.appends} appends • {j.compactions} compactions"
+                for j in journals
+            ]
+            embed.add_field(name="📓 Journals", value="\n".join(lines), inline=False)
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(AdminCog(bot))
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 2))
+MAX_USES = int(os.getenv("BROWSER_MAX_USES", 50))
+MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", 600))
+RSS_CHECK_SECONDS = 30  # walking /proc isn't free; memory doesn't move fast enough to need it per scrape
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "plausible.io",
+    "cloudflareinsights.com",
+)
+LAUNCH_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--no-first-run", "--mute-audio"]
+
+
+def _descendant_rss_mb() -> float:
+    """RSS of every process spawned under the bot (the Playwright driver and Chromium), Linux only."""
+    if not os.path.isdir("/proc"):
+        return 0.0
+    children = {}
+    rss_kb = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        children.setdefault(int(fields.get("PPid", "0").strip()), []).append(int(pid))
+        rss_kb[int(pid)] = int(fields.get("VmRSS", "0 kB").split()[0])
+
+    total, stack = 0, list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+
+class BrowserPool:
+    """Keeps one headless Chromium warm for the status scraper.
+
+    Pages are reused between scrapes and capped by a semaphore. The browser is
+    recycled after `max_uses` pages or once its process tree passes `max_rss_mb`,
+    but only when no scrape is in flight.
+    """
+
+    def __init__(self, max_pages: int = MAX_PAGES, max_uses: int = MAX_USES, max_rss_mb: int = MAX_RSS_MB):
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.uses = 0
+        self.launches = 0
+        self.rss_mb = 0.0  # as of the last check
+        self._rss_checked = 0.0
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        self._in_use = 0
+        self._slots = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+
+    async def _route(self, route):
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser and self._browser.is_connected():
+                return
+            await self._shutdown()
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            self._context = await self._browser.new_context()
+            await self._context.route("**/*", self._route)
+            self.uses = 0
+            self.launches += 1
+            print(f"[BrowserPool] Launched Chromium (launch #{self.launches})")
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._slots:
+            # Counted before launching so a concurrent recycle can't pull the browser out from under us
+            self._in_use += 1
+            page = None
+            healthy = True
+            try:
+                await self._ensure_browser()
+                page = self._idle_pages.pop() if self._idle_pages else await self._context.new_page()
+                yield page
+            except Exception:
+                healthy = False
+                raise
+            finally:
+                self._in_use -= 1
+                if page is not None:
+                    self.uses += 1
+                    if healthy and not page.is_closed():
+                        self._idle_pages.append(page)
+                    else:
+                        await self._close_page(page)
+                await self._maybe_recycle()
+
+    async def _maybe_recycle(self):
+        if self._in_use or not self._browser:
+            return
+        if time.monotonic() - self._rss_checked >= RSS_CHECK_SECONDS:
+            self._rss_checked = time.monotonic()
+            self.rss_mb = await asyncio.to_thread(_descendant_rss_mb)
+        if self.uses >= self.max_uses or self.rss_mb > self.max_rss_mb:
+            async with self._lock:
+                if self._in_use:
+                    return
+                print(f"[BrowserPool] Recycling Chromium after {self.uses} uses ({self.rss_mb:.0f} MB)")
+                self.rss_mb, self._rss_checked = 0.0, 0.0  # measure the fresh browser on its first release
+                await self._shutdown()
+
+    async def _close_page(self, page):
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _shutdown(self):
+        for page in self._idle_pages:
+            await self._close_page(page)
+        self._idle_pages.clear()
+        for closer in (self._context, self._browser):
+            if closer:
+                try:
+                    await closer.close()
+                except Exception as e:
+                    print(f"[BrowserPool] Close error: {e}")
+        if self._playwright:
+            await self._playwright.stop()
+        self._playwright = self._browser = self._context = None
+
+    async def close(self):
+        async with self._lock:
+            await self._shutdown()
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._browser and self._browser.is_connected()),
+            "launches": self.launches,
+            "uses": self.uses,
+            "idle_pages": len(self._idle_pages),
+            "in_use": self._in_use,
+            "rss_mb": round(self.rss_mb),
+        }
@@ -1,28 +1,31 @@
 import discord
 from discord.ext import commands, tasks
 from discord.ui import View, Button
-import aiohttp, os, json
+import aiohttp, os, json, asyncio
 from cogs.utils import UtilsCog
+from cogs.storage import get_storage
+from cogs.data_cache import get_cache
+from cogs.journal import Journal
+from cogs.ranked_index import RankedIndex
 
 
 MAP_FILE = "data/tourney_map.json"
 SCORE_FILE = "data/tourney_scores.json"
-ELO_FILE = "data/elo_scores.json"
-MATCH_HISTORY_FILE = "data/match_history.json"
+DEFAULT_ELO = 1000
 ARCHIVE_FILE = "data/archived_slugs.json"
 ALERT_CACHE = "data/alerted_matches.json"
 OPTOUT_FILE = "data/match_ping_optouts.json"
+PENDING_FILE = "data/pending_reports.json"
 LOG_CHANNEL_ID = 1366761199949054013
 
 def load_json(path):
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r") as f:
-        return json.load(f)
+    return get_cache().get(path)
 
-def save_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+def add_to_slug(state, event):
+    """Journal reducer for slug -> [ids] sets (alerted match ids, opted-out users)."""
+    items = state.setdefault(event["slug"], [])
+    if event["value"] not in items:
+        items.append(event["value"])
 
 class ChallongeCog(commands.Cog):
     def __init__(self, bot):
@@ -30,10 +33,21 @@ class ChallongeCog(commands.Cog):
         self.api_key = os.getenv("CHALLONGE_API_KEY")
         self.username = os.getenv("CHALLONGE_USERNAME")
         self.base_url = "https://api.challonge.com/v1"
+        self.storage = get_storage()
+        self.alerted = Journal("alerted_matches", add_to_slug, legacy_file=ALERT_CACHE)
+        self.optouts = Journal("match_ping_optouts", add_to_slug, legacy_file=OPTOUT_FILE)
+        self.alert_lock = asyncio.Lock()
+        self.elo_ranks = RankedIndex("elo", "user_id", "score")
         self.match_alerts.start()
 
-    def cog_unload(self):
+    async def cog_load(self):
+        await self.elo_ranks.load(self.storage)
+
+    async def cog_unload(self):
         self.match_alerts.cancel()
+        await get_cache().flush()
+        await self.alerted.close()
+        await self.optouts.close()
 
     def auth(self):
         return aiohttp.BasicAuth(self.username, self.api_key)
@@ -50,7 +64,11 @@ class ChallongeCog(commands.Cog):
     @commands.command(aliases=["mh"])
     async def match_history(self, ctx, slug: str, member: discord.Member = None):
         uid = str((member or ctx.author).id)
-        history = load_json(MATCH_HISTORY_FILE).get(slug, {}).get(uid, [])
+        history = await self.storage.fetchall(
+            "SELECT match_id, opponent, result FROM match_history WHERE slug = ? AND user_id = ? ORDER BY id DESC LIMIT 10",
+            (slug, uid),
+        )
+        history.reverse()
 
         if not history:
             await ctx.send("No match history found.")
@@ -61,7 +79,7 @@ class ChallongeCog(commands.Cog):
             color=0x00bfff
         )
 
-        for i, entry in enumerate(history[-10:], start=1):
+        for i, entry in enumerate(history, start=1):
             opponent_id = int(entry["opponent"])
             opponent = ctx.guild.get_member(opponent_id)
             opponent_display = opponent.mention if opponent else f"<@{entry['opponent']}>"
@@ -82,41 +100,39 @@ class ChallongeCog(commands.Cog):
     @commands.command()
     async def elo(self, ctx, member: discord.Member = None):
         uid = str((member or ctx.author).id)
-        scores = load_json(ELO_FILE)
-        elo = scores.get(uid, 1000)
-        await ctx.send(f"📈 ELO for {member.display_name if member else ctx.author.display_name}: **{elo}** <:beebo:1383282292478312519>")
-
-    def update_elo(self, winner_id, loser_id, k=32):
-        scores = load_json(ELO_FILE)
-        winner = scores.get(winner_id, 1000)
-        loser = scores.get(loser_id, 1000)
-        expected_win = 1 / (1 + 10 ** ((loser - winner) / 400))
-        expected_lose = 1 - expected_win
-        scores[winner_id] = round(winner + k * (1 - expected_win))
-        scores[loser_id] = round(loser + k * (0 - expected_lose))
-        save_json(ELO_FILE, scores)
-
-    def log_match(self, slug, winner_id, loser_id, match_id):
-        history = load_json(MATCH_HISTORY_FILE)
-        history.setdefault(slug, {}).setdefault(winner_id, []).append({
-            "match_id": match_id,
-            "opponent": loser_id,
-            "result": "Win"
-        })
-        history.setdefault(slug, {}).setdefault(loser_id, []).append({
-            "match_id": match_id,
-            "opponent": winner_id,
-            "result": "Loss"
-        })
-        save_json(MATCH_HISTORY_FILE, history)
+        elo = self.elo_ranks.score(uid)
+        rank = f" (#{self.elo_ranks.rank(uid)} of {len(self.elo_ranks)})" if elo is not None else ""
+        await ctx.send(f"📈 ELO for {member.display_name if member else ctx.author.display_name}: **{DEFAULT_ELO if elo is None else elo}**{rank} <:beebo:1383282292478312519>")
+
+    async def record_match(self, slug, winner_id, loser_id, match_id, k=32):
+        """Log a finished match and apply its ELO change in one transaction, so a failure leaves neither behind."""
+        def record(db):
+            db.executemany(
+                "INSERT INTO match_history (slug, user_id, match_id, opponent, result) VALUES (?, ?, ?, ?, ?)",
+                [(slug, winner_id, match_id, loser_id, "Win"), (slug, loser_id, match_id, winner_id, "Loss")],
+            )
+
+            def score(uid):
+                row = db.execute("SELECT score FROM elo WHERE user_id = ?", (uid,)).fetchone()
+                return row["score"] if row else DEFAULT_ELO
+            winner = score(winner_id)
+            loser = score(loser_id)
+            expected_win = 1 / (1 + 10 ** ((loser - winner) / 400))
+            expected_lose = 1 - expected_win
+            scores = [
+                (winner_id, round(winner + k * (1 - expected_win))),
+                (loser_id, round(loser + k * (0 - expected_lose))),
+            ]
+            db.executemany("INSERT OR REPLACE INTO elo (user_id, score) VALUES (?, ?)", scores)
+            return scores
+        for uid, score in await self.storage.transaction(record):
+            self.elo_ranks.update(uid, score)
 
     @commands.command()
     async def standings(self, ctx):
-        scores = load_json(ELO_FILE)
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
         embed = discord.Embed(title="📊 Global ELO Standings", color=0xffcc00)
-        for rank, (uid, elo) in enumerate(sorted_scores[:20], start=1):
+        for uid, elo in self.elo_ranks.top(20):
+            rank = self.elo_ranks.rank(uid)
             member = ctx.guild.get_member(int(uid))
             name = member.display_name if member else f"<@{uid}>"
             embed.add_field(name=f"{rank}. {name}", value=f"ELO: **{elo}**", inline=False)
@@ -126,9 +142,8 @@ class ChallongeCog(commands.Cog):
     @commands.command()
     @commands.is_owner()
     async def set_elo(self, ctx, member: discord.Member, new_score: int):
-        scores = load_json(ELO_FILE)
-        scores[str(member.id)] = new_score
-        save_json(ELO_FILE, scores)
+        await self.storage.execute("INSERT OR REPLACE INTO elo (user_id, score) VALUES (?, ?)", (str(member.id), new_score))
+        self.elo_ranks.update(member.id, new_score)
         await ctx.send(f"📌 Set ELO of {member.display_name} to **{new_score}**.")
         
 
@@ -137,9 +152,6 @@ class ChallongeCog(commands.Cog):
     async def remove_slug(self, ctx, slug: str):
         """Safely archive and purge a tournament slug (with confirmation)."""
         tourney_map = load_json(MAP_FILE)
-        match_history = load_json(MATCH_HISTORY_FILE)
-        elo_scores = load_json(ELO_FILE)
-        archive = load_json(ARCHIVE_FILE)
     
         if slug not in tourney_map:
             await ctx.send(f"❌ `{slug}` isn’t currently tracked.")
@@ -180,23 +192,22 @@ class ChallongeCog(commands.Cog):
         if not view.confirmed:
             return  # User canceled or timed out
     
-        # Archive the slug and its player map
-        archive[slug] = tourney_map[slug]
-        save_json(ARCHIVE_FILE, archive)
-    
-        # Delete from MAP_FILE
-        del tourney_map[slug]
-        save_json(MAP_FILE, tourney_map)
-    
-        # Delete match history
-        if slug in match_history:
-            del match_history[slug]
-            save_json(MATCH_HISTORY_FILE, match_history)
+        # Move the slug's player map from MAP_FILE to the archive
+        async with get_cache().transaction(MAP_FILE) as tourney_map:
+            players = tourney_map.pop(slug, None)
+        if players is None:
+            await ctx.send(f"❌ `{slug}` was already purged.")
+            return
+        async with get_cache().transaction(ARCHIVE_FILE) as archive:
+            archive[slug] = players
     
-        # Clean up ELO scores
-        for uid in archive[slug].keys():
-            elo_scores.pop(uid, None)
-        save_json(ELO_FILE, elo_scores)
+        # Delete match history and clean up ELO scores in one go
+        def purge(db):
+            db.execute("DELETE FROM match_history WHERE slug = ?", (slug,))
+            db.executemany("DELETE FROM elo WHERE user_id = ?", [(uid,) for uid in players.keys()])
+        await self.storage.transaction(purge)
+        for uid in players:
+            self.elo_ranks.remove(uid)
     
         await ctx.send(f"✅ `{slug}` has been **purged and archived**. No longer tracked. 🪦")
 
@@ -209,7 +220,6 @@ class ChallongeCog(commands.Cog):
     async def register(self, ctx, slug: str):
         """Link your Discord account to a Challonge participant in the tournament."""
         uid = str(ctx.author.id)
-        tourney_map = load_json(MAP_FILE)
 
         # Get all participants
         data, status = await self.request("GET", f"tournaments/{slug}/participants")
@@ -234,11 +244,9 @@ class ChallongeCog(commands.Cog):
             return
 
         participant_id = str(matches[0]["id"])
-        tourney_map.setdefault(slug, {})[uid] = participant_id
-        print("Updated tourney_map:", tourney_map)
-        print("Saving to:", MAP_FILE)
-
-        save_json(MAP_FILE, tourney_map)
+        async with get_cache().transaction(MAP_FILE) as tourney_map:
+            tourney_map.setdefault(slug, {})[uid] = participant_id
+        print(f"[Challonge] Registered {uid} as {participant_id} in {slug}")
 
         await ctx.send(f"✅ You’ve been registered to `{slug}` as `{matches[0]['name']}` (ID: {participant_id})! <:beebo:1383282292478312519>")
 
@@ -259,14 +267,12 @@ class ChallongeCog(commands.Cog):
     @tasks.loop(minutes=10)
     async def match_alerts(self):
         for guild in self.bot.guilds:
-            for slug in load_json(MAP_FILE):
+            for slug in list(load_json(MAP_FILE)):
                 await self.alert_matches(guild, slug)
 
 
     async def alert_matches(self, guild, slug):
         tourney_map = load_json(MAP_FILE)
-        alert_cache = load_json(ALERT_CACHE)
-        optouts = load_json(OPTOUT_FILE)
         if slug not in tourney_map:
             return
 
@@ -278,17 +284,21 @@ class ChallongeCog(commands.Cog):
         if status != 200:
             return
 
-        if slug not in alert_cache:
-            alert_cache[slug] = []
         user_map = {v: k for k, v in tourney_map[slug].items()}
 
+        # Held across the sends so a manual !sync_matches and the loop can't both ping the same match
+        async with self.alert_lock:
+            await self.send_match_alerts(guild, slug, matches_data, user_map)
+
+    async def send_match_alerts(self, guild, slug, matches_data, user_map):
+        optouts = self.optouts
         for match in matches_data:
             match = match["match"]
             mid = str(match["id"])
-            if match["state"] != "open" or mid in alert_cache[slug]:
+            if match["state"] != "open" or mid in self.alerted.state.get(slug, []):
                 continue
             p1, p2 = user_map.get(str(match["player1_id"])), user_map.get(str(match["player2_id"]))
-            mentions = [f"<@{uid}>" for uid in (p1, p2) if uid and uid not in optouts.get(slug, [])]
+            mentions = [f"<@{uid}>" for uid in (p1, p2) if uid and uid not in optouts.state.get(slug, [])]
             if not mentions:
                 continue
             embed = discord.Embed(title=f"🎮 Match Ready in {slug}", description=f"Match ID: `{mid}` is now open!", color=0x3498db)
@@ -304,15 +314,13 @@ class ChallongeCog(commands.Cog):
                     if str(interaction.user.id) != self.uid:
                         await interaction.response.send_message("Not your button.", ephemeral=True)
                         return
-                    optouts.setdefault(slug, []).append(self.uid)
-                    save_json(OPTOUT_FILE, optouts)
+                    await optouts.append({"slug": slug, "value": self.uid})
                     await interaction.response.send_message("You have opted out of match pings. <:beebo_:1383281762385531081>", ephemeral=True)
 
             channel = guild.get_channel(LOG_CHANNEL_ID)
             if channel:
                 await channel.send(" ".join(mentions), embed=embed, view=OptOutView(p1 or p2))
-            alert_cache[slug].append(mid)
-        save_json(ALERT_CACHE, alert_cache)
+            await self.alerted.append({"slug": slug, "value": mid})
 
     @commands.command(aliases=["mlist"])
     async def match_list(self, ctx, slug: str):
@@ -356,19 +364,17 @@ class ChallongeCog(commands.Cog):
     @commands.command()
     @commands.is_owner()
     async def bind(self, ctx, slug: str, participant_id: str):
-        tourney_map = load_json(MAP_FILE)
-        tourney_map.setdefault(slug, {})[str(ctx.author.id)] = participant_id
-        save_json(MAP_FILE, tourney_map)
+        async with get_cache().transaction(MAP_FILE) as tourney_map:
+            tourney_map.setdefault(slug, {})[str(ctx.author.id)] = participant_id
         await ctx.send(f"✅ Bound <@{ctx.author.id}> to participant ID `{participant_id}` in `{slug}`.")
 
     @commands.command()
     @commands.is_owner()
     async def drop(self, ctx, slug: str, member: discord.Member):
-        tourney_map = load_json(MAP_FILE)
         uid = str(member.id)
-        if slug in tourney_map and uid in tourney_map[slug]:
-            del tourney_map[slug][uid]
-            save_json(MAP_FILE, tourney_map)
+        async with get_cache().transaction(MAP_FILE) as tourney_map:
+            removed = tourney_map.get(slug, {}).pop(uid, None)
+        if removed is not None:
             await ctx.send(f"✅ Removed {member.display_name} from `{slug}`.")
         else:
             await ctx.send("❌ User not found in tournament map.")
@@ -385,7 +391,6 @@ class ChallongeCog(commands.Cog):
     @commands.command()
     async def report(self, ctx, slug: str, match_id: int, score: str):
         import re
-        PENDING_FILE = "data/pending_reports.json"
 
         tourney_map = load_json(MAP_FILE)
         user_id = str(ctx.author.id)
@@ -414,69 +419,64 @@ class ChallongeCog(commands.Cog):
         loser_id = p2 if participant_id == p1 else p1
 
         # Save to pending reports
-        pending = load_json(PENDING_FILE)
-        pending.setdefault(slug, {})[str(match_id)] = {
-            "score": score,
-            "winner_id": winner_id,
-            "loser_id": loser_id,
-            "reporter": user_id
-        }
-        save_json(PENDING_FILE, pending)
+        async with get_cache().transaction(PENDING_FILE) as pending:
+            pending.setdefault(slug, {})[str(match_id)] = {
+                "score": score,
+                "winner_id": winner_id,
+                "loser_id": loser_id,
+                "reporter": user_id
+            }
 
         await ctx.send(f"📝 Match report submitted for review. Awaiting dev confirmation. <:beebo_:1383281762385531081>")
 
     @commands.command(aliases=["cr"])
     @commands.is_owner()
     async def confirm_report(self, ctx, slug: str, match_id: int):
-        reports = load_json("data/pending_reports.json")
-        slug_reports = reports.get(slug, {})
         str_match_id = str(match_id)
 
-        if str_match_id not in slug_reports:
-            await ctx.send(f"❌ No pending report found for match `{match_id}` in `{slug}`.")
-            return
+        # Held across the API call so a double-confirm can't record the match (and its ELO) twice
+        async with get_cache().transaction(PENDING_FILE) as reports:
+            slug_reports = reports.get(slug, {})
 
-        report = slug_reports[str_match_id]
-        payload = {
-            "match": {
-                "scores_csv": report["score"],
-                "winner_id": int(report["winner_id"])
+            if str_match_id not in slug_reports:
+                await ctx.send(f"❌ No pending report found for match `{match_id}` in `{slug}`.")
+                return
+
+            report = slug_reports[str_match_id]
+            payload = {
+                "match": {
+                    "scores_csv": report["score"],
+                    "winner_id": int(report["winner_id"])
+                }
             }
-        }
 
-        _, status = await self.request("PUT", f"tournaments/{slug}/matches/{match_id}", json=payload)
-        if status == 200:
-            self.log_match(slug, report["winner_id"], report["loser_id"], str(match_id))
-            self.update_elo(report["winner_id"], report["loser_id"])
-            await ctx.send(f"✅ Match `{match_id}` confirmed and recorded! <:beebo:1383282292478312519>")
+            _, status = await self.request("PUT", f"tournaments/{slug}/matches/{match_id}", json=payload)
+            if status != 200:
+                await ctx.send("❌ Failed to finalize match via Challonge API.")
+                return
+
+            await self.record_match(slug, report["winner_id"], report["loser_id"], str_match_id)
             del slug_reports[str_match_id]
             if not slug_reports:
                 reports.pop(slug)
-            else:
-                reports[slug] = slug_reports
-            save_json("data/pending_reports.json", reports)
-        else:
-            await ctx.send("❌ Failed to finalize match via Challonge API.")
+
+        await ctx.send(f"✅ Match `{match_id}` confirmed and recorded! <:beebo:1383282292478312519>")
 
     @commands.command(aliases=["dr"])
     @commands.is_owner()
     async def deny_report(self, ctx, slug: str, match_id: int):
-        reports = load_json("data/pending_reports.json")
-        slug_reports = reports.get(slug, {})
         str_match_id = str(match_id)
 
-        if str_match_id not in slug_reports:
+        async with get_cache().transaction(PENDING_FILE) as reports:
+            slug_reports = reports.get(slug, {})
+            report = slug_reports.pop(str_match_id, None)
+            if slug_reports == {} and slug in reports:
+                reports.pop(slug)
+
+        if report is None:
             await ctx.send(f"⚠️ No pending report for match `{match_id}` in `{slug}`.")
             return
-
-        reporter_id = slug_reports[str_match_id]["reporter"]
-        del slug_reports[str_match_id]
-        if not slug_reports:
-            reports.pop(slug)
-        else:
-            reports[slug] = slug_reports
-
-        save_json("data/pending_reports.json", reports)
+        reporter_id = report["reporter"]
 
         await ctx.send(f"🚫 <@{reporter_id}>, your match report for `{slug}` match `{match_id}` was **denied** by the tournament overlords. Try again or appeal with better vibes. <:beebo_:1383281762385531081>")
 
@@ -486,7 +486,6 @@ class ChallongeCog(commands.Cog):
     async def confirm_result(self, ctx, slug: str, match_id: int, score: str, loser: discord.Member):
         """Dev-only: Immediately confirm and push a match result."""
         tourney_map = load_json(MAP_FILE)
-        ELO_FILE = "data/elo_scores.json"
 
         winner_id = str(ctx.author.id)
         loser_id = str(loser.id)
@@ -508,8 +507,7 @@ class ChallongeCog(commands.Cog):
         data, status = await self.request("PUT", f"tournaments/{slug}/matches/{match_id}", json=payload)
 
         if status == 200:
-            self.log_match(slug, winner_id, loser_id, str(match_id))
-            self.update_elo(winner_id, loser_id)
+            await self.record_match(slug, winner_id, loser_id, str(match_id))
 
             embed = discord.Embed(
                 title="✅ Match Result Confirmed",
@@ -564,9 +562,8 @@ class ChallongeCog(commands.Cog):
             return
 
         # Auto-create entry in MAP_FILE
-        tourney_map = load_json(MAP_FILE)
-        tourney_map.setdefault(slug, {})
         created_participants = []
+        added = {}
 
         # Preload from role
         if role:
@@ -580,9 +577,11 @@ class ChallongeCog(commands.Cog):
                 pdata, pstatus = await self.request("POST", f"tournaments/{slug}/participants", json=p_payload)
                 if pstatus == 200:
                     pid = pdata["participant"]["id"]
-                    tourney_map[slug][str(member.id)] = str(pid)
+                    added[str(member.id)] = str(pid)
                     created_participants.append(pname)
-            save_json(MAP_FILE, tourney_map)
+
+        async with get_cache().transaction(MAP_FILE) as tourney_map:
+            tourney_map.setdefault(slug, {}).update(added)
 
         embed = discord.Embed(
             title="<:beebo:1383282292478312519> Tournament Created!",
@@ -0,0 +1,86 @@
+import time
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN_SECONDS = 30
+MAX_COOLDOWN_SECONDS = 30 * 60
+HEALTH_ALPHA = 0.2  # weight of the newest result in the rolling health score
+
+
+class CircuitBreaker:
+    """Per-source breaker: trips after repeated failures and lets one trial probe through per cool-down.
+
+    Each re-trip from half-open doubles the cool-down, up to `max_cooldown`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 base_cooldown: float = BASE_COOLDOWN_SECONDS, max_cooldown: float = MAX_COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.reset()
+
+    def reset(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.open_until = 0.0
+        self.trips = 0
+        self.health = 1.0
+        self.avg_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() >= self.open_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency_ms: float = None):
+        self._score(1.0, latency_ms)
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self._trial_in_flight = False
+
+    def record_failure(self, error: str = None, latency_ms: float = None):
+        self._score(0.0, latency_ms)
+        self.failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._trip()
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._trip()
+        self._trial_in_flight = False
+
+    def release(self):
+        """The probe was abandoned (e.g. cancelled after losing a race) — no verdict either way."""
+        self._trial_in_flight = False
+
+    def _trip(self):
+        self.state = OPEN
+        self.trips += 1
+        self.open_until = time.monotonic() + self.cooldown
+        print(f"[Circuit {self.name}] OPEN for {self.cooldown:.0f}s after {self.failures} failures")
+
+    def _score(self, result: float, latency_ms: float = None):
+        self.health = HEALTH_ALPHA * result + (1 - HEALTH_ALPHA) * self.health
+        if latency_ms is not None:
+            self.avg_latency_ms = latency_ms if self.avg_latency_ms is None else (
+                HEALTH_ALPHA * latency_ms + (1 - HEALTH_ALPHA) * self.avg_latency_ms
+            )
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self.open_until - time.monotonic()) if self.state == OPEN else 0.0
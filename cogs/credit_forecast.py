@@ -0,0 +1,125 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from cogs.status_history import StatusHistory, HOUR, DAY
+
+CREDITS_PER_GB_HOUR = 1.0  # Exaroton's list price, used until there's enough history to fit
+SERVER_RAM_GB = float(os.getenv("SERVER_RAM_GB", 10))
+CREDIT_SAMPLE_MINUTES = int(os.getenv("CREDIT_SAMPLE_MINUTES", 15))
+FIT_WINDOW_SECONDS = 7 * DAY
+HALF_LIFE_SECONDS = 2 * DAY  # recent sessions count more, so a RAM change shows up within a couple of days
+MIN_FIT_ONLINE_HOURS = 0.5
+TOPUP_TOLERANCE = 0.01  # balance going up by more than this is a donation, not a burn
+LOW_CREDIT_BALANCE = 200
+LOW_CREDIT_RUNWAY_HOURS = 48
+FORECAST_CACHE_SECONDS = 60
+
+
+@dataclass
+class CreditForecast:
+    balance: Optional[float]
+    sampled_at: Optional[float]
+    rate: float  # credits per hour the server is online
+    duty_cycle: Optional[float]  # fraction of wall-clock time online over the fit window
+    fitted: bool
+    online_hours: float  # online time the fit is based on
+
+    @property
+    def online_hours_left(self) -> Optional[float]:
+        if self.balance is None or self.rate <= 0:
+            return None
+        return self.balance / self.rate
+
+    @property
+    def wall_hours_left(self) -> Optional[float]:
+        """Hours until the balance hits zero at the observed on/off pattern."""
+        if self.online_hours_left is None or not self.duty_cycle:
+            return None
+        return self.online_hours_left / self.duty_cycle
+
+    @property
+    def runout_at(self) -> Optional[float]:
+        if self.wall_hours_left is None:
+            return None
+        return (self.sampled_at or time.time()) + self.wall_hours_left * HOUR
+
+    @property
+    def daily_burn(self) -> Optional[float]:
+        return self.rate * 24 * self.duty_cycle if self.duty_cycle is not None else None
+
+    @property
+    def low(self) -> bool:
+        if self.balance is None:
+            return False
+        hours = self.wall_hours_left
+        return self.balance <= LOW_CREDIT_BALANCE or (hours is not None and hours <= LOW_CREDIT_RUNWAY_HOURS)
+
+    def runway_text(self) -> str:
+        if self.online_hours_left is None:
+            return "Unknown"
+        text = f"**{self.online_hours_left:.1f}h** of server time"
+        if self.runout_at is not None:
+            text += f" — runs out ~<t:{int(self.runout_at)}:R> at the usual schedule"
+        return text
+
+    def basis_text(self) -> str:
+        if self.fitted:
+            return f"Fitted from {self.online_hours:.1f}h of observed online time"
+        return f"Not enough history yet; assumes {CREDITS_PER_GB_HOUR:g} credit/GB/hour @ {SERVER_RAM_GB:g}GB"
+
+
+class CreditForecaster:
+    """Samples the credit balance and fits the burn rate to what the server actually spent.
+
+    Each pair of consecutive samples gives credits burned over an interval; the
+    status history says how long the server was online in it. The rate is the
+    decay-weighted ratio of the two, so idle time and donations don't skew it.
+    """
+
+    def __init__(self, history: StatusHistory, ram_gb: float = SERVER_RAM_GB):
+        self.history = history
+        self.ram_gb = ram_gb
+        self._cached: Optional[CreditForecast] = None
+        self._cached_at = 0.0
+
+    async def sample(self, client) -> float:
+        balance = await client.get_credits()
+        await asyncio.to_thread(self.history.record_credits_sync, balance)
+        self._cached = None
+        return balance
+
+    def forecast_sync(self, now: float = None) -> CreditForecast:
+        now = time.time() if now is None else now
+        samples = self.history.credit_samples(now - FIT_WINDOW_SECONDS)
+
+        burned = online = raw_online = 0.0
+        for a, b in zip(samples, samples[1:]):
+            delta = a["balance"] - b["balance"]
+            if delta < -TOPUP_TOLERANCE:
+                continue  # topped up somewhere in here; the burn can't be separated out
+            hours = self.history.online_seconds_between(a["ts"], b["ts"]) / HOUR
+            weight = 0.5 ** ((now - b["ts"]) / HALF_LIFE_SECONDS)
+            burned += weight * max(delta, 0.0)
+            online += weight * hours
+            raw_online += hours
+
+        fitted = raw_online >= MIN_FIT_ONLINE_HOURS and burned > 0
+        rate = burned / online if fitted else CREDITS_PER_GB_HOUR * self.ram_gb
+        latest = samples[-1] if samples else None
+        return CreditForecast(
+            balance=latest["balance"] if latest else None,
+            sampled_at=latest["ts"] if latest else None,
+            rate=rate,
+            duty_cycle=self.history.summary("hour", now - FIT_WINDOW_SECONDS)["uptime"],
+            fitted=fitted,
+            online_hours=raw_online,
+        )
+
+    async def forecast(self) -> CreditForecast:
+        if self._cached is None or time.time() - self._cached_at > FORECAST_CACHE_SECONDS:
+            self._cached = await asyncio.to_thread(self.forecast_sync)
+            self._cached_at = time.time()
+        return self._cached
@@ -0,0 +1,273 @@
+import asyncio
+import copy
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+FLUSH_DEBOUNCE_SECONDS = float(os.getenv("DATA_FLUSH_DEBOUNCE", 2))
+FLUSH_MAX_DELAY_SECONDS = float(os.getenv("DATA_FLUSH_MAX_DELAY", 10))  # a steady trickle of writes still lands this often
+FLUSH_RETRY_INITIAL_SECONDS = 1.0
+FLUSH_RETRY_MAX_SECONDS = 60.0
+IO_THREADS = 2
+
+# File reads and writes never run on the event loop, and never compete with asyncio.to_thread work for a thread
+_io_executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="beebo-io")
+
+
+async def run_io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, fn, *args)
+
+
+class CachedFile:
+    def __init__(self, path: str, data: Any):
+        self.path = path
+        self.data = data
+        self.dirty = False
+        self.dirty_since = 0.0
+        self.hits = 0
+        self.flushes = 0
+        self.bytes_written = 0
+        self.last_flush = None
+        self.last_error = None
+
+
+def read_json(path: str, default: Callable[[], Any]) -> Any:
+    if not os.path.exists(path):
+        return default()
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _restore(data: Any, snapshot: Any):
+    """Put `data` back to `snapshot` in place, so references handed out earlier see the rollback."""
+    if isinstance(data, dict):
+        data.clear()
+        data.update(snapshot)
+    elif isinstance(data, list):
+        data[:] = snapshot
+
+
+def write_atomic(path: str, payload: bytes):
+    """Write to a temp file next to `path`, fsync it, then swap it in with os.replace."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class DataCache:
+    """Write-back cache for the bot's JSON data files.
+
+    Each file is parsed once and kept in memory; reads return the live object.
+    Mutations mark the file dirty and it's flushed after `debounce` seconds of
+    quiet (or `max_delay` at the latest), atomically via temp file + os.replace.
+    A failed flush is retried with exponential backoff until the write lands.
+
+    Read-modify-write that spans an await should go through `transaction`,
+    which holds the file's lock and rolls the data back if the block raises.
+    """
+
+    def __init__(self, debounce: float = FLUSH_DEBOUNCE_SECONDS, max_delay: float = FLUSH_MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._files: Dict[str, CachedFile] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._retry_delay = 0.0
+        self._retry_at = 0.0  # no flush before this (monotonic), while backing off after a failure
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _entry(self, path: str, default: Callable[[], Any]) -> CachedFile:
+        entry = self._files.get(path)
+        if entry is not None:
+            entry.hits += 1
+            return entry
+        entry = self._files[path] = CachedFile(path, read_json(path, default))
+        return entry
+
+    async def load(self, path: str, default: Callable[[], Any] = dict) -> Any:
+        """Like `get`, but a first read from disk happens on the I/O pool."""
+        if path not in self._files:
+            data = await run_io(read_json, path, default)
+            if path not in self._files:  # another task may have loaded it while we were reading
+                self._files[path] = CachedFile(path, data)
+        return self.get(path, default)
+
+    def lock(self, path: str) -> asyncio.Lock:
+        return self._locks.setdefault(path, asyncio.Lock())
+
+    @asynccontextmanager
+    async def transaction(self, path: str, default: Callable[[], Any] = dict):
+        """Exclusive read-modify-write of one file.
+
+            async with get_cache().transaction(MAP_FILE) as tourney_map:
+                tourney_map.setdefault(slug, {})[uid] = participant_id
+
+        Other transactions on the same file wait until this one finishes. If the
+        block raises, the data is restored to what it was on entry.
+        """
+        async with self.lock(path):
+            data = await self.load(path, default)
+            snapshot = copy.deepcopy(data)
+            try:
+                yield data
+            except BaseException:
+                if isinstance(data, (dict, list)):
+                    _restore(data, snapshot)
+                else:
+                    self._files[path].data = snapshot
+                raise
+            if data != snapshot:
+                self.mark_dirty(path)
+
+    def get(self, path: str, default: Callable[[], Any] = dict) -> Any:
+        """The cached contents of `path`. Mutate it in place, then call `mark_dirty`."""
+        return self._entry(path, default).data
+
+    def put(self, path: str, data: Any):
+        """Replace the contents of `path` and schedule a flush."""
+        if path in self._files:
+            self._files[path].data = data
+        else:
+            self._files[path] = CachedFile(path, data)
+        self.mark_dirty(path)
+
+    def mark_dirty(self, path: str):
+        entry = self._files[path]
+        if not entry.dirty:
+            entry.dirty = True
+            entry.dirty_since = time.monotonic()
+        self._schedule()
+
+    def _schedule(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_sync()  # no loop (startup/shutdown): nothing to debounce against
+            return
+        if self._timer:
+            self._timer.cancel()
+        now = time.monotonic()
+        oldest = min(e.dirty_since for e in self._files.values() if e.dirty)
+        delay = max(0.0, min(self.debounce, oldest + self.max_delay - now), self._retry_at - now)
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self):
+        self._timer = None
+        if self._flushing is not None and not self._flushing.done():
+            return  # _flush_done picks up whatever was dirtied meanwhile once this write finishes
+        self._flushing = asyncio.ensure_future(self.flush())
+        self._flushing.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        ok = task.exception() is None and task.result()
+        if ok:
+            self._retry_delay = self._retry_at = 0.0
+        else:
+            self._retry_delay = min(max(self._retry_delay * 2, FLUSH_RETRY_INITIAL_SECONDS), FLUSH_RETRY_MAX_SECONDS)
+            self._retry_at = time.monotonic() + self._retry_delay
+            print(f"[DataCache] Retrying the flush in {self._retry_delay:g}s")
+        if any(e.dirty for e in self._files.values()):
+            self._schedule()
+
+    def _snapshot(self, entry: CachedFile) -> bytes:
+        entry.dirty = False
+        return json.dumps(entry.data, separators=(",", ":")).encode()
+
+    def _written(self, entry: CachedFile, size: int):
+        entry.flushes += 1
+        entry.bytes_written += size
+        entry.last_flush = time.time()
+        entry.last_error = None
+
+    async def flush(self, path: Optional[str] = None) -> bool:
+        """Write out every dirty file (or just `path`). False if any of them failed to write."""
+        ok = True
+        entries = [self._files[path]] if path else list(self._files.values())
+        for entry in entries:
+            if not entry.dirty:
+                continue
+            # Serialize on the loop thread so the snapshot can't tear; only the disk write moves off it
+            payload = self._snapshot(entry)
+            try:
+                await run_io(write_atomic, entry.path, payload)
+                self._written(entry, len(payload))
+            except Exception as e:
+                ok = False
+                entry.dirty = True
+                entry.last_error = str(e)
+                print(f"[DataCache] Failed to flush {entry.path}: {e}")
+        return ok
+
+    def flush_sync(self):
+        for entry in self._files.values():
+            if entry.dirty:
+                payload = self._snapshot(entry)
+                try:
+                    write_atomic(entry.path, payload)
+                    self._written(entry, len(payload))
+                except Exception as e:
+                    entry.dirty = True
+                    entry.last_error = str(e)
+                    print(f"[DataCache] Failed to flush {entry.path}: {e}")
+
+    async def close(self):
+        if self._flushing and not self._flushing.done():
+            await self._flushing
+        if self._timer:  # after the wait: a failed in-flight flush schedules its retry when it finishes
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    def metrics(self) -> dict:
+        files = {
+            path: {
+                "dirty": e.dirty,
+                "hits": e.hits,
+                "flushes": e.flushes,
+                "bytes_written": e.bytes_written,
+                "last_flush": e.last_flush,
+                "last_error": e.last_error,
+            }
+            for path, e in self._files.items()
+        }
+        return {
+            "files": files,
+            "flushes": sum(f["flushes"] for f in files.values()),
+            "bytes_written": sum(f["bytes_written"] for f in files.values()),
+            "dirty": sum(1 for f in files.values() if f["dirty"]),
+        }
+
+
+_cache: Optional[DataCache] = None
+
+
+def get_cache() -> DataCache:
+    global _cache
+    if _cache is None:
+        _cache = DataCache()
+    return _cache
+
+
+async def close_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
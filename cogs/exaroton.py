@@ -2,38 +2,160 @@ import discord
 from discord.ext import commands, tasks
 from mcstatus import JavaServer
 from discord.ext.commands import cooldown, BucketType, Context
-from exaroton_scraper_playwright import get_live_status_playwright
+from cogs.exaroton_api import get_client, ServerInfo, STATUS_ONLINE, STATUS_OFFLINE
+from cogs.exaroton_stream import ExarotonStream
+from cogs.browser_pool import BrowserPool
+from cogs.status_page import scrape_status
+from cogs.circuit_breaker import CircuitBreaker, OPEN, HALF_OPEN
+from cogs.status_scheduler import StatusScheduler, ONLINE
+from cogs.status_history import StatusHistory, HOUR, DAY
+from cogs.credit_forecast import CreditForecaster, CREDIT_SAMPLE_MINUTES
+from cogs.storage import get_storage
+from cogs.ranked_index import RankedIndex
+from cogs.links import get_links
+from cogs.data_cache import get_cache
+import dataclasses
+from dataclasses import dataclass, field
 import json
 import time
-import requests
 import asyncio
-from typing import Union
+from typing import Awaitable, Callable, Optional, Union
 import os
 import datetime
-from playwright.async_api import async_playwright
 
 
 DATA_FILE = "data/exaroton_data.json"
 POOL_FILE = "data/exaroton_pool.json"
-DONOR_FILE = "data/exaroton_donations.json"
 donor_role_id = 1386101967297843270
 EXAROTON_TRUSTED = [448896936481652777, 546650815297880066, 858462569043722271]
 DEV_USER_ID = [546650815297880066, 448896936481652777, 424532190290771998, 858462569043722271]
 EXAROTON_TOKEN = os.getenv("EXAROTON_TOKEN")
 EXAROTON_SERVER_ID = os.getenv("EXAROTON_SERVER_ID")
 SERVER_ADDRESS="termite.exaroton.me"
-CHECK_INTERVAL_HOURS = 3
+STATUS_CACHE_TTL_SECONDS = int(os.getenv("STATUS_CACHE_TTL", 30))
+STATUS_RACE_ENABLED = os.getenv("STATUS_RACE", "1") != "0"
+MCSTATUS_TIMEOUT_SECONDS = 3
+STATUS_SOURCES = ("mcstatus", "API", "Scraper")
 
 def load_data(filename):
-    if not os.path.exists(filename):
-        return {}
-    with open(filename, "r") as f:
-        return json.load(f)
+    return get_cache().get(filename)
 
 def save_data(filename, data):
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=4)
+    get_cache().put(filename, data)
+
+
+@dataclass
+class StatusSnapshot:
+    motd: str = "Unknown MOTD"
+    players: list = field(default_factory=list)
+    online: bool = False
+    status_text: str = "Offline"
+    max_players: Union[int, str] = "?"
+    source: str = "None"
+    server: Optional[ServerInfo] = None  # raw Exaroton view, when the API was consulted
+    fetched_at: float = field(default_factory=time.time)
+    latencies: dict = field(default_factory=dict)  # source -> ms spent probing it
+    outcomes: dict = field(default_factory=dict)  # source -> ok / no info / failed / timeout / cancelled / circuit open
+
+    @classmethod
+    def from_server(cls, server: ServerInfo, source: str = "API") -> "StatusSnapshot":
+        return cls(
+            motd=server.motd or "Unknown MOTD",
+            players=server.players,
+            online=server.online,
+            status_text="Online" if server.online else "Offline",
+            max_players=server.max_players or "?",
+            source=source,
+            server=server,
+        )
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def won_in_text(self) -> str:
+        ms = self.latencies.get(self.source)
+        return f" in {ms}ms" if ms is not None else ""
+
+    def latency_text(self) -> str:
+        parts = []
+        for name, ms in self.latencies.items():
+            outcome = self.outcomes.get(name, "")
+            mark = "🏁" if name == self.source else ("✂️" if outcome == "cancelled" else "")
+            parts.append(f"{mark}{name} {ms}ms" + (f" ({outcome})" if outcome not in ("ok", "cancelled") else ""))
+        return " · ".join(parts) or "no probes"
+
+    def age_text(self) -> str:
+        seconds = int(self.age)
+        if seconds < 5:
+            return "just now"
+        if seconds < 120:
+            return f"{seconds}s ago"
+        return f"{seconds // 60}m ago"
+
+
+class SingleFlightCache:
+    """Holds the latest snapshot for `ttl` seconds; concurrent misses share one in-flight probe."""
+
+    def __init__(self, probe: Callable[[], Awaitable[StatusSnapshot]], ttl: float):
+        self._probe = probe
+        self.ttl = ttl
+        self.snapshot: Optional[StatusSnapshot] = None
+        self.probe_count = 0
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def get(self, force: bool = False, max_age: float = None) -> StatusSnapshot:
+        max_age = self.ttl if max_age is None else max_age
+        if not force and self.snapshot and self.snapshot.age <= max_age:
+            return self.snapshot
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+            # Every waiter may have been cancelled (e.g. the probe lost a race); don't leave the error unretrieved
+            self._inflight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        # Shielded so one impatient caller being cancelled doesn't kill the probe for everyone
+        return await asyncio.shield(self._inflight)
+
+    def put(self, snapshot: StatusSnapshot):
+        if not self.snapshot or snapshot.fetched_at >= self.snapshot.fetched_at:
+            self.snapshot = snapshot
+
+    async def _refresh(self) -> StatusSnapshot:
+        try:
+            self.probe_count += 1
+            snapshot = await self._probe()
+            self.put(snapshot)
+            return snapshot
+        finally:
+            self._inflight = None
+
+
+class StatusService:
+    """One shared view of the server for every status command and button.
+
+    `get()` is the full probe chain (mcstatus → API → scraper); `get_api()` is the
+    Exaroton API view for things only the API knows, like uptime and credits/hour.
+    """
+
+    def __init__(self, probe, api_probe, ttl: float = STATUS_CACHE_TTL_SECONDS):
+        self.status = SingleFlightCache(probe, ttl)
+        self.api = SingleFlightCache(api_probe, ttl)
+        self.stream: Optional[ExarotonStream] = None
+
+    async def get(self, force: bool = False, max_age: float = None) -> StatusSnapshot:
+        return await self.status.get(force=force, max_age=max_age)
+
+    async def get_api(self, force: bool = False, max_age: float = None) -> StatusSnapshot:
+        # While the websocket is up every change is pushed into the cache, so it can't go stale
+        if not force and self.stream and self.stream.connected and self.api.snapshot:
+            return self.api.snapshot
+        return await self.api.get(force=force, max_age=max_age)
+
+    def push(self, server: ServerInfo, source: str = "Stream"):
+        self.api.put(StatusSnapshot.from_server(server, source=source))
+
+    def set_ttl(self, ttl: float):
+        self.status.ttl = self.api.ttl = ttl
+
 
 class StatusButtonView(discord.ui.View):
     def __init__(self):
@@ -92,29 +214,95 @@ class ExarotonCog(commands.Cog):
         self.server_address = os.getenv("SERVER_ADDRESS")
         self.channel_id = int(os.getenv("CHANNEL_ID"))
         self.role_to_tag = os.getenv("ROLE_TO_TAG")
-        self.last_status = "offline"
-        self.check_server_status.start()
+        self.api = get_client()
+        self.status_service = StatusService(self.fetch_server_status, self.fetch_api_status)
+        self.stream = ExarotonStream(on_status=self.on_stream_status)
+        self.status_service.stream = self.stream
+        self.browser_pool = BrowserPool()
+        self.breakers = {name: CircuitBreaker(name) for name in STATUS_SOURCES}
+        self.scheduler = StatusScheduler(self.scheduled_probe, self.announce_status)
+        self.history = StatusHistory()
+        self.forecaster = CreditForecaster(self.history)
+        self.storage = get_storage()
+        self.donor_ranks = RankedIndex("donations", "user_id", "total")
+        self.stream.start()
+        self.scheduler.start()
+        self.sample_credits.start()
+
+    async def cog_load(self):
+        await self.donor_ranks.load(self.storage)
+        await get_links().load()
+
+    async def cog_unload(self):
+        self.sample_credits.cancel()
+        await self.scheduler.stop()
+        await self.stream.stop()
+        await self.browser_pool.close()
+        self.history.close()
+        await get_cache().flush()
+
+    @tasks.loop(minutes=CREDIT_SAMPLE_MINUTES)
+    async def sample_credits(self):
+        try:
+            self.credit_balance = await self.forecaster.sample(self.api)
+        except Exception as e:
+            print(f"[Credit Sample Error] {e}")
 
-    @tasks.loop(hours=CHECK_INTERVAL_HOURS)
-    async def check_server_status(self):
+    async def scheduled_probe(self) -> StatusSnapshot:
+        # While the websocket is up this is a cache read; the API carries the transitional status codes
+        cached = self.status_service.api.snapshot
+        try:
+            snapshot = await self.status_service.get_api()
+            if snapshot is not cached:  # a cache read was already recorded when it was fetched or pushed
+                await self.record_probe(snapshot)
+            return snapshot
+        except Exception as e:
+            print(f"[Exaroton API] Failed to fetch status, falling back to probe chain: {e}")
+        snapshot = await self.status_service.get()
+        # Don't judge the chain's answer by a possibly stale API status code
+        return dataclasses.replace(snapshot, server=None)
+
+    async def on_stream_status(self, server: ServerInfo):
+        self.status_service.push(server)
+        await self.record_probe(self.status_service.api.snapshot)
+        await self.scheduler.observe(self.status_service.api.snapshot)
+
+    async def record_probe(self, snapshot: StatusSnapshot):
+        # Only the API/stream know the real status code; the other sources just answer up or down
+        if snapshot.server and snapshot.source in ("API", "Stream"):
+            status = snapshot.server.status
+        else:
+            status = STATUS_ONLINE if snapshot.online else STATUS_OFFLINE
+        try:
+            await self.history.record(status, snapshot.players, snapshot.source, snapshot.latencies.get(snapshot.source))
+        except Exception as e:
+            print(f"[Status History] Failed to record probe: {e}")
+
+    async def add_donation(self, user_id, amount: float) -> float:
+        """Add to a donor's running total and return the new total."""
+        def update(db):
+            db.execute(
+                "INSERT INTO donations (user_id, total) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET total = total + excluded.total",
+                (str(user_id), amount),
+            )
+            return db.execute("SELECT total FROM donations WHERE user_id = ?", (str(user_id),)).fetchone()["total"]
+        total = await self.storage.transaction(update)
+        self.donor_ranks.update(user_id, total)
+        return total
+
+    async def set_donation_total(self, user_id, amount: float):
+        await self.storage.execute("INSERT OR REPLACE INTO donations (user_id, total) VALUES (?, ?)", (str(user_id), amount))
+        self.donor_ranks.update(user_id, amount)
+
+    async def announce_status(self, state: str, snapshot: StatusSnapshot):
         channel = self.bot.get_channel(self.channel_id)
     
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
-    
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                print("[Exaroton API] Failed to fetch status.")
-                return
-    
-            data = response.json()
-            online = data.get("host", {}).get("online", False)
-            status_code = data.get("status")
-            players = data.get("players", {}).get("list", [])
-            motd = data.get("motd", {}).get("clean", [""])[0]
+            players = snapshot.players
+            motd = snapshot.motd
     
-            if status_code == 2 and self.last_status != "online":
+            if state == ONLINE:
                 embed = discord.Embed(title="🟢 **Termite Server is ONLINE!**", color=0x462f80)
                 embed.add_field(name="MOTD", value=motd or "Server Online", inline=False)
                 embed.add_field(name="Java IP", value=self.server_address, inline=False)
@@ -125,121 +313,160 @@ class ExarotonCog(commands.Cog):
     
                 embed.set_footer(text="Summon the squad.")
                 await channel.send(content=self.role_to_tag, embed=embed)
-                self.last_status = "online"
     
                 # Check credits
-                if self.credit_balance <= 200:
-                    try:
+                try:
+                    forecast = await self.forecaster.forecast()
+                    if forecast.low:
                         warn_embed = discord.Embed(
                             title="⚠️ Low Server Credits!",
-                            description=f"Current balance: **{self.credit_balance} credits**\nTop up soon to avoid downtime.",
+                            description=f"Current balance: **{forecast.balance:.2f} credits**\nTop up soon to avoid downtime.",
                             color=0xffaa00
                         )
-                        hours_left = round(self.credit_balance / 10, 1)
-                        warn_embed.add_field(name="Burn Estimate", value=f"~{hours_left}h left @ 10GB RAM", inline=False)
-                        warn_embed.set_footer(text="Use !topup to donate credits.")
+                        warn_embed.add_field(name="Burn Estimate", value=f"{forecast.runway_text()} ({forecast.rate:.2f} credits/h online)", inline=False)
+                        warn_embed.set_footer(text=f"Use !topup to donate credits. {forecast.basis_text()}.")
                         view = ServerControlView(self.credit_pool_code)
                         await channel.send(embed=warn_embed, view=view)
-                    except Exception as e:
-                        print(f"[⚠️ Burn Warning Error] {e}")
+                except Exception as e:
+                    print(f"[⚠️ Burn Warning Error] {e}")
     
-            elif status_code != 2 and self.last_status != "offline":
+            else:
                 embed = discord.Embed(
                     title="🔴 **Minecraft Server is OFFLINE or SLEEPING**",
                     color=0xff5555
                 )
                 embed.set_footer(text="Someone needs to manually start it or join to wake it up.")
                 await channel.send(content=self.role_to_tag, embed=embed)
-                self.last_status = "offline"
     
         except Exception as e:
             print(f"[🔥 Server Status Error] {e}")
 
-    async def fetch_server_status(self):
-        server_address = self.server_address or SERVER_ADDRESS
-        motd = "Unknown MOTD"
-        players = []
-        online = False
-        status_text = "Offline"
-        max_players = "?"
-        source = "None"
+    async def probe_mcstatus(self) -> Optional[StatusSnapshot]:
+        async def ping():
+            # The SRV/DNS lookup shares the timeout: a slow resolver mustn't stall the fast probe either
+            server = await JavaServer.async_lookup(self.server_address or SERVER_ADDRESS)
+            return await server.async_status()
+
+        status = await asyncio.wait_for(ping(), timeout=MCSTATUS_TIMEOUT_SECONDS)
+        motd = (
+            status.description.get("text", "Unknown MOTD")
+            if isinstance(status.description, dict)
+            else str(status.description)
+        )
+        return StatusSnapshot(
+            motd=motd.strip(),
+            players=[p.name for p in status.players.sample] if status.players.sample else [],
+            online=True,
+            status_text="Online",
+            max_players=status.players.max,
+            source="mcstatus",
+        )
+
+    async def probe_api(self) -> Optional[StatusSnapshot]:
+        snapshot = await self.status_service.get_api()
+        if snapshot.online or snapshot.players:  # Only counts if it's giving us something
+            return snapshot
+        print("[API gave no new info]")
+        return None
+
+    async def probe_scraper(self) -> Optional[StatusSnapshot]:
+        async with self.browser_pool.page() as page:
+            scraped = await scrape_status(page)
+        print("SCRAPER RESULT:", scraped)
+        scraped_status = scraped.get("status", "")
+        scraped_players = scraped.get("players", [])
+        if "online" not in scraped_status.lower() and not scraped_players:
+            print("[SCRAPER gave no new info]")
+            return None
+        return StatusSnapshot(
+            motd=scraped.get("motd", "Unknown MOTD").strip(),
+            players=scraped_players,
+            online="online" in scraped_status.lower(),
+            status_text=scraped_status or "Unknown",
+            source="Scraper",
+        )
 
-        # ─── 1. Try mcstatus with timeout ───
+    async def _timed_probe(self, name, probe, latencies, outcomes):
+        breaker = self.breakers[name]
+        if not breaker.allow():
+            # Known-dead source: don't wait out its timeout again until the cool-down ends
+            outcomes[name] = "circuit open"
+            return None
+
+        started = time.perf_counter()
+        elapsed = lambda: round((time.perf_counter() - started) * 1000)
         try:
-            def run_mcstatus():
-                return JavaServer.lookup(server_address).status()
-
-            loop = asyncio.get_running_loop()
-            status = await asyncio.wait_for(loop.run_in_executor(None, run_mcstatus), timeout=3)
-            if status:
-                motd = (
-                    status.description.get("text", "Unknown MOTD")
-                    if isinstance(status.description, dict)
-                    else str(status.description)
-                )
-                players = [p.name for p in status.players.sample] if status.players.sample else []
-                online = True
-                status_text = "Online"
-                max_players = status.players.max
-                print("[mcstatus SUCCESS]")
-                source = "mcstatus"
+            result = await probe()
+            outcomes[name] = "ok" if result else "no info"
+            breaker.record_success(elapsed())
+            return result
+        except asyncio.CancelledError:
+            outcomes[name] = "cancelled"
+            breaker.release()
+            raise
         except asyncio.TimeoutError:
-            print("[mcstatus TIMEOUT]")
+            print(f"[{name} TIMEOUT]")
+            outcomes[name] = "timeout"
+            breaker.record_failure("timeout", elapsed())
         except Exception as e:
-            print(f"[mcstatus FAIL]: {e}")
-
-        # ─── 2. Fallback: Exaroton API ───
-        if not online and not players:
-            try:
-                headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-                url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
-                response = requests.get(url, headers=headers, timeout=10)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    ex_online = data.get("host", {}).get("online", False)
-                    ex_players = data.get("players", {}).get("list", [])
-                    ex_motd = data.get("motd", {}).get("clean", [])
-                    ex_max_players = data.get("players", {}).get("max", max_players)
-
-                    if ex_online or ex_players:  # Only overwrite if it's giving us something
-                        motd = ex_motd[0] if ex_motd else motd
-                        online = ex_online
-                        players = ex_players or players
-                        status_text = "Online" if online else "Offline"
-                        max_players = ex_max_players
-                        print("[API fallback SUCCESS]")
-                        source = "API"
-                    else:
-                        print("[API fallback gave no new info]")
-            except Exception as e:
-                print(f"[Exaroton API FAIL]: {e}")
-
-        # ─── 3. Fallback: Scraper ───
-        if not online and not players:
+            print(f"[{name} FAIL]: {e}")
+            outcomes[name] = "failed"
+            breaker.record_failure(str(e) or type(e).__name__, elapsed())
+        finally:
+            latencies[name] = elapsed()
+        return None
+
+    async def fetch_server_status(self, race: bool = STATUS_RACE_ENABLED):
+        """Probe mcstatus and the Exaroton API (raced, or one after the other), then the scraper.
+
+        The first probe with a real answer wins and the rest are cancelled; the scraper only
+        runs if both fast sources come back empty.
+        """
+        latencies, outcomes = {}, {}
+        fast_probes = [("mcstatus", self.probe_mcstatus), ("API", self.probe_api)]
+        winner = None
+
+        if race:
+            pending = {asyncio.ensure_future(self._timed_probe(name, probe, latencies, outcomes)) for name, probe in fast_probes}
             try:
-                scraped = await get_live_status_playwright()
-                print("SCRAPER RESULT:", scraped)
-
-                if "error" not in scraped:
-                    scraped_status = scraped.get("status", "").lower()
-                    scraped_players = scraped.get("players", [])
-                    if "online" in scraped_status or scraped_players:
-                        motd = scraped.get("motd", motd)
-                        status_text = scraped.get("status", status_text)
-                        players = scraped_players or players
-                        online = "online" in scraped_status
-                        print("[SCRAPER fallback SUCCESS]")
-                        source = "Scraper"
-                    else:
-                        print("[SCRAPER gave no new info]")
-            except Exception as e:
-                print(f"[SCRAPER FAIL]: {e}")
-
-
-        status_text = status_text or "Unknown"
-        print(f"[Final Status Source]: {source} | Players: {players}")
-        return motd.strip(), players, online, status_text, max_players, source
+                while pending and winner is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    winner = next((t.result() for t in done if t.result()), None)
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+        else:
+            for name, probe in fast_probes:
+                winner = await self._timed_probe(name, probe, latencies, outcomes)
+                if winner:
+                    break
+
+        if winner is None:
+            winner = await self._timed_probe("Scraper", self.probe_scraper, latencies, outcomes)
+
+        api_snapshot = self.status_service.api.snapshot
+        snapshot = StatusSnapshot(
+            motd=winner.motd,
+            players=winner.players,
+            online=winner.online,
+            status_text=winner.status_text or "Unknown",
+            max_players=winner.max_players,
+            source=winner.source,
+        ) if winner else StatusSnapshot()
+        snapshot.server = api_snapshot.server if api_snapshot else None
+        snapshot.latencies = latencies
+        snapshot.outcomes = outcomes
+        print(f"[Final Status Source]: {snapshot.source} | Players: {snapshot.players} | {snapshot.latency_text()}")
+        await self.record_probe(snapshot)
+        return snapshot
+
+    async def fetch_api_status(self):
+        started = time.perf_counter()
+        snapshot = StatusSnapshot.from_server(await self.api.get_server())
+        snapshot.latencies["API"] = round((time.perf_counter() - started) * 1000)
+        return snapshot
 
 
     @commands.command(name="refreshserverstatus", aliases=["refreshstatus", "rfs"])
@@ -250,31 +477,14 @@ class ExarotonCog(commands.Cog):
 
         await ctx.typing()
 
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
-
-        api_data = {}
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                api_data = response.json()
-                self.credit_balance = float(requests.get("https://api.exaroton.com/v1/credits", headers=headers).json().get("credits", 0.0))
+            self.credit_balance = await self.forecaster.sample(self.api)
         except Exception as e:
             print(f"[API Error] {e}")
 
-        motd = api_data.get("motd", {}).get("clean", ["Unknown"])[0]
-        players = api_data.get("players", {}).get("list", [])
-        online = api_data.get("host", {}).get("online", False)
-        status = "Online" if online else "Offline"
-
-        # Fallback to scraper
-        if not players or not online:
-            scraped = await get_live_status_playwright()
-            if "error" not in scraped:
-                motd = scraped.get("motd", motd)
-                status = scraped.get("status", status)
-                players = scraped.get("players", players)
-                online = "online" in status.lower()
+        # Force a fresh probe; everyone else's status commands pick it up from the cache
+        snapshot = await self.status_service.get(force=True)
+        motd, players, online, status = snapshot.motd, snapshot.players, snapshot.online, snapshot.status_text
 
         embed = discord.Embed(
             title="🔄 Refreshed Server Status",
@@ -283,7 +493,8 @@ class ExarotonCog(commands.Cog):
         )
         embed.add_field(name="Status", value=f"🟢 {status}" if online else f"🔴 {status}", inline=True)
         embed.add_field(name="Players Online", value=", ".join(players) if players else "Nobody online.", inline=False)
-        embed.set_footer(text="Live refresh via API and scraper fallback")
+        embed.add_field(name="Probe Race", value=snapshot.latency_text(), inline=False)
+        embed.set_footer(text=f"Live refresh via {snapshot.source} • Updated {snapshot.age_text()}")
 
         class RefreshControl(discord.ui.View):
             def __init__(self):
@@ -293,6 +504,113 @@ class ExarotonCog(commands.Cog):
 
         await ctx.send(embed=embed, view=RefreshControl())
 
+    @commands.command(name="statusttl", aliases=["statuscache"])
+    async def status_ttl(self, ctx, seconds: int = None):
+        """Dev-only: show or change how long status snapshots are reused."""
+        if ctx.author.id not in DEV_USER_ID:
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        if seconds is not None:
+            self.status_service.set_ttl(max(0, seconds))
+
+        cache = self.status_service.status
+        age = cache.snapshot.age_text() if cache.snapshot else "never"
+        await ctx.send(
+            f"🗃️ Status cache TTL: **{int(cache.ttl)}s** • last probe {age} • "
+            f"{cache.probe_count} full probes, {self.status_service.api.probe_count} API probes so far."
+        )
+
+    @commands.command(name="browserstats", aliases=["scraperpool"])
+    async def browser_stats(self, ctx):
+        """Dev-only: show the warm scraper browser's state."""
+        if ctx.author.id not in DEV_USER_ID:
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        stats = self.browser_pool.stats()
+        embed = discord.Embed(title="🧭 Scraper Browser Pool", color=0x462f80)
+        embed.add_field(name="Chromium", value="🟢 Warm" if stats["running"] else "⚫ Cold", inline=True)
+        embed.add_field(name="Launches", value=str(stats["launches"]), inline=True)
+        embed.add_field(name="Uses Since Launch", value=f"{stats['uses']}/{self.browser_pool.max_uses}", inline=True)
+        embed.add_field(name="Pages", value=f"{stats['in_use']} busy, {stats['idle_pages']} idle (max {self.browser_pool.max_pages})", inline=True)
+        embed.add_field(name="Memory", value=f"{stats['rss_mb']} MB / {self.browser_pool.max_rss_mb} MB", inline=True)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="breakers", aliases=["circuits", "sourcehealth"])
+    async def breakers_status(self, ctx, action: str = None):
+        """Dev-only: show each status source's circuit breaker. `!breakers reset` closes them all."""
+        if ctx.author.id not in DEV_USER_ID:
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        if action and action.lower() == "reset":
+            for breaker in self.breakers.values():
+                breaker.reset()
+            await ctx.send("🔌 All status source circuits reset to closed.")
+            return
+
+        state_icons = {OPEN: "🔴", HALF_OPEN: "🟡"}
+        embed = discord.Embed(title="🔌 Status Source Health", color=0x462f80)
+        for name, breaker in self.breakers.items():
+            lines = [
+                f"{state_icons.get(breaker.state, '🟢')} **{breaker.state.title()}**",
+                f"Health: {breaker.health * 100:.0f}%",
+                f"Failures: {breaker.failures} (tripped {breaker.trips}x)",
+            ]
+            if breaker.avg_latency_ms is not None:
+                lines.append(f"Avg latency: {breaker.avg_latency_ms:.0f}ms")
+            if breaker.state == OPEN:
+                lines.append(f"Retry in {int(breaker.retry_in)}s (cool-down {int(breaker.cooldown)}s)")
+            if breaker.last_error:
+                lines.append(f"Last error: `{breaker.last_error[:60]}`")
+            embed.add_field(name=name, value="\n".join(lines), inline=True)
+        embed.set_footer(text="Open circuits are skipped by !status until a half-open trial succeeds")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="scheduler", aliases=["statusschedule"])
+    async def scheduler_info(self, ctx):
+        """Dev-only: show the status watcher's state and polling cadence."""
+        if ctx.author.id not in DEV_USER_ID:
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        scheduler = self.scheduler
+        embed = discord.Embed(title="⏱️ Status Scheduler", color=0x462f80)
+        embed.add_field(name="Announced State", value="🟢 Online" if scheduler.state == ONLINE else "🔴 Offline", inline=True)
+        embed.add_field(name="Interval", value=f"~{int(scheduler.interval)}s", inline=True)
+        if scheduler.next_probe_at:
+            embed.add_field(name="Next Probe", value=f"in {max(0, int(scheduler.next_probe_at - time.time()))}s", inline=True)
+        embed.add_field(name="Probes", value=f"{scheduler.probe_count} ({scheduler.failures} failed)", inline=True)
+        if scheduler.changed_at:
+            embed.add_field(name="Last Change", value=f"<t:{int(scheduler.changed_at)}:R>", inline=True)
+        embed.set_footer(text="Polls fast around transitions and while players are on; backs off while asleep")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="streaminfo", aliases=["wsinfo"])
+    async def stream_info(self, ctx):
+        """Dev-only: show the Exaroton websocket subscription state."""
+        if ctx.author.id not in DEV_USER_ID:
+            await ctx.send("🚫 You don't have permission to use this command.")
+            return
+
+        stream = self.stream
+        embed = discord.Embed(
+            title="📡 Exaroton Stream",
+            color=discord.Color.green() if stream.connected else discord.Color.red()
+        )
+        embed.add_field(name="Connected", value="🟢 Yes" if stream.connected else "🔴 No (polling fallback)", inline=True)
+        embed.add_field(name="Reconnects", value=str(stream.reconnects), inline=True)
+        if stream.server:
+            embed.add_field(name="Server Status", value=f"{stream.server.status} ({len(stream.server.players)} players)", inline=False)
+        if stream.tick:
+            embed.add_field(name="Avg Tick", value=f"{stream.tick.get('averageTickTime', 0):.1f} ms", inline=True)
+        if stream.heap:
+            embed.add_field(name="Heap", value=f"{stream.heap.get('usage', 0) / 1024 / 1024:.0f} MB", inline=True)
+        if stream.last_message_at:
+            embed.set_footer(text=f"Last message {int(time.time() - stream.last_message_at)}s ago")
+        await ctx.send(embed=embed)
+
     @commands.command()
     @commands.is_owner()
     async def setcredits(self, ctx, amount: float, member: discord.Member = None):
@@ -303,55 +621,37 @@ class ExarotonCog(commands.Cog):
         self.credit_balance = float(amount) if user == ctx.author else self.credit_balance
 
         # Update personal donation record
-        donations = load_data("data/exaroton_donations.json")
-        donations[user_id] = donations.get(user_id, 0) + amount
-        save_data("data/exaroton_donations.json", donations)
+        await self.add_donation(user_id, amount)
 
         await ctx.send(f"✅ Set **{amount} credits** for {user.mention}.")
 
         # Optionally: show leaderboard position
-        leaderboard = sorted(donations.items(), key=lambda x: x[1], reverse=True)
-        position = [uid for uid, _ in leaderboard].index(user_id) + 1
+        position = self.donor_ranks.rank(user_id)
         await ctx.send(f"🏆 {user.display_name} is now **#{position}** on the donor leaderboard!")
 
     @commands.command(name="statusapi")
     async def statusapi(self, ctx):
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
-
         # ─── Exaroton API Check ───
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                await ctx.send("❌ Failed to fetch server status from Exaroton.")
-                return
-
-            data = response.json()
+            api_snapshot = await self.status_service.get_api()
         except Exception as e:
             await ctx.send(f"❌ API call failed: {e}")
             return
 
         # ─── Extract API Data ───
-        motd = data.get("motd", {}).get("clean", ["Unknown MOTD"])[0]
-        online = data.get("host", {}).get("online", False)
-        players = data.get("players", {}).get("list", [])
+        server = api_snapshot.server
+        motd = api_snapshot.motd
+        online = api_snapshot.online
+        players = api_snapshot.players
 
         # ─── mcstatus Patch if API Sucks ───
         if not online:
-            try:
-                server = JavaServer.lookup(SERVER_ADDRESS)
-                status = server.status()
-                if status:
-                    online = True
-                    players = [p.name for p in status.players.sample] if status.players.sample else players
-                    motd = (
-                        status.description.get("text", motd)
-                        if isinstance(status.description, dict)
-                        else str(status.description)
-                    )
-                    print("[!statusapi patched via mcstatus]")
-            except Exception as e:
-                print(f"[!statusapi mcstatus FAIL]: {e}")
+            snapshot = await self.status_service.get()
+            if snapshot.source == "mcstatus":
+                online = True
+                players = snapshot.players or players
+                motd = snapshot.motd or motd
+                print("[!statusapi patched via mcstatus]")
 
         # ─── Embed Response ───
         embed = discord.Embed(
@@ -371,19 +671,19 @@ class ExarotonCog(commands.Cog):
         )
 
         # ─── Uptime Footer ───
-        started = data.get("timeStarted")
+        started = server.time_started
         if started:
             try:
                 dt = datetime.fromisoformat(started.replace("Z", "+00:00"))
                 uptime = datetime.utcnow() - dt
                 hours, rem = divmod(int(uptime.total_seconds()), 3600)
                 minutes, _ = divmod(rem, 60)
-                embed.set_footer(text=f"Uptime: {hours}h {minutes}m • Pulled via API + mcstatus")
+                embed.set_footer(text=f"Uptime: {hours}h {minutes}m • Pulled via API + mcstatus • Updated {api_snapshot.age_text()}")
             except Exception as e:
                 print(f"[Uptime parse FAIL]: {e}")
-                embed.set_footer(text="Pulled via API + mcstatus")
+                embed.set_footer(text=f"Pulled via API + mcstatus • Updated {api_snapshot.age_text()}")
         else:
-            embed.set_footer(text="Pulled via API + mcstatus")
+            embed.set_footer(text=f"Pulled via API + mcstatus • Updated {api_snapshot.age_text()}")
 
         await ctx.send(embed=embed)
 
@@ -395,7 +695,8 @@ class ExarotonCog(commands.Cog):
             return
 
         await ctx.typing()
-        motd, players, online, status_text, max_players, source = await self.fetch_server_status()
+        snapshot = await self.status_service.get()
+        motd, players, online, status_text, source = snapshot.motd, snapshot.players, snapshot.online, snapshot.status_text, snapshot.source
 
         embed = discord.Embed(
             title="Termite Server Status",
@@ -404,7 +705,7 @@ class ExarotonCog(commands.Cog):
         )
         embed.add_field(name="Status", value=f"🟢 {status_text}" if online else f"🔴 {status_text}", inline=True)
         embed.add_field(name="Players", value=", ".join(players) if players else "Nobody online.", inline=False)
-        embed.set_footer(text=f"Pulled via {source} {'(fallback)' if source != 'mcstatus' else '(primary)'}")
+        embed.set_footer(text=f"Pulled via {source} {'(fallback)' if source != 'mcstatus' else '(primary)'}{snapshot.won_in_text()} • Updated {snapshot.age_text()}")
 
         await ctx.send(embed=embed)
 
@@ -428,19 +729,18 @@ class ExarotonCog(commands.Cog):
 
         last_donorboard_time = now
 
-        donations = load_data("data/exaroton_donations.json")
-        if not donations:
+        leaderboard = self.donor_ranks.top(top)
+        if not leaderboard:
             await ctx.send("📭 No donation data yet!")
             return
 
-        leaderboard = sorted(donations.items(), key=lambda x: x[1], reverse=True)
         embed = discord.Embed(
             title="🏆 Top Server Donors",
             description="Most generous credit contributors ❤️",
             color=0x462f80
         )
 
-        for i, (user_id, total) in enumerate(leaderboard[:top], start=1):
+        for i, (user_id, total) in enumerate(leaderboard, start=1):
             user = self.bot.get_user(int(user_id)) or f"<@{user_id}>"
             name = user.display_name if hasattr(user, 'display_name') else str(user)
             embed.add_field(
@@ -457,19 +757,20 @@ class ExarotonCog(commands.Cog):
 
     @commands.command(name="credits", aliases=["excredits", "bal"])
     async def credits(self, ctx):
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        response = requests.get("https://api.exaroton.com/v1/credits", headers=headers)
-
-        if response.status_code != 200:
+        try:
+            credits = self.credit_balance = await self.forecaster.sample(self.api)
+            forecast = await self.forecaster.forecast()
+        except Exception as e:
+            print(f"[Credits Fetch Error]: {e}")
             await ctx.send("❌ Failed to fetch credit balance.")
             return
 
-        credits = response.json().get("credits", 0.0)
         embed = discord.Embed(
             title="💳 Server Credit Balance",
             description=f"You currently have **{credits:.2f}** Termite credits remaining.",
-            color=0x3d5e8e
+            color=0xffaa00 if forecast.low else 0x3d5e8e
         )
+        embed.add_field(name="Runway", value=forecast.runway_text(), inline=False)
         embed.set_footer(text="Keep it running <:beebo:1383282292478312519>")
         await ctx.send(embed=embed)
 
@@ -485,10 +786,7 @@ class ExarotonCog(commands.Cog):
                 user_id = int(user)
                 target = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
 
-            donor_data = load_data(DONOR_FILE)
-            user_id_str = str(target.id)
-            donor_data[user_id_str] = donor_data.get(user_id_str, 0) + amount
-            save_data(DONOR_FILE, donor_data)
+            await self.add_donation(target.id, amount)
 
             await ctx.send(
                 f"<:pixel_cake:1368264542064345108> Added **{amount:.2f}** credits to **{target.display_name}**'s donation total."
@@ -505,61 +803,70 @@ class ExarotonCog(commands.Cog):
             await ctx.send("❌ Invalid input. Make sure you're naming a valid user and the amount is a number.")
 
     @commands.command()
-    async def burn(self, ctx, hours: float = 1, ram: int = 10):
-        rate_per_gb_hour = 1.0  # Exaroton's current rate
-        session_burn = round(rate_per_gb_hour * ram * hours, 2)
-        daily_burn = round(rate_per_gb_hour * ram * 24, 2)
+    async def burn(self, ctx, hours: float = 1, ram: int = None):
+        """Cost of an `hours`-long session. Uses the fitted burn rate unless a RAM size is given."""
+        if ram is not None and ram <= 0:
+            await ctx.send("⚠️ Invalid RAM config for burn estimate.")
+            return
+
+        forecast = await self.forecaster.forecast()
+        # A RAM argument is a what-if: scale the observed rate to the new size
+        rate = forecast.rate * ram / self.forecaster.ram_gb if ram else forecast.rate
+        session_burn = round(rate * hours, 2)
+        daily_burn = round(rate * 24, 2)
         weekly_burn = round(daily_burn * 7, 2)
 
-        # Estimate runtime left based on current credit balance
-        if ram > 0:
-            hours_left = self.credit_balance / (rate_per_gb_hour * ram)
-            days_left = hours_left / 24
-            lifespan = f"<:beebo:1383282292478312519> Estimated uptime left: **{hours_left:.1f}h** (~{days_left:.1f} days)"
+        if forecast.balance is None:
+            lifespan = "⚠️ No credit balance sampled yet."
+        elif rate <= 0:
+            # Nothing to divide by (e.g. SERVER_RAM_GB=0); same rule as CreditForecast.online_hours_left
+            lifespan = "<:beebo:1383282292478312519> Estimated uptime left: **n/a** (no burn rate to go on)"
         else:
-            lifespan = "⚠️ Invalid RAM config for burn estimate."
+            hours_left = forecast.balance / rate
+            lifespan = f"<:beebo:1383282292478312519> Estimated uptime left: **{hours_left:.1f}h** (~{hours_left / 24:.1f} days of nonstop play)"
+            if not ram and forecast.runout_at:
+                lifespan += f"\n📆 At the usual schedule: runs out <t:{int(forecast.runout_at)}:R>"
 
         embed = discord.Embed(
             title="🔥 Termite Burn Estimate",
-            description=f"Using **{ram}GB RAM**...",
+            description=f"Using **{ram}GB RAM** (what-if)..." if ram else f"Burning **{rate:.2f} credits/hour** while online...",
             color=0x462f80
         )
         embed.add_field(name=f"Per {hours}h session", value=f"💸 **{session_burn} credits**", inline=False)
         embed.add_field(name="Per 24h/day (1 day)", value=f"🕒 **{daily_burn} credits**", inline=False)
         embed.add_field(name="Per 7d/week", value=f"📅 **{weekly_burn} credits**", inline=False)
         embed.add_field(name="Lifespan at current balance", value=lifespan, inline=False)
-        embed.set_footer(text="Estimates assume 1 credit/GB/hour.")
+        embed.set_footer(text=f"{forecast.basis_text()}.")
 
         await ctx.send(embed=embed)
 
     @commands.command(name="burnrate", aliases=["burnstats", "projected"])
     async def burnrate(self, ctx):
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        response = requests.get(f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}", headers=headers)
-
-        if response.status_code != 200:
-            await ctx.send("❌ Couldn't fetch server details.")
+        try:
+            forecast = await self.forecaster.forecast()
+        except Exception as e:
+            print(f"[Burnrate Forecast Error]: {e}")
+            await ctx.send("❌ Couldn't build a burn forecast.")
             return
 
-        server = response.json()
-        if server.get("creditsPerHour") is None:
-            await ctx.send("⚠️ Server burn rate data is unavailable.")
+        if forecast.balance is None:
+            await ctx.send("⚠️ No credit balance sampled yet.")
             return
 
-        rate = server["creditsPerHour"]
-        balance = server.get("credits", 0.0)
-        projected_hours = balance / rate if rate > 0 else 0
+        lines = [
+            f"• Burn Rate: **{forecast.rate:.2f}** credits/hour online",
+            f"• Balance: **{forecast.balance:.2f}** credits",
+            f"• Estimated Time Left: {forecast.runway_text()}",
+        ]
+        if forecast.duty_cycle is not None:
+            lines.insert(1, f"• Online **{forecast.duty_cycle * 100:.0f}%** of the time (~{forecast.daily_burn:.1f} credits/day)")
 
         embed = discord.Embed(
             title="🔥 Burn Rate & Projections",
             color=0xdb4437,
-            description=(
-                f"• Burn Rate: **{rate:.2f}** credits/hour\n"
-                f"• Balance: **{balance:.2f}** credits\n"
-                f"• Estimated Time Left: **{projected_hours:.2f} hours**"
-            )
+            description="\n".join(lines)
         )
-        embed.set_footer(text="Based on current usage pattern")
+        embed.set_footer(text=f"{forecast.basis_text()} • balance sampled <t:{int(forecast.sampled_at)}:R>"[:2048])
         await ctx.send(embed=embed)
 
     @commands.command(name="setdonation", aliases=["setdono", "forceadd"])
@@ -572,9 +879,7 @@ class ExarotonCog(commands.Cog):
                 user_id = int(user)
                 target = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
     
-            donor_data = load_data(DONOR_FILE)
-            donor_data[str(target.id)] = amount
-            save_data(DONOR_FILE, donor_data)
+            await self.set_donation_total(target.id, amount)
     
             await ctx.send(f"✏️ Set **{target.display_name}**'s donation total to **{amount:.2f} credits**.")
         except Exception as e:
@@ -591,9 +896,7 @@ class ExarotonCog(commands.Cog):
                 user_id = int(user)
                 target = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
     
-            donor_data = load_data(DONOR_FILE)
-            donor_data[str(target.id)] = 0
-            save_data(DONOR_FILE, donor_data)
+            await self.set_donation_total(target.id, 0)
     
             await ctx.send(f"<:pixel_toast:1386118938714177649> Cleared **{target.display_name}**'s donation record.")
         except Exception as e:
@@ -624,20 +927,14 @@ class ExarotonCog(commands.Cog):
 
         await ctx.typing()
 
-        headers = {"Authorization": f"Bearer {EXAROTON_TOKEN}"}
-        url = f"https://api.exaroton.com/v1/servers/{EXAROTON_SERVER_ID}"
-
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                raise Exception(f"API status {response.status_code}")
-            data = response.json()
+            api_snapshot = await self.status_service.get_api()
         except Exception as e:
             print(f"[Uptime Fetch Error]: {e}")
             await ctx.send("❌ Could not retrieve server uptime.")
             return
 
-        time_started = data.get("timeStarted")
+        time_started = api_snapshot.server.time_started
         if not time_started:
             await ctx.send("⚠️ Server is not online or uptime not available.")
             return
@@ -653,8 +950,91 @@ class ExarotonCog(commands.Cog):
             await ctx.send("⚠️ Something went wrong calculating uptime.")
             return
 
-        await ctx.send(f"🕓 **Termite** has been online for **{hours}h {minutes}m**.")
+        await ctx.send(f"🕓 **Termite** has been online for **{hours}h {minutes}m**. _(updated {api_snapshot.age_text()})_")
+
+
+    @commands.command(name="uptime24h", aliases=["up24", "uptimeday"])
+    async def uptime_24h(self, ctx):
+        """Uptime, player counts and an hour-by-hour strip for the last 24 hours."""
+        if await self.handle_cooldown(ctx):
+            return
+
+        now = time.time()
+        summary = await asyncio.to_thread(self.history.summary, "hour", now - 23 * HOUR)
+        if summary["uptime"] is None:
+            await ctx.send("📭 No status history recorded yet.")
+            return
+
+        strip = ""
+        by_start = {row["start"]: row for row in summary["rows"]}
+        first_hour = int(now // HOUR * HOUR) - 23 * HOUR
+        for start in range(first_hour, first_hour + 24 * HOUR, HOUR):
+            row = by_start.get(start)
+            if not row or not row["observed_seconds"]:
+                strip += "⬛"
+            elif row["online_seconds"] / row["observed_seconds"] >= 0.5:
+                strip += "🟩"
+            else:
+                strip += "🟥"
+
+        embed = discord.Embed(title="📈 Termite — Last 24 Hours", color=0x462f80)
+        embed.add_field(name="Uptime", value=f"**{summary['uptime'] * 100:.1f}%**", inline=True)
+        embed.add_field(name="Peak Players", value=str(summary["peak_players"]), inline=True)
+        embed.add_field(name="Avg Players", value=f"{summary['avg_players']:.1f}", inline=True)
+        embed.add_field(name=f"<t:{first_hour}:t> → now", value=strip, inline=False)
+        if summary["names"]:
+            embed.add_field(name=f"Who Played ({len(summary['names'])})", value=", ".join(summary["names"])[:1024], inline=False)
+        embed.set_footer(text=f"🟩 mostly up • 🟥 mostly down • ⬛ no data • {summary['samples']} probes")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="statushistory", aliases=["statushist", "history"])
+    async def status_history(self, ctx, days: int = 7):
+        """Daily uptime and player peaks, plus the busiest hours, for the last `days` days."""
+        if await self.handle_cooldown(ctx):
+            return
+
+        days = max(1, min(days, 30))
+        since = time.time() - (days - 1) * DAY
+        daily, hourly = await asyncio.gather(
+            asyncio.to_thread(self.history.summary, "day", since),
+            asyncio.to_thread(self.history.summary, "hour", since),
+        )
+        if daily["uptime"] is None:
+            await ctx.send("📭 No status history recorded yet.")
+            return
 
+        lines = []
+        for row in daily["rows"]:
+            if not row["observed_seconds"]:
+                continue
+            uptime = row["online_seconds"] / row["observed_seconds"] * 100
+            lines.append(f"<t:{row['start']}:d> — **{uptime:.0f}%** up, peak {row['peak_players']}, {len(row['names'])} unique")
+
+        # Average players per hour of day (UTC) across the window
+        player_seconds, observed = [0.0] * 24, [0.0] * 24
+        for row in hourly["rows"]:
+            hour = row["start"] // HOUR % 24
+            player_seconds[hour] += row["player_seconds"]
+            observed[hour] += row["observed_seconds"]
+        busiest = sorted(
+            (h for h in range(24) if observed[h] and player_seconds[h]),
+            key=lambda h: player_seconds[h] / observed[h], reverse=True,
+        )[:3]
+
+        embed = discord.Embed(title=f"🗓️ Termite — Last {days} Day{'s' if days != 1 else ''}", color=0x462f80)
+        embed.add_field(name="Overall Uptime", value=f"**{daily['uptime'] * 100:.1f}%**", inline=True)
+        embed.add_field(name="Peak Players", value=str(daily["peak_players"]), inline=True)
+        embed.add_field(name="Unique Players", value=str(len(daily["names"])), inline=True)
+        embed.add_field(name="By Day", value="\n".join(lines)[:1024] or "No data", inline=False)
+        if busiest:
+            embed.add_field(
+                name="Busiest Hours (UTC)",
+                value="\n".join(f"`{h:02d}:00` — {player_seconds[h] / observed[h]:.1f} avg players" for h in busiest),
+                inline=False
+            )
+        if daily["avg_latency_ms"] is not None:
+            embed.set_footer(text=f"{daily['samples']} probes • avg probe latency {daily['avg_latency_ms']:.0f}ms")
+        await ctx.send(embed=embed)
 
     async def handle_cooldown(self, ctx):
         bucket = commands.CooldownMapping.from_cooldown(1, 60, commands.BucketType.user).get_bucket(ctx.message)
@@ -664,21 +1044,27 @@ class ExarotonCog(commands.Cog):
             return True
         return False
 
+    @staticmethod
+    def player_label(player):
+        link = get_links().whois(player)
+        return f"{player} (<@{link['discord_id']}>)" if link else player
+
     @commands.command(name="players", aliases=["who"])
     async def server_players(self, ctx):
         if await self.handle_cooldown(ctx):
             return
 
         await ctx.typing()
-        motd, players, online, status_text, max_players, source = await self.fetch_server_status()
+        snapshot = await self.status_service.get()
+        motd, players, online, source = snapshot.motd, snapshot.players, snapshot.online, snapshot.source
 
         embed = discord.Embed(
             title="<:beebo:1383282292478312519> Online Players",
-            description="Nobody online." if not players else ", ".join(players),
+            description="Nobody online." if not players else ", ".join(self.player_label(p) for p in players),
             color=discord.Color.green() if online else discord.Color.red()
         )
         embed.add_field(name="MOTD", value=f"`{motd}`", inline=False)
-        embed.set_footer(text=f"Pulled via {source} {'(fallback)' if source != 'mcstatus' else '(primary)'}")
+        embed.set_footer(text=f"Pulled via {source} {'(fallback)' if source != 'mcstatus' else '(primary)'}{snapshot.won_in_text()} • Updated {snapshot.age_text()}")
         await ctx.send(embed=embed)
 
 
@@ -737,7 +1123,7 @@ class ExarotonCog(commands.Cog):
 
         embed.add_field(
             name="🔔 Status Pings",
-            value="Server alerts for online/offline run every 3 hours.\nNo command needed.",
+            value="Online/offline alerts are pushed live from Exaroton (adaptive polling if the stream drops).\nNo command needed.",
             inline=False
         )
 
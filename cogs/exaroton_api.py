@@ -0,0 +1,149 @@
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import aiohttp
+
+EXAROTON_API_BASE = "https://api.exaroton.com/v1"
+EXAROTON_TOKEN = os.getenv("EXAROTON_TOKEN")
+EXAROTON_SERVER_ID = os.getenv("EXAROTON_SERVER_ID")
+REQUEST_TIMEOUT_SECONDS = 10
+CONNECT_TIMEOUT_SECONDS = 3
+KEEPALIVE_SECONDS = 60
+
+# Exaroton server status codes
+STATUS_OFFLINE = 0
+STATUS_ONLINE = 1
+STATUS_STARTING = 2
+STATUS_STOPPING = 3
+STATUS_RESTARTING = 4
+STATUS_SAVING = 5
+STATUS_LOADING = 6
+STATUS_CRASHED = 7
+STATUS_PENDING = 8
+STATUS_PREPARING = 10
+OFFLINE_STATUSES = (STATUS_OFFLINE, STATUS_CRASHED)
+
+
+class ExarotonAPIError(Exception):
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(f"Exaroton API returned {status}: {message}" if message else f"Exaroton API returned {status}")
+        self.status = status
+
+
+@dataclass
+class ServerInfo:
+    id: str
+    name: str
+    address: str
+    motd: str
+    status: int
+    online: bool
+    players: List[str] = field(default_factory=list)
+    max_players: Optional[int] = None
+    time_started: Optional[str] = None
+    uptime: int = 0
+    raw: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ServerInfo":
+        players = data.get("players") or {}
+        motd = data.get("motd") or ""
+        if isinstance(motd, dict):
+            clean = motd.get("clean") or [""]
+            motd = clean[0] if isinstance(clean, list) else str(clean)
+
+        # Older payloads nest an "online" flag and uptime under "host"
+        host = data.get("host")
+        host_online = host.get("online", False) if isinstance(host, dict) else False
+        uptime = host.get("uptime", 0) if isinstance(host, dict) else 0
+        status = data.get("status", STATUS_OFFLINE)
+
+        return cls(
+            id=data.get("id", ""),
+            name=data.get("name", ""),
+            address=data.get("address", ""),
+            motd=motd,
+            status=status,
+            online=status == STATUS_ONLINE or host_online,
+            players=[p["name"] if isinstance(p, dict) else p for p in players.get("list") or []],
+            max_players=players.get("max"),
+            time_started=data.get("timeStarted"),
+            uptime=uptime,
+            raw=data,
+        )
+
+
+class ExarotonClient:
+    """Async Exaroton API client sharing one keep-alive session across the bot."""
+
+    def __init__(self, token: str = None, server_id: str = None, base_url: str = EXAROTON_API_BASE,
+                 timeout: float = REQUEST_TIMEOUT_SECONDS):
+        self.token = token or EXAROTON_TOKEN
+        self.server_id = server_id or EXAROTON_SERVER_ID
+        self.base_url = base_url.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=CONNECT_TIMEOUT_SECONDS)
+        self.request_count = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=KEEPALIVE_SECONDS, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=self.timeout,
+                connector=connector,
+            )
+        return self._session
+
+    async def request(self, method: str, path: str, **kwargs):
+        """Send a request and return the decoded payload, unwrapping the {success, data} envelope."""
+        session = self._get_session()
+        self.request_count += 1
+        async with session.request(method, f"{self.base_url}/{path.lstrip('/')}", **kwargs) as resp:
+            if resp.status >= 400:
+                raise ExarotonAPIError(resp.status, await resp.text())
+            if resp.status == 204 or resp.content_length == 0:
+                return {}
+            body = await resp.json(content_type=None)
+
+        if isinstance(body, dict) and "success" in body:
+            if not body.get("success"):
+                raise ExarotonAPIError(resp.status, body.get("error") or "")
+            return body.get("data") or {}
+        return body
+
+    async def get_server(self, server_id: str = None) -> ServerInfo:
+        data = await self.request("GET", f"servers/{server_id or self.server_id}")
+        return ServerInfo.from_json(data)
+
+    async def get_credits(self) -> float:
+        data = await self.request("GET", "credits")
+        return float(data.get("credits", 0.0))
+
+    async def restart_server(self, server_id: str = None) -> bool:
+        await self.request("POST", f"servers/{server_id or self.server_id}/restart")
+        return True
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_client: Optional[ExarotonClient] = None
+
+
+def get_client() -> ExarotonClient:
+    """Return the process-wide client so every cog reuses the same connection pool."""
+    global _client
+    if _client is None:
+        _client = ExarotonClient()
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+
+from cogs.exaroton_api import EXAROTON_SERVER_ID, EXAROTON_TOKEN, STATUS_ONLINE, ServerInfo
+
+EXAROTON_WS_URL = "wss://api.exaroton.com/v1/servers/{server_id}/websocket"
+STREAMS = ("console", "tick", "heap")
+BACKOFF_INITIAL_SECONDS = 1
+BACKOFF_MAX_SECONDS = 300
+HEARTBEAT_SECONDS = 30
+CONSOLE_HISTORY = 200
+
+
+class ExarotonStream:
+    """Subscribes to the Exaroton server websocket and pushes changes into the bot.
+
+    Status updates arrive on the always-on "status" stream; console, tick and heap
+    are (re)started whenever the server reports it is online. Reconnects forever with
+    jittered exponential backoff until `stop()` is called.
+    """
+
+    def __init__(self, on_status: Callable[[ServerInfo], Awaitable[None]] = None,
+                 on_event: Callable[[str, str, object], Awaitable[None]] = None,
+                 token: str = None, server_id: str = None, url: str = None, streams=STREAMS):
+        self.token = token or EXAROTON_TOKEN
+        self.url = url or EXAROTON_WS_URL.format(server_id=server_id or EXAROTON_SERVER_ID)
+        self.streams = tuple(streams)
+        self.on_status = on_status
+        self.on_event = on_event
+
+        self.connected = False
+        self.server: Optional[ServerInfo] = None
+        self.tick: Optional[dict] = None
+        self.heap: Optional[dict] = None
+        self.console = deque(maxlen=CONSOLE_HISTORY)
+        self.reconnects = 0
+        self.last_message_at: Optional[float] = None
+
+        self._task: Optional[asyncio.Task] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._started_streams = set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def _run(self):
+        backoff = BACKOFF_INITIAL_SECONDS
+        async with aiohttp.ClientSession(headers={"Authorization": f"Bearer {self.token}"}) as session:
+            while True:
+                ready = False
+                try:
+                    async with session.ws_connect(self.url, heartbeat=HEARTBEAT_SECONDS) as ws:
+                        self._ws = ws
+                        self._started_streams.clear()
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            if await self._handle(json.loads(msg.data)):
+                                ready = True
+                                backoff = BACKOFF_INITIAL_SECONDS
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[Exaroton Stream] Connection error: {e}")
+                finally:
+                    self._ws = None
+                    self.connected = False
+
+                self.reconnects += 1
+                delay = BACKOFF_INITIAL_SECONDS if ready else backoff
+                delay = random.uniform(delay / 2, delay)
+                print(f"[Exaroton Stream] Disconnected, reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                if not ready:
+                    backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+
+    async def _handle(self, message: dict) -> bool:
+        """Dispatch one websocket message. Returns True once the socket is ready."""
+        self.last_message_at = time.time()
+        msg_type = message.get("type")
+        stream = message.get("stream")
+        data = message.get("data")
+
+        if msg_type == "ready":
+            # Exaroton follows "ready" with the current status, which starts the streams
+            self.connected = True
+            print("[Exaroton Stream] Ready")
+            return True
+
+        if stream == "status" and msg_type == "status":
+            self.server = ServerInfo.from_json(data or {})
+            if self.server.status == STATUS_ONLINE:
+                await self._start_streams()
+            else:
+                self._started_streams.clear()
+            if self.on_status:
+                await self.on_status(self.server)
+        elif stream == "tick" and msg_type == "tick":
+            self.tick = data
+        elif stream == "heap" and msg_type == "heap":
+            self.heap = data
+        elif stream == "console" and msg_type == "line":
+            self.console.append(data)
+
+        if stream and stream != "status" and self.on_event:
+            await self.on_event(stream, msg_type, data)
+        return False
+
+    async def _start_streams(self):
+        if not self._ws:
+            return
+        for stream in self.streams:
+            if stream in self._started_streams:
+                continue
+            payload = {"stream": stream, "type": "start"}
+            if stream == "console":
+                payload["data"] = {"tail": 0}
+            await self._ws.send_str(json.dumps(payload))
+            self._started_streams.add(stream)
@@ -20,6 +20,7 @@ class HelpCog(commands.Cog):
                 "!unlinkmc": "Remove your Minecraft link.",
                 "!linkstatus": "Check your current Minecraft link.",
                 "!checkuuid <username>": "Fetch UUID of a Minecraft user.",
+                "!whois <username|uuid>": "See which Discord account a Minecraft player is linked to.",
                 "!rewardhistory": "View your last 5 rewards.",
                 "!pool": "Check the server credit pool.",
                 "!pooladd <amount>": "Admin: Add to server credit pool.",
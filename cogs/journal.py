@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+from typing import Any, Callable, Optional
+
+from cogs.data_cache import run_io, write_atomic
+
+JOURNAL_DIR = "data/journals"
+COMPACT_EVERY = int(os.getenv("JOURNAL_COMPACT_EVERY", 500))  # journal lines before a snapshot is taken
+
+
+class Journal:
+    """Append-only JSONL event log with snapshot compaction.
+
+    State is `reducer(state, event)` folded over every event ever appended.
+    Each append is one fsync'd line in `<name>.jsonl`. Once the tail passes
+    `compact_every` lines, the folded state is written to `<name>.snapshot.json`
+    in the background and the journal is truncated. Opening replays the
+    snapshot plus whatever journal tail came after it.
+
+    Every line carries a sequence number and the snapshot records the last one
+    it includes, so a crash between writing the snapshot and truncating the
+    journal can't apply an event twice.
+    """
+
+    def __init__(self, name: str, reducer: Callable[[Any, dict], None], initial: Callable[[], Any] = dict,
+                 directory: str = JOURNAL_DIR, compact_every: int = COMPACT_EVERY, legacy_file: Optional[str] = None):
+        self.name = name
+        self.reducer = reducer
+        self.compact_every = compact_every
+        self.journal_path = os.path.join(directory, f"{name}.jsonl")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.seq = 0
+        self.tail = 0  # events in the journal that aren't in the snapshot yet
+        self.appends = 0
+        self.compactions = 0
+        self._lock = asyncio.Lock()
+        self._compacting: Optional[asyncio.Task] = None
+        os.makedirs(directory, exist_ok=True)
+        self.state = self._open(initial, legacy_file)
+
+    def _open(self, initial, legacy_file):
+        state, snapshot_seq = initial(), 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            state, snapshot_seq = snapshot["state"], snapshot["seq"]
+        elif legacy_file and os.path.exists(legacy_file):
+            # One-shot import of the old whole-file JSON as the first snapshot
+            with open(legacy_file, "r") as f:
+                state = json.load(f)
+            write_atomic(self.snapshot_path, json.dumps({"seq": 0, "state": state}).encode())
+            os.replace(legacy_file, legacy_file + ".migrated")
+            print(f"[Journal] Imported {legacy_file} as the {self.name} snapshot")
+
+        self.seq = snapshot_seq
+        if os.path.exists(self.journal_path):
+            good = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    good += len(line)
+                    if record["seq"] <= snapshot_seq:
+                        continue
+                    self.reducer(state, record["event"])
+                    self.seq = record["seq"]
+                    self.tail += 1
+            if good < os.path.getsize(self.journal_path):
+                # Torn final line from a crash mid-append; cut it off so new appends start on a clean line
+                print(f"[Journal] Truncating torn tail of {self.journal_path}")
+                os.truncate(self.journal_path, good)
+        return state
+
+    def _write_line(self, line: bytes):
+        with open(self.journal_path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def append(self, event: dict):
+        """Apply `event` to the in-memory state and durably log it."""
+        async with self._lock:
+            self.seq += 1
+            line = json.dumps({"seq": self.seq, "event": event}, separators=(",", ":")).encode() + b"\n"
+            await run_io(self._write_line, line)
+            self.reducer(self.state, event)
+            self.tail += 1
+            self.appends += 1
+        if self.tail >= self.compact_every and (self._compacting is None or self._compacting.done()):
+            self._compacting = asyncio.ensure_future(self.compact())
+
+    def _compact_sync(self, payload: bytes):
+        write_atomic(self.snapshot_path, payload)
+        with open(self.journal_path, "wb") as f:
+            os.fsync(f.fileno())
+
+    async def compact(self):
+        """Fold the journal into a fresh snapshot and truncate it."""
+        async with self._lock:
+            if not self.tail:
+                return
+            payload = json.dumps({"seq": self.seq, "state": self.state}, separators=(",", ":")).encode()
+            try:
+                await run_io(self._compact_sync, payload)
+            except Exception as e:
+                print(f"[Journal] Failed to compact {self.name}: {e}")
+                return
+            self.tail = 0
+            self.compactions += 1
+
+    async def close(self):
+        if self._compacting and not self._compacting.done():
+            await self._compacting
+        await self.compact()
+
+    def metrics(self) -> dict:
+        return {"seq": self.seq, "tail": self.tail, "appends": self.appends, "compactions": self.compactions}
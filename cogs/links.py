@@ -0,0 +1,153 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from cogs.storage import Storage, get_storage
+
+LINK_COLUMNS = "discord_id, username, uuid, verified"
+
+
+def uuid_key(uuid: str) -> str:
+    """Undashed lowercase, so dashed and undashed forms find the same link."""
+    return uuid.replace("-", "").lower()
+
+
+def is_uuid_key(key: str) -> bool:
+    """True for a uuid_key() (32 hex digits); Minecraft names are at most 16 characters, so never mistaken for one."""
+    return len(key) == 32 and all(c in "0123456789abcdef" for c in key)
+
+
+class LinkStore:
+    """Discord <-> Minecraft account links (the mc_links table), indexed every way they're looked up.
+
+    Links are kept in memory by Discord id, with reverse indexes from lowercased
+    username and from UUID. SQLite stays the source of truth: the store is
+    loaded from it once, and every write goes through here and updates the
+    indexes after it commits. Writes are serialized, so a claim's "is this name
+    free?" check and its insert can't interleave with another claim.
+    """
+
+    def __init__(self, storage: Storage = None):
+        self.storage = storage or get_storage()
+        self.loaded = False
+        self._links: Dict[str, dict] = {}
+        self._by_name: Dict[str, Set[str]] = {}  # a set: dev links and old JSON data can share a name
+        self._by_uuid: Dict[str, Set[str]] = {}
+        self._write_lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._links)
+
+    async def load(self):
+        """Read every link from the database. Safe to call from each cog's cog_load; only the first one reads."""
+        async with self._write_lock:
+            if self.loaded:
+                return
+            for row in await self.storage.fetchall(f"SELECT {LINK_COLUMNS} FROM mc_links"):
+                self._index(row)
+            self.loaded = True
+
+    def _index(self, link: dict):
+        self._unindex(link["discord_id"])
+        self._links[link["discord_id"]] = link
+        self._by_name.setdefault(link["username"].lower(), set()).add(link["discord_id"])
+        self._by_uuid.setdefault(uuid_key(link["uuid"]), set()).add(link["discord_id"])
+
+    def _unindex(self, discord_id: str) -> Optional[dict]:
+        link = self._links.pop(discord_id, None)
+        if link is None:
+            return None
+        for index, key in ((self._by_name, link["username"].lower()), (self._by_uuid, uuid_key(link["uuid"]))):
+            holders = index.get(key)
+            holders.discard(discord_id)
+            if not holders:
+                del index[key]
+        return link
+
+    @staticmethod
+    def _first(index: Dict[str, Set[str]], key: str) -> Optional[str]:
+        holders = index.get(key)
+        return min(holders) if holders else None
+
+    # --- lookups: all O(1), no database round trip ---
+
+    def get(self, discord_id) -> Optional[dict]:
+        return self._links.get(str(discord_id))
+
+    def by_username(self, username: str) -> Optional[dict]:
+        return self._links.get(self._first(self._by_name, username.lower()))
+
+    def by_uuid(self, uuid: str) -> Optional[dict]:
+        return self._links.get(self._first(self._by_uuid, uuid_key(uuid)))
+
+    def whois(self, player: str) -> Optional[dict]:
+        """The link for a Minecraft player given by name or UUID (dashed or not), or None."""
+        key = uuid_key(player)
+        if is_uuid_key(key):
+            return self.by_uuid(key)
+        return self.by_username(player)
+
+    # --- writes ---
+
+    async def claim(self, discord_id, username: str, uuid: str) -> Optional[dict]:
+        """Link `username` to `discord_id` as unverified, unless another account already has it.
+
+        Returns the conflicting link, or None if the claim went through.
+        """
+        discord_id = str(discord_id)
+        await self.load()
+        async with self._write_lock:
+            taken = self.by_username(username)  # even by this account: re-claiming mustn't reset verification
+            if taken is None:
+                taken = self.by_uuid(uuid)  # the same account under a new name
+                taken = taken if taken and taken["discord_id"] != discord_id else None
+            if taken:
+                return taken
+            await self._write(discord_id, username, uuid, 0)
+        return None
+
+    async def save(self, discord_id, username: str, uuid: str, verified=None):
+        """Link unconditionally (dev override)."""
+        await self.load()
+        async with self._write_lock:
+            await self._write(str(discord_id), username, uuid, verified)
+
+    async def _write(self, discord_id: str, username: str, uuid: str, verified):
+        await self.storage.execute(
+            f"INSERT OR REPLACE INTO mc_links ({LINK_COLUMNS}) VALUES (?, ?, ?, ?)",
+            (discord_id, username, uuid, verified),
+        )
+        self._index({"discord_id": discord_id, "username": username, "uuid": uuid, "verified": verified})
+
+    async def verify(self, discord_id) -> Optional[dict]:
+        """Mark a link verified. Returns it, or None if there's no such link."""
+        discord_id = str(discord_id)
+        await self.load()
+        async with self._write_lock:
+            link = self._links.get(discord_id)
+            if link is None:
+                return None
+            await self.storage.execute("UPDATE mc_links SET verified = 1 WHERE discord_id = ?", (discord_id,))
+            link["verified"] = 1
+            return link
+
+    async def delete(self, discord_id) -> Optional[dict]:
+        """Unlink (or revoke) a Discord account. Returns the removed link, or None if there wasn't one."""
+        discord_id = str(discord_id)
+        await self.load()
+        async with self._write_lock:
+            if discord_id not in self._links:
+                return None
+            await self.storage.execute("DELETE FROM mc_links WHERE discord_id = ?", (discord_id,))
+            return self._unindex(discord_id)
+
+
+_links: Optional[LinkStore] = None
+
+
+def get_links() -> LinkStore:
+    """Return the process-wide link store, so every cog sees the same indexes."""
+    global _links
+    if _links is None:
+        _links = LinkStore()
+    return _links
+
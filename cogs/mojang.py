@@ -0,0 +1,235 @@
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+MOJANG_API_BASE = os.getenv("MOJANG_API_BASE", "https://api.mojang.com")
+BULK_LIMIT = 10  # names per POST /profiles/minecraft; Mojang rejects larger batches
+BATCH_WINDOW_SECONDS = 0.05  # how long the first lookup waits for others to share its request
+PROFILE_TTL_SECONDS = int(os.getenv("MOJANG_PROFILE_TTL", 6 * 60 * 60))
+MISSING_TTL_SECONDS = int(os.getenv("MOJANG_MISSING_TTL", 10 * 60))  # unknown names get claimed; don't remember them long
+MAX_CACHED_NAMES = 5000
+RATE_PER_SECOND = 1.0  # Mojang allows ~600 requests per 10 minutes per IP
+BURST = 10
+MAX_RETRIES = 2  # extra attempts after a 429
+REQUEST_TIMEOUT_SECONDS = 10
+CONNECT_TIMEOUT_SECONDS = 3
+KEEPALIVE_SECONDS = 60
+
+VALID_NAME = re.compile(r"^[A-Za-z0-9_]{1,16}$")  # one bad name makes the bulk endpoint 400 the whole batch
+
+
+class MojangAPIError(Exception):
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(f"Mojang API returned {status}: {message}" if message else f"Mojang API returned {status}")
+        self.status = status
+
+
+def dashed_uuid(raw: str) -> str:
+    return f"{raw[:8]}-{raw[8:12]}-{raw[12:16]}-{raw[16:20]}-{raw[20:]}"
+
+
+def retry_seconds(header: Optional[str], default: float) -> float:
+    """Retry-After as seconds; it may be missing, or an HTTP date rather than a number."""
+    try:
+        return max(float(header), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class Profile:
+    uuid: str  # undashed, as Mojang returns it
+    name: str  # current capitalisation
+
+    @property
+    def dashed(self) -> str:
+        return dashed_uuid(self.uuid)
+
+
+class TokenBucket:
+    """Allows `capacity` requests at once, refilling at `rate` per second."""
+
+    def __init__(self, rate: float = RATE_PER_SECOND, capacity: int = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds` (Mojang said slow down)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class MojangResolver:
+    """Name -> profile lookups, cached and batched through Mojang's bulk endpoint.
+
+    Concurrent lookups are queued for a short window and sent together, up to
+    BULK_LIMIT names per request, with requests paced by a token bucket. Both
+    hits and misses are cached (misses for less time); a name already queued or
+    in flight is shared rather than asked for twice. Errors are never cached.
+    """
+
+    def __init__(self, base_url: str = MOJANG_API_BASE, rate: float = RATE_PER_SECOND, burst: int = BURST,
+                 ttl: float = PROFILE_TTL_SECONDS, missing_ttl: float = MISSING_TTL_SECONDS,
+                 window: float = BATCH_WINDOW_SECONDS, timeout: float = REQUEST_TIMEOUT_SECONDS):
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(rate, burst)
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.window = window
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=CONNECT_TIMEOUT_SECONDS)
+        self.request_count = 0
+        self.cache_hits = 0
+        self._cache: Dict[str, Tuple[float, Optional[Profile]]] = {}  # lowercased name -> (expires, profile or None)
+        self._waiting: Dict[str, asyncio.Future] = {}  # queued or in flight
+        self._queue: List[str] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._sends = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=KEEPALIVE_SECONDS, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(timeout=self.timeout, connector=connector)
+        return self._session
+
+    def cached(self, name: str) -> Tuple[bool, Optional[Profile]]:
+        """(True, profile or None) if we have a fresh answer for `name`, else (False, None)."""
+        entry = self._cache.get(name.lower())
+        if entry is None or entry[0] < time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def _remember(self, key: str, profile: Optional[Profile]):
+        now = time.monotonic()
+        if len(self._cache) >= MAX_CACHED_NAMES:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] >= now}
+            while len(self._cache) >= MAX_CACHED_NAMES:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (now + (self.ttl if profile else self.missing_ttl), profile)
+
+    async def resolve(self, name: str) -> Optional[Profile]:
+        """The profile currently using `name`, or None if nobody does. Raises MojangAPIError if Mojang can't be reached."""
+        if not VALID_NAME.match(name):
+            return None
+        hit, profile = self.cached(name)
+        if hit:
+            self.cache_hits += 1
+            return profile
+        key = name.lower()
+        future = self._waiting.get(key)
+        if future is None:
+            future = self._waiting[key] = asyncio.get_running_loop().create_future()
+            self._queue.append(name)
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush())
+        # Shielded: one caller giving up mustn't cancel the lookup for everyone sharing it
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, names: Iterable[str]) -> Dict[str, Optional[Profile]]:
+        """Resolve several names at once; keyed by the names as given."""
+        names = list(dict.fromkeys(names))
+        results = await asyncio.gather(*(self.resolve(name) for name in names))
+        return dict(zip(names, results))
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        while self._queue:
+            await self.bucket.acquire()
+            batch, self._queue = self._queue[:BULK_LIMIT], self._queue[BULK_LIMIT:]
+            task = asyncio.create_task(self._send(batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: List[str]):
+        found, error = None, None
+        try:
+            found = {profile.name.lower(): profile for profile in await self._lookup(batch)}
+        except MojangAPIError as e:
+            error = e
+        except Exception as e:  # a malformed response must fail the batch, not strand its callers
+            error = MojangAPIError(0, f"unexpected response: {e!r}")
+        finally:
+            # Every name in the batch is settled and released, however the lookup ended (even cancelled)
+            for name in batch:
+                key = name.lower()
+                future = self._waiting.pop(key, None)
+                if found is not None:
+                    self._remember(key, found.get(key))
+                if future is None or future.done():
+                    continue
+                if found is not None:
+                    future.set_result(found.get(key))
+                else:
+                    future.set_exception(error or MojangAPIError(0, "lookup cancelled"))
+                    future.exception()  # retrieved here so an abandoned lookup doesn't warn
+
+    async def _lookup(self, names: List[str]) -> List[Profile]:
+        session = self._get_session()
+        for attempt in range(MAX_RETRIES + 1):
+            self.request_count += 1
+            try:
+                async with session.post(f"{self.base_url}/profiles/minecraft", json=names) as resp:
+                    if resp.status == 429 and attempt < MAX_RETRIES:
+                        retry_after = resp.headers.get("Retry-After")
+                        self.bucket.pause(retry_seconds(retry_after, 1 / self.bucket.rate))
+                        print(f"[Mojang] Rate limited, backing off (attempt {attempt + 1})")
+                    elif resp.status >= 400:
+                        raise MojangAPIError(resp.status, await resp.text())
+                    else:
+                        data = await resp.json(content_type=None)
+                        return [Profile(item["id"], item["name"]) for item in data or []]
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise MojangAPIError(0, str(e) or type(e).__name__)
+            await self.bucket.acquire()
+        raise MojangAPIError(429, "still rate limited")
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+        for task in list(self._sends):
+            task.cancel()
+        for future in self._waiting.values():
+            future.cancel()
+        self._waiting.clear()
+        self._queue.clear()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_resolver: Optional[MojangResolver] = None
+
+
+def get_resolver() -> MojangResolver:
+    """Return the process-wide resolver so every command shares its cache and rate limit."""
+    global _resolver
+    if _resolver is None:
+        _resolver = MojangResolver()
+    return _resolver
+
+
+async def close_resolver():
+    global _resolver
+    if _resolver is not None:
+        await _resolver.close()
+        _resolver = None
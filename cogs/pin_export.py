@@ -0,0 +1,119 @@
+import csv
+import gzip
+import io
+import json
+from typing import Iterable, List, Tuple
+
+FORMATS = ("json", "csv", "ndjson", "geojson")
+EXPORT_COLUMNS = ("id", "x", "y", "z", "dimension", "description", "submitter_id", "attributed_user_id", "timestamp")
+CSV_HEADER = ["ID", "X", "Y", "Z", "Dimension", "Description", "Submitter", "Attributed", "Timestamp"]
+GZIP_FLUSH_BYTES = 256 * 1024  # uncompressed bytes between gzip sync flushes, bounds how far our size estimate can lag
+PART_HEADROOM = 64 * 1024  # stay this far under the attachment limit for multipart form overhead
+
+
+def _csv_line(values) -> bytes:
+    out = io.StringIO()
+    csv.writer(out).writerow(values)
+    return out.getvalue().encode()
+
+
+class Encoder:
+    """Turns pin rows into one self-contained document per part: header, records, footer."""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+
+    def header(self) -> bytes:
+        return {
+            "json": b"{\n",
+            "csv": _csv_line(CSV_HEADER),
+            "ndjson": b"",
+            "geojson": b'{"type":"FeatureCollection","features":[\n',
+        }[self.fmt]
+
+    def footer(self) -> bytes:
+        return {"json": b"\n}\n", "csv": b"", "ndjson": b"", "geojson": b"\n]}\n"}[self.fmt]
+
+    def record(self, pin: dict, first: bool) -> bytes:
+        sep = b"" if first else b",\n"
+        if self.fmt == "json":
+            body = {k: pin[k] for k in EXPORT_COLUMNS if k != "id"}
+            return sep + f'"{pin["id"]}": '.encode() + json.dumps(body).encode()
+        if self.fmt == "csv":
+            return _csv_line([pin[k] for k in EXPORT_COLUMNS])
+        if self.fmt == "ndjson":
+            return json.dumps(pin).encode() + b"\n"
+        feature = {
+            "type": "Feature",
+            "id": pin["id"],
+            "geometry": {"type": "Point", "coordinates": [pin["x"], pin["z"]]},
+            "properties": {k: pin[k] for k in EXPORT_COLUMNS if k not in ("id", "x", "z")},
+        }
+        return sep + json.dumps(feature).encode()
+
+
+class Part:
+    """One attachment being written into memory, optionally through gzip."""
+
+    def __init__(self, compress: bool, flush_every: int = GZIP_FLUSH_BYTES):
+        self.buffer = io.BytesIO()
+        self.gzip = gzip.GzipFile(fileobj=self.buffer, mode="wb", mtime=0) if compress else None
+        self.flush_every = flush_every
+        self._unflushed = 0
+
+    def size(self) -> int:
+        # With gzip, anything not yet flushed counts at its uncompressed size, so this never underestimates
+        return self.buffer.tell() + self._unflushed
+
+    def write(self, data: bytes):
+        if self.gzip is None:
+            self.buffer.write(data)
+            return
+        self.gzip.write(data)
+        self._unflushed += len(data)
+        if self._unflushed >= self.flush_every:
+            self.gzip.flush()
+            self._unflushed = 0
+
+    def close(self) -> io.BytesIO:
+        if self.gzip is not None:
+            self.gzip.close()
+            self._unflushed = 0
+        self.buffer.seek(0)
+        return self.buffer
+
+
+def export_parts(rows: Iterable[dict], fmt: str, compress: bool = False, limit: int = 0) -> List[Tuple[str, io.BytesIO]]:
+    """Stream `rows` into in-memory attachments of `fmt`, starting a new part before one would pass `limit` bytes.
+
+    Every part is a complete file on its own (each JSON part is a full object,
+    each CSV part has the header row). Returns [(filename, buffer), ...].
+    """
+    encoder = Encoder(fmt)
+    header, footer = encoder.header(), encoder.footer()
+    budget = max(limit - PART_HEADROOM, 0) if limit else 0
+    parts: List[Part] = []
+    part = None
+
+    for row in rows:
+        pin = dict(row)
+        if part is not None:
+            record = encoder.record(pin, first=False)
+            if budget and part.size() + len(record) + len(footer) > budget:
+                part.write(footer)
+                part = None
+        if part is None:
+            part = Part(compress, min(GZIP_FLUSH_BYTES, budget // 8) if budget else GZIP_FLUSH_BYTES)
+            parts.append(part)
+            part.write(header)
+            record = encoder.record(pin, first=True)
+        part.write(record)
+
+    if part is None:
+        return []
+    part.write(footer)
+
+    suffix = f".{fmt}" + (".gz" if compress else "")
+    if len(parts) == 1:
+        return [(f"pin_export{suffix}", parts[0].close())]
+    return [(f"pin_export.part{i}of{len(parts)}{suffix}", p.close()) for i, p in enumerate(parts, start=1)]
@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from typing import Iterator, List, Optional, Tuple
+
+from cogs.pin_index import OVERWORLD, parse_dimension
+
+MAX_COORD = 30_000_000  # the world border
+MAX_DESCRIPTION = 200  # pin names end up in embed field titles (256 chars max)
+CSV_FIELDS = {  # lowercased header -> pin field; covers our own !exportpins CSV and common spreadsheet names
+    "x": "x", "y": "y", "z": "z",
+    "description": "description", "name": "description", "label": "description", "title": "description",
+    "dimension": "dimension", "dim": "dimension", "world": "dimension",
+}
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def _coord(value, name: str, required: bool = True) -> Optional[int]:
+    if value is None or str(value).strip() in ("", "~"):
+        if required:
+            raise InvalidRow(f"missing {name}")
+        return None
+    try:
+        number = int(float(value))
+    except (TypeError, ValueError):
+        raise InvalidRow(f"{name} `{value}` isn't a number")
+    if abs(number) > MAX_COORD:
+        raise InvalidRow(f"{name} {number} is outside the world border")
+    return number
+
+
+def make_pin(x, y, z, description, dimension, default_dimension: str) -> dict:
+    """Validate one waypoint into the fields stored on a pin."""
+    description = " ".join(str(description or "").split())
+    if not description:
+        raise InvalidRow("missing description")
+    dim = default_dimension
+    if dimension not in (None, ""):
+        dim = parse_dimension(dimension)
+        if dim is None:
+            raise InvalidRow(f"unknown dimension `{dimension}`")
+    return {
+        "x": _coord(x, "x"),
+        "y": _coord(y, "y", required=False),
+        "z": _coord(z, "z"),
+        "description": description[:MAX_DESCRIPTION],
+        "dimension": dim,
+    }
+
+
+# --- per-format readers: each yields (line or item number, fields for make_pin) ---
+
+def _read_csv(lines: Iterator[str]):
+    reader = csv.reader(lines)
+    header = [CSV_FIELDS.get(h.strip().lower()) for h in next(reader, [])]
+    if not {"x", "z", "description"} <= set(header):
+        raise InvalidRow("CSV needs X, Z and Description (or Name) columns")
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield reader.line_num, {field: value for field, value in zip(header, row) if field}
+
+
+def _read_xaero(lines: Iterator[str]):
+    # waypoint:name:initials:x:y:z:color:disabled:type:set:rotate_on_tp:tp_yaw:visibility_type[:destination]
+    for number, line in enumerate(lines, start=1):
+        if not line.startswith("waypoint:"):
+            continue  # comments, "sets:" lines
+        parts = line.rstrip("\r\n").split(":")
+        if len(parts) < 6:
+            yield number, {}
+            continue
+        # Xaero escapes ':' inside names as '§§'
+        yield number, {"description": parts[1].replace("§§", ":"), "x": parts[3], "y": parts[4], "z": parts[5]}
+
+
+def _journeymap_fields(item: dict) -> dict:
+    pos = item.get("pos") or item  # JourneyMap 5.9+ nests coordinates under "pos"
+    dimension = item.get("primaryDimension")
+    if dimension is None and item.get("dimensions"):
+        dimension = item["dimensions"][0]
+    return {"description": item.get("name"), "x": pos.get("x"), "y": pos.get("y"), "z": pos.get("z"), "dimension": dimension}
+
+
+def _pin_fields(item: dict) -> dict:
+    if "name" in item and "description" not in item:
+        return _journeymap_fields(item)
+    return {key: item.get(key) for key in ("x", "y", "z", "description", "dimension")}
+
+
+def _read_json(text: str):
+    data = json.loads(text)
+    if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+        for number, feature in enumerate(data.get("features", []), start=1):
+            coords = (feature.get("geometry") or {}).get("coordinates") or [None, None]
+            props = feature.get("properties") or {}
+            yield number, {"x": coords[0], "z": coords[1] if len(coords) > 1 else None, "y": props.get("y"),
+                           "description": props.get("description") or props.get("name"), "dimension": props.get("dimension")}
+        return
+    if isinstance(data, dict) and ("name" in data or "description" in data):
+        data = [data]  # a single JourneyMap waypoint file
+    items = data.values() if isinstance(data, dict) else data  # our own export is {id: pin}
+    for number, item in enumerate(items, start=1):
+        yield number, _pin_fields(item) if isinstance(item, dict) else {}
+
+
+def _read_ndjson(lines: Iterator[str]):
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                yield number, {}
+                continue
+            yield number, _pin_fields(item) if isinstance(item, dict) else {}
+
+
+def detect_format(filename: str, head: str) -> Optional[str]:
+    name = filename.lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith((".json", ".geojson")) or head.lstrip().startswith(("{", "[")):
+        return "json"
+    if "waypoint:" in head or name.endswith(".txt"):
+        return "xaero"
+    if name.endswith(".csv") or "," in head:
+        return "csv"
+    return None
+
+
+def parse_waypoints(data: bytes, filename: str, default_dimension: str = OVERWORLD) -> Tuple[List[dict], List[str]]:
+    """Parse an uploaded waypoint file into validated pins. Returns (pins, problems).
+
+    Line-based formats (CSV, Xaero, NDJSON) are read one line at a time; JSON
+    documents are parsed whole. Bad rows are reported and skipped, not fatal.
+    """
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", errors="replace", newline="")
+    head = text.read(4096)
+    text.seek(0)
+    fmt = detect_format(filename, head)
+    if fmt is None:
+        return [], [f"Couldn't tell what kind of file `{filename}` is."]
+
+    pins, problems = [], []
+    try:
+        rows = _read_json(text.read()) if fmt == "json" else {"csv": _read_csv, "xaero": _read_xaero, "ndjson": _read_ndjson}[fmt](text)
+        for number, fields in rows:
+            try:
+                if not fields:
+                    raise InvalidRow("unreadable entry")
+                pins.append(make_pin(fields.get("x"), fields.get("y"), fields.get("z"),
+                                     fields.get("description"), fields.get("dimension"), default_dimension))
+            except InvalidRow as e:
+                problems.append(f"{'line' if fmt != 'json' else 'entry'} {number}: {e}")
+    except (InvalidRow, json.JSONDecodeError, csv.Error) as e:
+        problems.append(f"{fmt.upper()} file couldn't be read: {e}")
+    return pins, problems
+
+
+def dedup_key(pin) -> tuple:
+    """Two pins are the same if they're at the same x/z in the same dimension with the same description."""
+    return pin["dimension"], pin["x"], pin["z"], pin["description"].strip().lower()
@@ -0,0 +1,261 @@
+import bisect
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+CELL_SIZE = 128  # blocks per grid cell; a !nearby radius of a few hundred blocks touches ~25 cells
+MAX_RING_SEARCH = 8  # past this many rings, nearest() switches to a best-first walk over occupied blocks
+BLOCK_CELLS = 16  # cells per side of a coarse block, the first level of that walk
+
+OVERWORLD = "overworld"
+NETHER = "nether"
+END = "end"
+DIMENSION_ALIASES = {
+    "overworld": OVERWORLD, "ow": OVERWORLD, "world": OVERWORLD, "0": OVERWORLD,
+    "nether": NETHER, "n": NETHER, "the_nether": NETHER, "-1": NETHER,
+    "end": END, "e": END, "the_end": END, "1": END,
+}  # numeric ids are the legacy ones Xaero and JourneyMap still write
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+PREFIX_WEIGHT = 0.5  # a prefix hit ("dia" -> "diamond") counts half as much as the whole word
+
+
+def parse_dimension(text):
+    if text is None or text == "":
+        return None
+    name = str(text).strip().lower()
+    return DIMENSION_ALIASES.get(name.split(":", 1)[1] if name.startswith("minecraft:") else name)
+
+
+class SpatialIndex:
+    """Uniform grid over pin x/z coordinates, one grid per dimension.
+
+    Inserts and removals touch a single cell. `within` visits only the cells
+    the query circle overlaps; `nearest` searches outward ring by ring and stops
+    once no unvisited cell can beat the k-th best distance, falling back to a
+    best-first walk over coarse blocks when the neighbourhood is empty.
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[str, Dict[Tuple[int, int], Set[int]]] = {}
+        self._blocks: Dict[str, Dict[Tuple[int, int], Set[Tuple[int, int]]]] = {}
+        self._points: Dict[int, Tuple[str, int, int]] = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def position(self, pin_id: int):
+        """(dimension, x, z) of an indexed pin, or None."""
+        return self._points.get(pin_id)
+
+    def _cell(self, x: int, z: int) -> Tuple[int, int]:
+        return x // self.cell_size, z // self.cell_size
+
+    @staticmethod
+    def _block(key: Tuple[int, int]) -> Tuple[int, int]:
+        return key[0] // BLOCK_CELLS, key[1] // BLOCK_CELLS
+
+    def insert(self, pin_id: int, dimension: str, x: int, z: int):
+        if pin_id in self._points:
+            self.remove(pin_id)
+        self._points[pin_id] = (dimension, x, z)
+        key = self._cell(x, z)
+        cell = self._cells.setdefault(dimension, {}).setdefault(key, set())
+        if not cell:
+            self._blocks.setdefault(dimension, {}).setdefault(self._block(key), set()).add(key)
+        cell.add(pin_id)
+
+    def remove(self, pin_id: int):
+        point = self._points.pop(pin_id, None)
+        if point is None:
+            return
+        dimension, x, z = point
+        cells = self._cells[dimension]
+        key = self._cell(x, z)
+        cells[key].discard(pin_id)
+        if not cells[key]:
+            del cells[key]
+            blocks = self._blocks[dimension]
+            block = self._block(key)
+            blocks[block].discard(key)
+            if not blocks[block]:
+                del blocks[block]
+
+    def _distance(self, pin_id: int, x: float, z: float) -> float:
+        _, px, pz = self._points[pin_id]
+        return math.hypot(px - x, pz - z)
+
+    @staticmethod
+    def _min_distance(key: Tuple[int, int], size: int, x: float, z: float) -> float:
+        """Lower bound on the distance from (x, z) to anything in the `size`-block square `key`."""
+        left, top = key[0] * size, key[1] * size
+        dx = max(left - x, 0, x - (left + size - 1))
+        dz = max(top - z, 0, z - (top + size - 1))
+        return math.hypot(dx, dz)
+
+    def within(self, dimension: str, x: int, z: int, radius: float) -> List[Tuple[float, int]]:
+        """(distance, pin_id) for every pin within `radius` blocks, closest first."""
+        cells = self._cells.get(dimension, {})
+        lo_x, lo_z = self._cell(int(x - radius), int(z - radius))
+        hi_x, hi_z = self._cell(int(x + radius), int(z + radius))
+        found = []
+        if (hi_x - lo_x + 1) * (hi_z - lo_z + 1) > len(cells):
+            keys = [key for key in cells if lo_x <= key[0] <= hi_x and lo_z <= key[1] <= hi_z]
+        else:
+            keys = [(cx, cz) for cx in range(lo_x, hi_x + 1) for cz in range(lo_z, hi_z + 1) if (cx, cz) in cells]
+        for key in keys:
+            for pin_id in cells[key]:
+                distance = self._distance(pin_id, x, z)
+                if distance <= radius:
+                    found.append((distance, pin_id))
+        found.sort()
+        return found
+
+    def box(self, dimension: str, x0: int, z0: int, x1: int, z1: int) -> List[int]:
+        """Ids of the pins with x0 <= x <= x1 and z0 <= z <= z1."""
+        cells = self._cells.get(dimension, {})
+        lo_x, lo_z = self._cell(x0, z0)
+        hi_x, hi_z = self._cell(x1, z1)
+        if (hi_x - lo_x + 1) * (hi_z - lo_z + 1) > len(cells):
+            keys = [key for key in cells if lo_x <= key[0] <= hi_x and lo_z <= key[1] <= hi_z]
+        else:
+            keys = [(cx, cz) for cx in range(lo_x, hi_x + 1) for cz in range(lo_z, hi_z + 1) if (cx, cz) in cells]
+        found = []
+        for key in keys:
+            for pin_id in cells[key]:
+                _, x, z = self._points[pin_id]
+                if x0 <= x <= x1 and z0 <= z <= z1:
+                    found.append(pin_id)
+        return found
+
+    def bounds(self, dimension: str):
+        """(min_x, min_z, max_x, max_z) of the pins in `dimension`, or None if there are none."""
+        cells = self._cells.get(dimension)
+        if not cells:
+            return None
+        points = [self._points[pin_id] for cell in cells.values() for pin_id in cell]
+        xs = [x for _, x, _ in points]
+        zs = [z for _, _, z in points]
+        return min(xs), min(zs), max(xs), max(zs)
+
+    def nearest(self, dimension: str, x: int, z: int, k: int) -> List[Tuple[float, int]]:
+        """The `k` closest pins as (distance, pin_id), closest first."""
+        cells = self._cells.get(dimension, {})
+        if not cells or k <= 0:
+            return []
+        best: List[Tuple[float, int]] = []  # max-heap of the k best, as (-distance, -pin_id)
+
+        def offer(key):
+            for pin_id in cells.get(key, ()):
+                item = (-self._distance(pin_id, x, z), -pin_id)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+        cx, cz = self._cell(x, z)
+        for ring in range(MAX_RING_SEARCH + 1):
+            if ring == 0:
+                offer((cx, cz))
+            else:
+                for i in range(-ring, ring + 1):
+                    offer((cx + i, cz - ring))
+                    offer((cx + i, cz + ring))
+                for i in range(-ring + 1, ring):
+                    offer((cx - ring, cz + i))
+                    offer((cx + ring, cz + i))
+            # Everything outside this ring is at least `ring` whole cells away
+            if len(best) == k and -best[0][0] <= ring * self.cell_size:
+                break
+        else:
+            # Sparse neighbourhood: walk occupied blocks, then their cells, nearest-first
+            block_size = self.cell_size * BLOCK_CELLS
+            frontier = [(self._min_distance(block, block_size, x, z), 1, block)
+                        for block in self._blocks[dimension]]
+            heapq.heapify(frontier)
+            while frontier:
+                bound, is_block, key = heapq.heappop(frontier)
+                if len(best) == k and bound > -best[0][0]:
+                    break
+                if is_block:
+                    for cell in self._blocks[dimension][key]:
+                        if max(abs(cell[0] - cx), abs(cell[1] - cz)) > MAX_RING_SEARCH:  # rings already did the rest
+                            heapq.heappush(frontier, (self._min_distance(cell, self.cell_size, x, z), 0, cell))
+                else:
+                    offer(key)
+
+        return sorted((-d, -pin_id) for d, pin_id in best)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class TextIndex:
+    """Inverted index over pin text: description words plus the id and user ids.
+
+    Every query word has to match (as a whole term or a prefix of one). Hits
+    are ranked by how rare the matched terms are, whole words over prefixes,
+    then newest pin first. Prefixes are resolved with a bisect over the sorted
+    vocabulary, so lookups only touch terms that actually start with them.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._terms: Dict[int, Set[str]] = {}
+        self._vocabulary: List[str] = []  # sorted
+
+    def __len__(self):
+        return len(self._terms)
+
+    def insert(self, pin_id: int, texts: Iterable[str]):
+        if pin_id in self._terms:
+            self.remove(pin_id)
+        terms = {token for text in texts for token in tokenize(text)}
+        self._terms[pin_id] = terms
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = set()
+                bisect.insort(self._vocabulary, term)
+            posting.add(pin_id)
+
+    def remove(self, pin_id: int):
+        for term in self._terms.pop(pin_id, ()):
+            posting = self._postings[term]
+            posting.discard(pin_id)
+            if not posting:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    def _expand(self, word: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, word)
+        end = bisect.bisect_left(self._vocabulary, word + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def search(self, query: str) -> List[int]:
+        """Ids of the pins matching every word of `query`, best match first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        total = len(self._terms)
+        # Rarest word first so the candidate set shrinks as fast as possible
+        expanded = sorted(((word, self._expand(word)) for word in set(words)),
+                          key=lambda item: sum(len(self._postings[t]) for t in item[1]))
+        scores: Dict[int, float] = {}
+        for position, (word, terms) in enumerate(expanded):
+            weighted = sorted((math.log(1 + total / len(self._postings[term])) * (1.0 if term == word else PREFIX_WEIGHT),
+                               term) for term in terms)
+            word_scores: Dict[int, float] = {}
+            for weight, term in weighted:  # lightest first, so a pin keeps the best weight it matched
+                posting = self._postings[term]
+                word_scores.update(dict.fromkeys(posting if position == 0 else posting & scores.keys(), weight))
+            if position == 0:
+                scores = word_scores
+            else:
+                scores = {pin_id: scores[pin_id] + score for pin_id, score in word_scores.items()}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda pin_id: (-scores[pin_id], -pin_id))
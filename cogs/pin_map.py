@@ -0,0 +1,187 @@
+import asyncio
+import io
+import math
+import multiprocessing
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+TILE_PX = 256
+MAX_ZOOM = 8  # zoom z draws 2**z blocks per pixel, so a tile covers 256 * 2**z blocks
+MAP_PX = 768  # target width/height of a rendered map
+MAX_CACHED_TILES = 512
+MAX_LABELS = 40  # past this many pins in view, only dots are drawn
+DOT_RADIUS = 4
+LABEL_CHARS = 24
+
+BACKGROUND = (24, 22, 33)
+GRID = (44, 40, 60)
+AXIS = (90, 80, 120)
+TEXT = (235, 232, 245)
+OUTLINE = (10, 8, 16)
+PALETTE = [
+    (235, 87, 87), (242, 153, 74), (242, 201, 76), (111, 207, 151), (86, 204, 242),
+    (47, 128, 237), (155, 81, 224), (187, 107, 217), (255, 138, 200), (160, 160, 160),
+]
+
+TileKey = Tuple[str, int, int, int]  # (dimension, zoom, tx, tz)
+
+
+def color_for(user_id) -> Tuple[int, int, int]:
+    """A stable color per submitter."""
+    return PALETTE[zlib.crc32(str(user_id).encode()) % len(PALETTE)]
+
+
+def tile_span(zoom: int) -> int:
+    return TILE_PX << zoom
+
+
+def zoom_for(radius: int) -> int:
+    return max(0, min(MAX_ZOOM, math.ceil(math.log2(max(2 * radius / MAP_PX, 1)))))
+
+
+def dot_margin(zoom: int) -> int:
+    """How far (in blocks) a dot can reach past its pin, so edge pins invalidate both tiles."""
+    return (DOT_RADIUS + 1) << zoom
+
+
+# --- rendering: runs in the worker process, so it only takes and returns plain data ---
+
+def render_tile(zoom: int, tx: int, tz: int, dots) -> bytes:
+    span, scale = tile_span(zoom), 1 << zoom
+    left, top = tx * span, tz * span
+    image = Image.new("RGB", (TILE_PX, TILE_PX), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    draw.line([(0, 0), (TILE_PX, 0)], fill=GRID)
+    draw.line([(0, 0), (0, TILE_PX)], fill=GRID)
+    if left <= 0 < left + span:
+        draw.line([(-left // scale, 0), (-left // scale, TILE_PX)], fill=AXIS)
+    if top <= 0 < top + span:
+        draw.line([(0, -top // scale), (TILE_PX, -top // scale)], fill=AXIS)
+    for x, z, color in dots:
+        px, py = (x - left) / scale, (z - top) / scale
+        draw.ellipse([px - DOT_RADIUS, py - DOT_RADIUS, px + DOT_RADIUS, py + DOT_RADIUS], fill=color, outline=OUTLINE)
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=False)
+    return out.getvalue()
+
+
+def render_map(job: dict) -> Tuple[bytes, Dict[TileKey, bytes]]:
+    """Compose a map from cached and freshly drawn tiles, then add labels, legend and scale.
+
+    Returns the PNG plus the tiles it had to draw, for the caller to cache.
+    """
+    zoom, scale = job["zoom"], 1 << job["zoom"]
+    span = tile_span(zoom)
+    left, top, width, height = job["left"], job["top"], job["width"], job["height"]
+    canvas = Image.new("RGB", (width, height), BACKGROUND)
+    drawn = {}
+    for key, png, dots in job["tiles"]:
+        if png is None:
+            png = drawn[key] = render_tile(zoom, key[2], key[3], dots)
+        tile = Image.open(io.BytesIO(png))
+        canvas.paste(tile, ((key[2] * span - left) // scale, (key[3] * span - top) // scale))
+
+    draw = ImageDraw.Draw(canvas)
+    font = ImageFont.load_default()
+    for x, z, text, color in job["labels"]:
+        px, py = (x - left) / scale, (z - top) / scale
+        draw.text((px + DOT_RADIUS + 3, py - 6), text, fill=color, font=font, stroke_width=2, stroke_fill=OUTLINE)
+
+    cx, cy = width // 2, height // 2
+    draw.line([(cx - 6, cy), (cx + 6, cy)], fill=TEXT)
+    draw.line([(cx, cy - 6), (cx, cy + 6)], fill=TEXT)
+
+    for i, (name, color) in enumerate(job["legend"]):
+        y = 8 + i * 16
+        draw.rectangle([8, y + 2, 18, y + 12], fill=color, outline=OUTLINE)
+        draw.text((24, y), name, fill=TEXT, font=font, stroke_width=2, stroke_fill=OUTLINE)
+
+    # Scale bar: the largest power of ten (or 5x one) that fits in a quarter of the width
+    target = width // 4 * scale
+    step = 10 ** int(math.log10(max(target, 1)))
+    blocks = step * 5 if step * 5 <= target else step
+    bar = blocks // scale
+    draw.line([(8, height - 12), (8 + bar, height - 12)], fill=TEXT, width=3)
+    draw.text((12 + bar, height - 20), f"{blocks} blocks", fill=TEXT, font=font, stroke_width=2, stroke_fill=OUTLINE)
+    draw.text((width - 8, height - 20), job["caption"], fill=TEXT, font=font, anchor="ra", stroke_width=2, stroke_fill=OUTLINE)
+
+    out = io.BytesIO()
+    canvas.save(out, format="PNG")
+    return out.getvalue(), drawn
+
+
+# --- main-process side ---
+
+class TileCache:
+    """Rendered tiles, keyed by position and the pin-set version that last touched them.
+
+    Every mark/delete bumps a global version and stamps it on each tile (at
+    every zoom) that the pin's dot overlaps. A cached tile is only reused while
+    its stamp still matches, so a change re-renders just those tiles.
+    """
+
+    def __init__(self, max_tiles: int = MAX_CACHED_TILES):
+        self.max_tiles = max_tiles
+        self.version = 0
+        self._stamps: Dict[TileKey, int] = {}
+        self._tiles: "OrderedDict[TileKey, Tuple[int, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def touch(self, dimension: str, x: int, z: int):
+        self.version += 1
+        for zoom in range(MAX_ZOOM + 1):
+            span, margin = tile_span(zoom), dot_margin(zoom)
+            for tx in range((x - margin) // span, (x + margin) // span + 1):
+                for tz in range((z - margin) // span, (z + margin) // span + 1):
+                    self._stamps[(dimension, zoom, tx, tz)] = self.version
+
+    def stamp(self, key: TileKey) -> int:
+        return self._stamps.get(key, 0)
+
+    def get(self, key: TileKey) -> Optional[bytes]:
+        cached = self._tiles.get(key)
+        if cached is None or cached[0] != self.stamp(key):
+            self.misses += 1
+            return None
+        self._tiles.move_to_end(key)
+        self.hits += 1
+        return cached[1]
+
+    def put(self, key: TileKey, stamp: int, png: bytes):
+        """Cache a tile drawn as of `stamp`; ignored if the tile was touched again while it rendered."""
+        if stamp != self.stamp(key):
+            return
+        self._tiles[key] = (stamp, png)
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+
+    def metrics(self) -> dict:
+        return {"version": self.version, "tiles": len(self._tiles), "hits": self.hits, "misses": self.misses}
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the bot process has threads (DB, I/O pools) that fork would copy mid-flight
+        _pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+async def render(job: dict) -> Tuple[bytes, Dict[TileKey, bytes]]:
+    return await asyncio.get_running_loop().run_in_executor(get_render_pool(), render_map, job)
+
+
+def close_render_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,15 +1,23 @@
 # PinPoint.py
 
+import asyncio
+import io
 import discord
 from discord.ext import commands
-from typing import Union
-import json
+from typing import Optional, Union
 import os
-import csv
 from datetime import datetime
 from discord.ext.commands import cooldown, BucketType
 
-PIN_DATA_FILE = "data/pins.json"
+from cogs.data_cache import run_io
+from cogs.pin_export import EXPORT_COLUMNS, FORMATS, export_parts
+from cogs.pin_import import dedup_key, parse_waypoints
+from cogs.pin_index import OVERWORLD, SpatialIndex, TextIndex, parse_dimension
+from cogs.pin_map import (
+    LABEL_CHARS, MAX_LABELS, TileCache, close_render_pool, color_for, dot_margin, render, tile_span, zoom_for,
+)
+from cogs.storage import get_storage
+
 SUBMITTER_MAP = {
     "1": 448896936481652777,  # you
     "2": 1234744521393307678, # vinny
@@ -17,20 +25,93 @@ SUBMITTER_MAP = {
 }
 DEV_IDS = [448896936481652777]  # you
 
-def load_pins():
-    if not os.path.exists(PIN_DATA_FILE):
-        return {}
-    with open(PIN_DATA_FILE, "r") as f:
-        return json.load(f)
+PIN_COLUMNS = "id, x, y, z, description, submitter_id, attributed_user_id, timestamp, dimension"
+NEARBY_DEFAULT_RADIUS = 256
+NEARBY_MAX_RADIUS = 10000
+NEAREST_DEFAULT_K = 5
+MAX_RESULTS = 10  # pins listed per embed
+PAGE_TIMEOUT_SECONDS = 60
+EXPORT_PART_LIMIT = int(os.getenv("PIN_EXPORT_PART_LIMIT", 8 * 1024 * 1024))  # bytes per attachment, capped by the guild's own limit
+MAP_MIN_RADIUS = 32
+MAP_MAX_RADIUS = 50000
+MAP_LEGEND_SIZE = 8
+MAX_IMPORT_BYTES = 5 * 1024 * 1024
+IMPORT_USAGE = "Attach a CSV, JSON, NDJSON, GeoJSON, Xaero `.txt` or JourneyMap `.json` file: `!importpins [@user] [dim=nether|end]`"
+EXPORT_USAGE = "Usage: `!exportpins [json|csv|ndjson|geojson ...] [gz] [@user] [since=YYYY-MM-DD] [until=YYYY-MM-DD]`"
+
+
+def split_dimension(desc: str):
+    """Pull a `dim=<name>` tag out of a pin description, e.g. "portal hub dim=nether"."""
+    words = (desc or "").split()
+    for word in words:
+        if word.lower().startswith("dim="):
+            dimension = parse_dimension(word[4:])
+            if dimension:
+                words.remove(word)
+                return dimension, " ".join(words)
+    return OVERWORLD, desc
+
+
+def pin_text(pin_id, description, submitter_id, attributed_id):
+    """What !filterpins searches: the description words plus the pin and user ids."""
+    return [description, str(pin_id), str(submitter_id), str(attributed_id)]
+
+
+def format_coords(pin) -> str:
+    coords = f"x: {pin['x']}, z: {pin['z']}" if pin.get("y") is None else f"x: {pin['x']}, y: {pin['y']}, z: {pin['z']}"
+    if pin.get("dimension", OVERWORLD) != OVERWORLD:
+        coords += f" ({pin['dimension']})"
+    return coords
 
-def save_pins(data):
-    os.makedirs(os.path.dirname(PIN_DATA_FILE), exist_ok=True)
-    with open(PIN_DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
 
 class PinPoint(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.storage = get_storage()
+        self.spatial = SpatialIndex()
+        self.text = TextIndex()
+        self.tiles = TileCache()
+
+    async def cog_load(self):
+        rows = await self.storage.fetchall(
+            "SELECT id, dimension, x, z, description, submitter_id, attributed_user_id FROM pins"
+        )
+        for row in rows:
+            self.spatial.insert(row["id"], row["dimension"], row["x"], row["z"])
+            self.text.insert(row["id"], pin_text(row["id"], row["description"], row["submitter_id"], row["attributed_user_id"]))
+        print(f"[PinPoint] Indexed {len(rows)} pins")
+
+    async def cog_unload(self):
+        close_render_pool()
+
+    async def add_pin(self, x, y, z, description, submitter_id, attributed_id, dimension=OVERWORLD) -> int:
+        description = description or ""  # pins.description is NOT NULL; the JSON store allowed none
+        cursor = await self.storage.execute(
+            "INSERT INTO pins (x, y, z, description, submitter_id, attributed_user_id, timestamp, dimension) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (x, y, z, description, str(submitter_id), str(attributed_id), datetime.utcnow().isoformat(), dimension),
+        )
+        self.spatial.insert(cursor.lastrowid, dimension, x, z)
+        self.tiles.touch(dimension, x, z)
+        self.text.insert(cursor.lastrowid, pin_text(cursor.lastrowid, description, submitter_id, attributed_id))
+        return cursor.lastrowid
+
+    async def edit_pin(self, pin, description: str):
+        await self.storage.execute("UPDATE pins SET description = ? WHERE id = ?", (description, pin["id"]))
+        self.text.insert(pin["id"], pin_text(pin["id"], description, pin["submitter_id"], pin["attributed_user_id"]))
+
+    async def delete_pin(self, pin_id: int):
+        await self.storage.execute("DELETE FROM pins WHERE id = ?", (pin_id,))
+        point = self.spatial.position(pin_id)
+        if point:
+            self.tiles.touch(*point)
+        self.spatial.remove(pin_id)
+        self.text.remove(pin_id)
+
+    async def get_pin(self, pin_id: str):
+        if not pin_id.isdigit():
+            return None
+        return await self.storage.fetchone(f"SELECT {PIN_COLUMNS} FROM pins WHERE id = ?", (int(pin_id),))
 
     @commands.command(name="mark")
     @cooldown(2, 60, BucketType.channel)
@@ -44,31 +125,16 @@ class PinPoint(commands.Cog):
     
         try:
             y = int(y_or_desc)
-            desc = description
+            desc = description or ""
         except ValueError:
             y = None
             desc = f"{y_or_desc} {description}" if description else y_or_desc
+        dimension, desc = split_dimension(desc)
     
-        pins = load_pins()
-        pin_id = str(max([int(k) for k in pins.keys()] + [0]) + 1)
-        timestamp = datetime.utcnow().isoformat()
-        submitter_id = str(ctx.author.id)
-        attributed_id = str(ctx.author.id)
-    
-        pins[pin_id] = {
-            "x": x,
-            "y": y,
-            "z": z,
-            "description": desc,
-            "submitter_id": submitter_id,
-            "attributed_user_id": attributed_id,
-            "timestamp": timestamp
-        }
-    
-        save_pins(pins)
+        pin_id = await self.add_pin(x, y, z, desc, ctx.author.id, ctx.author.id, dimension)
     
         embed = discord.Embed(title=f"📍 {desc}", color=0x462f80)
-        coord_field = f"x: {x}, z: {z}" if y is None else f"x: {x}, y: {y}, z: {z}"
+        coord_field = format_coords({"x": x, "y": y, "z": z, "dimension": dimension})
         embed.add_field(name="🧭 Coordinates", value=coord_field, inline=False)
         embed.set_footer(text=f"Submitted by {ctx.author.display_name} • ID: {pin_id}")
         await ctx.send(embed=embed)
@@ -77,27 +143,22 @@ class PinPoint(commands.Cog):
 
     @commands.command(name="pins")
     async def pins(self, ctx):
-        pins = load_pins()
-        if not pins:
+        recent = await self.storage.fetchall(f"SELECT {PIN_COLUMNS} FROM pins ORDER BY id DESC LIMIT 5")
+        if not recent:
             await ctx.send("📭 No pins found.")
             return
     
         embed = discord.Embed(title="📌 Recent Pins", color=0x462f80)
     
-        recent = sorted(pins.items(), key=lambda item: int(item[0]))[-5:]
-        for pid, p in recent:
+        for p in reversed(recent):
+            pid = p["id"]
             user_id = int(p["attributed_user_id"])
             user = self.bot.get_user(user_id)
             user_mention = user.mention if user else f"<@{user_id}>"
     
-            # Build coordinate string
-            coords = f"x: {p['x']}, z: {p['z']}"
-            if p.get("y") is not None:
-                coords = f"x: {p['x']}, y: {p['y']}, z: {p['z']}"
-    
             embed.add_field(
                 name=f"📍 {p['description']} (ID {pid})",
-                value=f"{coords} — submitted by {user_mention}",
+                value=f"{format_coords(p)} — submitted by {user_mention}",
                 inline=False
             )
     
@@ -110,28 +171,16 @@ class PinPoint(commands.Cog):
         """Add a pin for another user (admin/dev-only)."""
         try:
             y = int(y_or_desc)
-            desc = description
+            desc = description or ""
         except ValueError:
             y = None
             desc = f"{y_or_desc} {description}" if description else y_or_desc
+        dimension, desc = split_dimension(desc)
     
-        pins = load_pins()
-        pin_id = str(max([int(k) for k in pins.keys()] + [0]) + 1)
-    
-        pins[pin_id] = {
-            "x": x,
-            "y": y,
-            "z": z,
-            "description": desc,
-            "submitter_id": str(ctx.author.id),
-            "attributed_user_id": str(attributed.id),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    
-        save_pins(pins)
+        await self.add_pin(x, y, z, desc, ctx.author.id, attributed.id, dimension)
     
         embed = discord.Embed(title=f"📍 {desc}", color=0x462f80)
-        coord_field = f"x: {x}, z: {z}" if y is None else f"x: {x}, y: {y}, z: {z}"
+        coord_field = format_coords({"x": x, "y": y, "z": z, "dimension": dimension})
         attributed_display = attributed.display_name if hasattr(attributed, "display_name") else attributed
         
         embed.add_field(name="🧭 Coordinates", value=coord_field, inline=False)
@@ -152,8 +201,7 @@ class PinPoint(commands.Cog):
 
     @commands.command(name="pin")
     async def pin(self, ctx, pin_id: str):
-        pins = load_pins()
-        pin = pins.get(pin_id)
+        pin = await self.get_pin(pin_id)
         if not pin:
             await ctx.send("❌ Pin not found.")
             return
@@ -166,49 +214,70 @@ class PinPoint(commands.Cog):
         submitter_display = submitter.mention if submitter else f"<@{submitter_id}>"
         attributed_display = attributed.mention if attributed else f"<@{attributed_id}>"
     
-        coords = f"x: {pin['x']}, z: {pin['z']}"
-        if pin.get("y") is not None:
-            coords = f"x: {pin['x']}, y: {pin['y']}, z: {pin['z']}"
-    
         embed = discord.Embed(title=f"📍 {pin['description']}", color=0x462f80)
-        embed.add_field(name="🧭 Coordinates", value=coords, inline=False)
+        embed.add_field(name="🧭 Coordinates", value=format_coords(pin), inline=False)
         embed.add_field(name="👤 Submitted by", value=submitter_display, inline=True)
         embed.add_field(name="🙋 Attributed to", value=attributed_display, inline=True)
         embed.set_footer(text=f"Pin ID: {pin_id} • {pin['timestamp']}")
         await ctx.send(embed=embed)
 
 
+    async def filter_page(self, query: str, ids, page: int) -> discord.Embed:
+        pages = (len(ids) - 1) // MAX_RESULTS + 1
+        page_ids = ids[page * MAX_RESULTS:(page + 1) * MAX_RESULTS]
+        placeholders = ", ".join("?" * len(page_ids))
+        rows = await self.storage.fetchall(f"SELECT {PIN_COLUMNS} FROM pins WHERE id IN ({placeholders})", page_ids)
+        pins = {row["id"]: row for row in rows}
+
+        embed = discord.Embed(title=f"🔎 Filtered Pins (Page {page + 1}/{pages})", color=0x462f80)
+        for pid in page_ids:
+            pin = pins.get(pid)
+            if not pin:
+                continue  # deleted since the search ran
+            user = self.bot.get_user(int(pin["attributed_user_id"])) or f"<@{pin['attributed_user_id']}>"
+            embed.add_field(name=f"{pin['description']} (ID {pid})",
+                            value=f"{format_coords(pin)} — by {user}",
+                            inline=False)
+        embed.set_footer(text=f"{len(ids)} pin(s) matching \"{query}\"")
+        return embed
+
     @commands.command(name="filterpins")
     async def filterpins(self, ctx, *, query: str):
-        pins = load_pins()
-        results = []
-
-        for pid, pin in pins.items():
-            if (
-                query in pin["description"]
-                or query in pid
-                or query in pin["submitter_id"]
-                or query in pin["attributed_user_id"]
-            ):
-                results.append((pid, pin))
-
-        if not results:
+        ids = self.text.search(query)
+        if not ids:
             await ctx.send("❌ No pins matched your filter.")
             return
 
-        embed = discord.Embed(title="🔎 Filtered Pins", color=0x462f80)
-        for pid, pin in results[:10]:
-            user = self.bot.get_user(int(pin["attributed_user_id"])) or f"<@{pin['attributed_user_id']}>"
-            embed.add_field(name=f"{pin['description']} (ID {pid})",
-                            value=f"x: {pin['x']}, z: {pin['z']} — by {user}",
-                            inline=False)
+        msg = await ctx.send(embed=await self.filter_page(query, ids, 0))
 
-        await ctx.send(embed=embed)
+        pages = (len(ids) - 1) // MAX_RESULTS + 1
+        if pages > 1:
+            await msg.add_reaction("⬅️")
+            await msg.add_reaction("➡️")
+
+            def check(reaction, user):
+                return user == ctx.author and reaction.message.id == msg.id and str(reaction.emoji) in ["⬅️", "➡️"]
+
+            page = 0
+            while True:
+                try:
+                    reaction, _ = await self.bot.wait_for("reaction_add", timeout=PAGE_TIMEOUT_SECONDS, check=check)
+
+                    if str(reaction.emoji) == "➡️" and page < pages - 1:
+                        page += 1
+                    elif str(reaction.emoji) == "⬅️" and page > 0:
+                        page -= 1
+
+                    await msg.edit(embed=await self.filter_page(query, ids, page))
+                    await msg.remove_reaction(reaction, ctx.author)
+
+                except asyncio.TimeoutError:
+                    await msg.clear_reactions()
+                    break
 
     @commands.command(name="editpin")
     async def editpin(self, ctx, pin_id: str, *, new_desc: str):
-        pins = load_pins()
-        pin = pins.get(pin_id)
+        pin = await self.get_pin(pin_id)
         if not pin:
             await ctx.send("❌ Pin not found.")
             return
@@ -220,14 +289,12 @@ class PinPoint(commands.Cog):
             await ctx.send("🚫 You can't edit this pin.")
             return
     
-        pin["description"] = new_desc
-        save_pins(pins)
+        await self.edit_pin(pin, new_desc)
         await ctx.send(f"✏️ Pin `{pin_id}` updated.")
 
     @commands.command(name="deletepin")
     async def deletepin(self, ctx, pin_id: str):
-        pins = load_pins()
-        pin = pins.get(pin_id)
+        pin = await self.get_pin(pin_id)
         if not pin:
             await ctx.send("❌ Pin not found.")
             return
@@ -239,10 +306,58 @@ class PinPoint(commands.Cog):
             await ctx.send("🚫 You can't delete this pin.")
             return
 
-        del pins[pin_id]
-        save_pins(pins)
+        await self.delete_pin(pin["id"])
         await ctx.send(f"🗑️ Pin `{pin_id}` deleted.")
 
+    async def send_distance_results(self, ctx, title: str, hits):
+        """Embed of (distance, pin_id) hits, closest first."""
+        hits = hits[:MAX_RESULTS]
+        placeholders = ", ".join("?" * len(hits))
+        rows = await self.storage.fetchall(f"SELECT {PIN_COLUMNS} FROM pins WHERE id IN ({placeholders})",
+                                           [pin_id for _, pin_id in hits])
+        pins = {row["id"]: row for row in rows}
+
+        embed = discord.Embed(title=title, color=0x462f80)
+        for distance, pin_id in hits:
+            pin = pins.get(pin_id)
+            if pin:
+                embed.add_field(name=f"📍 {pin['description']} (ID {pin_id})",
+                                value=f"{format_coords(pin)} — {distance:.0f} blocks away",
+                                inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="nearby")
+    async def nearby(self, ctx, x: int, z: int, radius: int = NEARBY_DEFAULT_RADIUS, dimension: str = OVERWORLD):
+        """Pins within a radius of x z. Usage: !nearby x z [radius] [overworld|nether|end]"""
+        dim = parse_dimension(dimension)
+        if not dim:
+            await ctx.send("❗ Dimension must be overworld, nether or end.")
+            return
+        radius = max(1, min(radius, NEARBY_MAX_RADIUS))
+
+        hits = self.spatial.within(dim, x, z, radius)
+        if not hits:
+            await ctx.send(f"📭 No pins within {radius} blocks of x: {x}, z: {z}.")
+            return
+
+        shown = f"closest {MAX_RESULTS} of {len(hits)}" if len(hits) > MAX_RESULTS else str(len(hits))
+        await self.send_distance_results(ctx, f"🧭 Pins within {radius} blocks of {x}, {z} ({shown})", hits)
+
+    @commands.command(name="nearest")
+    async def nearest(self, ctx, x: int, z: int, k: int = NEAREST_DEFAULT_K, dimension: str = OVERWORLD):
+        """The k closest pins to x z. Usage: !nearest x z [k] [overworld|nether|end]"""
+        dim = parse_dimension(dimension)
+        if not dim:
+            await ctx.send("❗ Dimension must be overworld, nether or end.")
+            return
+
+        hits = self.spatial.nearest(dim, x, z, max(1, min(k, MAX_RESULTS)))
+        if not hits:
+            await ctx.send(f"📭 No pins in the {dim} yet.")
+            return
+
+        await self.send_distance_results(ctx, f"🧭 Nearest pins to {x}, {z}", hits)
+
     @commands.command(name="pinhelp", aliases=["pincmds", "pinmanual"])
     async def pinhelp(self, ctx):
         embed = discord.Embed(
@@ -250,48 +365,251 @@ class PinPoint(commands.Cog):
             description="All available location tracking commands",
             color=0x462f80
         )
-        embed.add_field(name="!mark x z description", value="Add a new pin at coordinates with a short description.", inline=False)
+        embed.add_field(name="!mark x z description", value="Add a new pin at coordinates with a short description. Add `dim=nether` or `dim=end` for other dimensions.", inline=False)
         embed.add_field(name="!pins", value="List the latest 5 pins added.", inline=False)
         embed.add_field(name="!pin ID", value="View detailed info on a specific pin.", inline=False)
-        embed.add_field(name="!filterpins query", value="Search for pins by keyword, user ID, or description.", inline=False)
+        embed.add_field(name="!filterpins query", value="Search pins by words or word beginnings in the description, pin ID or user ID. Best matches first; react ⬅️ ➡️ to page.", inline=False)
+        embed.add_field(name="!nearby x z [radius] [dimension]", value=f"Pins within a radius (default {NEARBY_DEFAULT_RADIUS} blocks), closest first.", inline=False)
+        embed.add_field(name="!nearest x z [count] [dimension]", value=f"The closest pins to a spot (default {NEAREST_DEFAULT_K}).", inline=False)
+        embed.add_field(name="!pinmap [x z [radius]] [dimension]", value="Draw pins on a map image, colored by submitter. With no coordinates it fits every pin.", inline=False)
         embed.add_field(name="!editpin ID new description", value="Edit your own or dev-assigned pin's description.", inline=False)
         embed.add_field(name="!deletepin ID", value="Delete your own or dev-assigned pin.", inline=False)
-        embed.add_field(name="!exportpins", value="Export all pins as `.json` and `.csv` files.", inline=False)
+        embed.add_field(name="!importpins [@user] [dim=]", value="Admins: bulk-add pins from an attached CSV, JSON, Xaero or JourneyMap waypoint file. Duplicates are skipped.", inline=False)
+        embed.add_field(name="!exportpins [formats] [gz] [@user] [since=] [until=]", value="Export pins as JSON and CSV, or pick `json` `csv` `ndjson` `geojson`. Add `gz` to compress, `@user` or `since=`/`until=` dates to filter.", inline=False)
         embed.set_footer(text="PinPoint • Map tracking for explorers and troublemakers 🗺️")
 
         await ctx.send(embed=embed)
 
+    async def render_map(self, dimension: str, cx: int, cz: int, radius: int):
+        """PNG of the pins within `radius` of cx/cz, plus how many tiles came from cache vs were drawn."""
+        zoom = zoom_for(radius)
+        scale, span, margin = 1 << zoom, tile_span(zoom), dot_margin(zoom)
+        left, top = (cx - radius) // scale * scale, (cz - radius) // scale * scale
+        size = -(-2 * radius // scale)
+        right, bottom = left + size * scale, top + size * scale
+
+        keys = [(dimension, zoom, tx, tz)
+                for tz in range(top // span, (bottom - 1) // span + 1)
+                for tx in range(left // span, (right - 1) // span + 1)]
+        stamps = {key: self.tiles.stamp(key) for key in keys}
+        cached = {key: self.tiles.get(key) for key in keys}
+
+        # Tiles drawn now are cached whole, so fetch pins for their full extent, not just the part in view
+        q_left, q_top, q_right, q_bottom = left, top, right, bottom
+        for key, png in cached.items():
+            if png is None:
+                q_left, q_top = min(q_left, key[2] * span), min(q_top, key[3] * span)
+                q_right, q_bottom = max(q_right, (key[2] + 1) * span), max(q_bottom, (key[3] + 1) * span)
+        ids = self.spatial.box(dimension, q_left - margin, q_top - margin, q_right + margin, q_bottom + margin)
+
+        def fetch(db):
+            rows = []
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                rows += db.execute(f"SELECT id, x, z, description, submitter_id FROM pins WHERE id IN "
+                                   f"({', '.join('?' * len(chunk))})", chunk).fetchall()
+            return rows
+
+        rows = await self.storage.run(fetch)
+
+        dots = {key: [] for key, png in cached.items() if png is None}
+        visible = []
+        for row in rows:
+            x, z = row["x"], row["z"]
+            if dots:
+                for tx in range((x - margin) // span, (x + margin) // span + 1):
+                    for tz in range((z - margin) // span, (z + margin) // span + 1):
+                        tile = dots.get((dimension, zoom, tx, tz))
+                        if tile is not None:
+                            tile.append((x, z, color_for(row["submitter_id"])))
+            if left <= x < right and top <= z < bottom:
+                visible.append(row)
+
+        labels = []
+        if len(visible) <= MAX_LABELS:
+            labels = [(row["x"], row["z"], f"#{row['id']} {row['description'][:LABEL_CHARS]}", color_for(row["submitter_id"]))
+                      for row in visible]
+        counts = {}
+        for row in visible:
+            counts[row["submitter_id"]] = counts.get(row["submitter_id"], 0) + 1
+        legend = []
+        for submitter_id in sorted(counts, key=counts.get, reverse=True)[:MAP_LEGEND_SIZE]:
+            user = self.bot.get_user(int(submitter_id))
+            legend.append((f"{user.display_name if user else submitter_id} ({counts[submitter_id]})", color_for(submitter_id)))
+
+        job = {
+            "zoom": zoom, "left": left, "top": top, "width": size, "height": size,
+            "tiles": [(key, cached[key], dots.get(key)) for key in keys],
+            "labels": labels, "legend": legend,
+            "caption": f"{dimension} | {cx}, {cz} | radius {radius} | {len(visible)} pins",  # the built-in font has no •
+        }
+        png, drawn = await render(job)
+        for key, tile in drawn.items():
+            self.tiles.put(key, stamps[key], tile)
+        return png, len(keys) - len(drawn), len(drawn)
+
+    @commands.command(name="pinmap")
+    @cooldown(2, 30, BucketType.channel)
+    async def pinmap(self, ctx, x: Optional[int] = None, z: Optional[int] = None, radius: Optional[int] = None,
+                     dimension: str = OVERWORLD):
+        """Render pins onto a map image. Usage: !pinmap [x z [radius]] [dimension]"""
+        dim = parse_dimension(dimension)
+        if not dim:
+            await ctx.send("❗ Dimension must be overworld, nether or end.")
+            return
+        if (x is None) != (z is None):
+            await ctx.send("❗ Usage: `!pinmap [x z [radius]] [dimension]`")
+            return
+
+        if x is None:
+            # No centre given: fit every pin in the dimension
+            bounds = self.spatial.bounds(dim)
+            if bounds is None:
+                await ctx.send(f"📭 No pins in the {dim} yet.")
+                return
+            x, z = (bounds[0] + bounds[2]) // 2, (bounds[1] + bounds[3]) // 2
+            radius = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) // 2 + 64
+        radius = max(MAP_MIN_RADIUS, min(radius or NEARBY_DEFAULT_RADIUS * 2, MAP_MAX_RADIUS))
+
+        async with ctx.typing():
+            png, from_cache, drawn = await self.render_map(dim, x, z, radius)
+
+        embed = discord.Embed(title=f"🗺️ Pins around {x}, {z}", color=0x462f80)
+        embed.set_image(url="attachment://pinmap.png")
+        embed.set_footer(text=f"{dim} • {from_cache} cached / {drawn} rendered tiles")
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(png), filename="pinmap.png"))
+
+    @commands.command(name="importpins")
+    @commands.has_permissions(administrator=True)
+    async def importpins(self, ctx, *options: str):
+        """Bulk-add pins from an attached waypoint file, skipping ones that already exist."""
+        attributed_id, default_dimension = ctx.author.id, OVERWORLD
+        for option in options:
+            if option.strip("<@!>").isdigit():
+                attributed_id = int(option.strip("<@!>"))
+            elif option.lower().startswith("dim=") and parse_dimension(option[4:]):
+                default_dimension = parse_dimension(option[4:])
+            else:
+                await ctx.send(f"❗ Unknown option `{option}`. {IMPORT_USAGE}")
+                return
+
+        if not ctx.message.attachments:
+            await ctx.send(f"📎 {IMPORT_USAGE}")
+            return
+        attachment = ctx.message.attachments[0]
+        if attachment.size > MAX_IMPORT_BYTES:
+            await ctx.send(f"❗ That file is too big (max {MAX_IMPORT_BYTES // (1024 * 1024)} MB).")
+            return
+
+        data = await attachment.read()
+        pins, problems = await run_io(parse_waypoints, data, attachment.filename, default_dimension)
+
+        timestamp = datetime.utcnow().isoformat()
+
+        def insert(db):
+            # Dedup and insert in one transaction, so a !mark landing mid-import can't slip between the check and the write
+            seen = {dedup_key(row) for row in db.execute("SELECT dimension, x, z, description FROM pins")}
+            added, existing, repeated = [], 0, 0
+            file_keys = set()
+            for pin in pins:
+                key = dedup_key(pin)
+                if key in file_keys:
+                    repeated += 1
+                    continue
+                file_keys.add(key)
+                if key in seen:
+                    existing += 1
+                    continue
+                cursor = db.execute(
+                    "INSERT INTO pins (x, y, z, description, submitter_id, attributed_user_id, timestamp, dimension) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (pin["x"], pin["y"], pin["z"], pin["description"], str(ctx.author.id), str(attributed_id),
+                     timestamp, pin["dimension"]),
+                )
+                added.append((cursor.lastrowid, pin))
+            return added, existing, repeated
+
+        added, existing, repeated = await self.storage.transaction(insert)
+        for pin_id, pin in added:
+            self.spatial.insert(pin_id, pin["dimension"], pin["x"], pin["z"])
+            self.tiles.touch(pin["dimension"], pin["x"], pin["z"])
+            self.text.insert(pin_id, pin_text(pin_id, pin["description"], ctx.author.id, attributed_id))
+
+        embed = discord.Embed(title=f"📥 Imported {attachment.filename}", color=0x462f80)
+        embed.add_field(name="✅ Added", value=str(len(added)), inline=True)
+        embed.add_field(name="♻️ Already pinned", value=str(existing), inline=True)
+        embed.add_field(name="🔁 Repeated in file", value=str(repeated), inline=True)
+        if problems:
+            shown = "\n".join(problems[:5]) + (f"\n…and {len(problems) - 5} more" if len(problems) > 5 else "")
+            embed.add_field(name=f"⚠️ Skipped {len(problems)} invalid", value=shown[:1024], inline=False)
+        if added:
+            embed.set_footer(text=f"New pin IDs {added[0][0]}–{added[-1][0]}")
+        await ctx.send(embed=embed)
+
+    @importpins.error
+    async def importpins_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("🚫 You need admin permissions to use this command.")
+        else:
+            await ctx.send("⚠️ An error occurred while importing pins.")
+            print(f"[PinPoint] Import failed: {error}")
+
     @commands.command(name="exportpins")
-    async def exportpins(self, ctx):
-        pins = load_pins()
-        if not pins:
+    async def exportpins(self, ctx, *options: str):
+        """Export pins as attachments. Defaults to JSON + CSV of every pin."""
+        formats, compress, where, params = [], False, [], {}
+        for option in options:
+            opt = option.lower()
+            if opt in FORMATS:
+                formats.append(opt)
+            elif opt in ("gz", "gzip"):
+                compress = True
+            elif opt.strip("<@!>").isdigit():
+                where.append("(submitter_id = :user OR attributed_user_id = :user)")
+                params["user"] = opt.strip("<@!>")
+            elif opt.startswith(("since=", "until=")):
+                key, _, value = opt.partition("=")
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    await ctx.send(f"❗ `{option}` isn't a date. {EXPORT_USAGE}")
+                    return
+                where.append("timestamp >= :since" if key == "since" else "substr(timestamp, 1, 10) <= :until")
+                params[key] = value
+            else:
+                await ctx.send(f"❗ Unknown option `{option}`. {EXPORT_USAGE}")
+                return
+
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        count = await self.storage.fetchval(f"SELECT COUNT(*) FROM pins{clause}", params)
+        if not count:
             await ctx.send("📭 No pins to export.")
             return
 
-        json_path = "/mnt/data/pin_export.json"
-        csv_path = "/mnt/data/pin_export.csv"
-
-        with open(json_path, "w") as f:
-            json.dump(pins, f, indent=4)
-
-        with open(csv_path, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["ID", "X", "Z", "Description", "Submitter", "Attributed", "Timestamp"])
-            for pid, pin in pins.items():
-                writer.writerow([
-                    pid,
-                    pin["x"],
-                    pin["z"],
-                    pin["description"],
-                    pin["submitter_id"],
-                    pin["attributed_user_id"],
-                    pin["timestamp"]
-                ])
-
-        await ctx.send("📦 Pins exported:", files=[
-            discord.File(json_path),
-            discord.File(csv_path)
-        ])
+        limit = min(EXPORT_PART_LIMIT, ctx.guild.filesize_limit) if ctx.guild else EXPORT_PART_LIMIT
+        sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM pins{clause} ORDER BY id"
+
+        def build(db):
+            # Streams straight from the cursor into in-memory parts, on the database thread
+            return [part for fmt in dict.fromkeys(formats or ["json", "csv"])
+                    for part in export_parts(db.execute(sql, params), fmt, compress, limit)]
+
+        parts = await self.storage.run(build)
+
+        # Discord takes at most 10 attachments per message, and the limit applies to the whole upload
+        batches, batch, batch_size = [], [], 0
+        for name, buffer in parts:
+            size = buffer.getbuffer().nbytes
+            if batch and (len(batch) == 10 or batch_size + size > limit):
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append(discord.File(buffer, filename=name))
+            batch_size += size
+        batches.append(batch)
+
+        for n, files in enumerate(batches):
+            text = f"📦 Exported {count} pins:" if n == 0 else f"📦 Export continued ({n + 1}/{len(batches)}):"
+            await ctx.send(text, files=files)
 
 async def setup(bot):
     await bot.add_cog(PinPoint(bot))
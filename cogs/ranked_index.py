@@ -0,0 +1,58 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+from cogs.storage import Storage
+
+
+class RankedIndex:
+    """An in-memory leaderboard: scores in a sorted array, highest first.
+
+    Score changes are a bisect to find the old entry and one to insert the new
+    one; top-k is a slice and "what rank is X" is a single bisect. The SQL
+    table stays the source of truth: the index is rebuilt from it on load and
+    fed every committed write after that.
+    """
+
+    def __init__(self, table: str, key_column: str, score_column: str):
+        self.table = table
+        self.key_column = key_column
+        self.score_column = score_column
+        self._entries: List[Tuple[float, str]] = []  # (-score, key), ascending = best first
+        self._scores: Dict[str, float] = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    async def load(self, storage: Storage):
+        rows = await storage.fetchall(f"SELECT {self.key_column} AS key, {self.score_column} AS score FROM {self.table}")
+        self._scores = {str(row["key"]): row["score"] for row in rows}
+        self._entries = sorted((-score, key) for key, score in self._scores.items())
+
+    def update(self, key, score: float):
+        key = str(key)
+        self.remove(key)
+        self._scores[key] = score
+        bisect.insort(self._entries, (-score, key))
+
+    def remove(self, key):
+        key = str(key)
+        score = self._scores.pop(key, None)
+        if score is not None:
+            del self._entries[bisect.bisect_left(self._entries, (-score, key))]
+
+    def score(self, key) -> Optional[float]:
+        return self._scores.get(str(key))
+
+    def rank(self, key) -> Optional[int]:
+        """1-based rank, ties sharing the better rank (so 1, 2, 2, 4)."""
+        score = self._scores.get(str(key))
+        if score is None:
+            return None
+        return bisect.bisect_left(self._entries, (-score,)) + 1
+
+    def rank_of_score(self, score: float) -> int:
+        """Where a score would place, for players not on the board yet."""
+        return bisect.bisect_left(self._entries, (-score,)) + 1
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        return [(key, -neg) for neg, key in self._entries[:max(k, 0)]]
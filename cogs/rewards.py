@@ -1,133 +1,256 @@
 import discord
 from discord.ext import commands, tasks
-import json
 import time
 import os
 from datetime import datetime, timedelta
-import requests
+from cogs.exaroton_api import get_client
+from cogs.mojang import MojangAPIError, get_resolver
+from cogs.storage import get_storage
+from cogs.data_cache import get_cache
+from cogs.links import get_links, is_uuid_key, uuid_key
+from cogs.ranked_index import RankedIndex
+from cogs.sessions import SessionTracker
 
-LINK_FILE = "data/mc_links.json"
 TIME_FILE = "data/mc_time.json"
 POOL_FILE = "data/credit_pool.json"
-PLAYTIME_FILE = "data/playtime_rewards.json"
 REWARD_HISTORY_FILE = "data/reward_history.json"
 DEV_USER_ID = [448896936481652777, 858462569043722271]
 COOLDOWN_SECONDS = 60
+NAME_HOLD_DAYS = 37  # Mojang holds a released name this long before another account can take it
 cooldowns = {}
 MC_LOG_CHANNEL_ID = 1387232069205233824
 
 def load_json(file):
-    if not os.path.exists(file):
-        return {}
-    with open(file, "r") as f:
-        return json.load(f)
+    return get_cache().get(file)
 
 def save_json(file, data):
-    os.makedirs(os.path.dirname(file), exist_ok=True)
-    with open(file, "w") as f:
-        json.dump(data, f, indent=4)
+    get_cache().put(file, data)
 
-def get_online_players():
-    """Returns a list of online players. Falls back to mock data if API fails."""
+async def get_online_players():
+    """Returns the list of online players, or None if the API couldn't be reached."""
     try:
-        headers = {"Authorization": f"Bearer {os.getenv('EXAROTON_TOKEN')}"}
-        server_id = os.getenv("EXAROTON_SERVER_ID")
-        url = f"https://api.exaroton.com/v1/servers/{server_id}"
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            return [p["name"] for p in data.get("players", {}).get("list", [])]
+        return (await get_client().get_server()).players
     except Exception as e:
         print(f"[Exaroton API Error] {e}")
-    # 🔧 Fallback mock data for dev/testing
-    return ["Vinny", "Lachie", "Toast"]
+        return None
+
+def format_minutes(total):
+    return f"{total // 60}h {total % 60}m"
 
 class RewardsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.storage = get_storage()
+        self.links = get_links()
+        self.sessions = SessionTracker()  # keyed like playtime rows: by UUID where we know it
+        self.playtime_ranks = RankedIndex("playtime", "player", "total_minutes")
+        self.names = {}  # playtime key -> name last seen under
+        self.keys_by_name = {}  # lowercased name -> playtime key
         self.check_playtime.start()
 
-    def cog_unload(self):
-        self.check_playtime.cancel()
-
-    # -- UUID Linking --
-    @commands.command(name="linkmc", aliases=["uuidlink", "setuuid"])
-    async def linkmc(self, ctx, mc_username: str):
-        user_id = ctx.author.id
-        now = time.time()
+    async def cog_load(self):
+        await self.links.load()
+        await self.playtime_ranks.load(self.storage)
+        for row in await self.storage.fetchall("SELECT player, name FROM playtime"):
+            self.remember_name(row["player"], row["name"] or row["player"])
+        self.reconcile_playtime_job.start()
 
-        # Cooldown check
-        if user_id not in DEV_USER_ID:
-            last_time = cooldowns.get(user_id, 0)
-            if now - last_time < COOLDOWN_SECONDS:
-                remaining = int(COOLDOWN_SECONDS - (now - last_time))
-                embed = discord.Embed(
-                    title="⏳ Slow down!",
-                    description=f"You're on cooldown. Try again in **{remaining}** seconds.",
-                    color=discord.Color.orange()
-                )
-                embed.set_footer(text="Only devs can bypass this.")
-                await ctx.send(embed=embed)
-                return
-            cooldowns[user_id] = now  # Update cooldown timestamp
-
-        # UUID fetch
-        url = f"https://api.mojang.com/users/profiles/minecraft/{mc_username}"
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            data = response.json()
-            uuid = data["id"]
-            formatted_uuid = f"{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}"
-
-            links = load_json(LINK_FILE)
-            links[str(user_id)] = {
-                "username": mc_username,
-                "uuid": uuid
-            }
-            save_json(LINK_FILE, links)
-
-            await ctx.send(f"🔗 Successfully linked your account to **{mc_username}**.")
+    async def cog_unload(self):
+        self.check_playtime.cancel()
+        self.reconcile_playtime_job.cancel()
+        await self.save_sessions(self.sessions.close_all())
+        await get_cache().flush()
+
+    # -- Player identity: playtime is keyed by UUID, so renames don't start a new record --
+    def remember_name(self, key, name):
+        old = self.names.get(key)
+        if old is not None and self.keys_by_name.get(old.lower()) == key:
+            del self.keys_by_name[old.lower()]
+        self.names[key] = name
+        self.keys_by_name[name.lower()] = key
+
+    def forget_key(self, key):
+        name = self.names.pop(key, None)
+        if name is not None and self.keys_by_name.get(name.lower()) == key:
+            del self.keys_by_name[name.lower()]
+
+    async def player_keys(self, names):
+        """name -> (playtime key, current name) for in-game names.
+
+        The key is the player's UUID, from their account link or else Mojang
+        (cached and batched); a name neither can resolve right now keys by
+        itself until reconciliation catches up with it.
+        """
+        keys, unknown = {}, []
+        for name in names:
+            link = self.links.by_username(name)
+            if link:
+                keys[name] = (uuid_key(link["uuid"]), link["username"])
+            else:
+                unknown.append(name)
+        if unknown:
+            try:
+                profiles = await get_resolver().resolve_many(unknown)
+            except MojangAPIError as e:
+                print(f"[Mojang] {e}")
+                profiles = {}
+            for name in unknown:
+                profile = profiles.get(name)
+                keys[name] = (profile.uuid, profile.name) if profile else (name, name)
+        return keys
+
+    async def find_player(self, player):
+        """Playtime key and display name for a name or UUID typed into a command."""
+        if is_uuid_key(uuid_key(player)):
+            key = uuid_key(player)
+            return key, self.names.get(key, player)
+        key = self.keys_by_name.get(player.lower())
+        if key is not None:
+            return key, self.names[key]
+        return (await self.player_keys([player]))[player]
+
+    # -- Session-based Playtime Tracker --
+    async def save_sessions(self, closed):
+        """Persist closed (player key, start, end) sessions and add them to the players' totals."""
+        closed = [(player, start, end) for player, start, end in closed if end is not None and end > start]
+        if not closed:
+            return
 
-            # Logging
-            log_channel = self.bot.get_channel(MC_LOG_CHANNEL_ID)
-            if log_channel:
-                embed = discord.Embed(
-                    title="📝 Minecraft UUID Linked",
-                    color=discord.Color.blurple()
+        def save(db):
+            db.executemany("INSERT INTO play_sessions (player, started_at, ended_at) VALUES (?, ?, ?)", closed)
+            for player, start, end in closed:
+                db.execute(
+                    """
+                    INSERT INTO playtime (player, name, total_minutes, last_seen) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (player) DO UPDATE SET total_minutes = total_minutes + excluded.total_minutes,
+                                                       last_seen = excluded.last_seen, name = excluded.name
+                    """,
+                    (player, self.names.get(player, player), round((end - start) / 60), datetime.utcfromtimestamp(end).isoformat()),
                 )
-                embed.add_field(name="User", value=f"{ctx.author} ({ctx.author.mention})", inline=False)
-                embed.add_field(name="User ID", value=f"{ctx.author.id}", inline=True)
-                embed.add_field(name="Minecraft Username", value=f"{mc_username}", inline=True)
-                embed.add_field(name="UUID", value=f"`{formatted_uuid}`", inline=False)
-                embed.set_footer(text=f"Submitted in #{ctx.channel}", icon_url=ctx.author.display_avatar.url)
-                embed.timestamp = datetime.utcnow()
-                await log_channel.send(embed=embed)
-        else:
-            await ctx.send(f"❌ Could not find Minecraft user `{mc_username}`. Please double-check spelling.")
-
+            players = {player for player, _, _ in closed}
+            return db.execute(
+                f"SELECT player, total_minutes FROM playtime WHERE player IN ({', '.join('?' * len(players))})", list(players)
+            ).fetchall()
+
+        for row in await self.storage.transaction(save):
+            self.playtime_ranks.update(row["player"], row["total_minutes"])
+
+    def live_minutes(self, player):
+        return round(self.sessions.live_seconds(player, int(time.time())) / 60)
+
+    async def online_keys(self):
+        """Playtime keys of everyone online (remembering the names they're on), or None if the API is down."""
+        online_players = await get_online_players()
+        if online_players is None:
+            return None
+        keys = await self.player_keys(online_players)
+        for name, (key, _) in keys.items():
+            self.remember_name(key, name)
+        return {key for key, _ in keys.values()}
 
-
-    # -- Simulated Playtime Tracker --
     @tasks.loop(minutes=5)
     async def check_playtime(self):
-        online_players = get_online_players()
-        now = datetime.utcnow()
-
-        data = load_json(PLAYTIME_FILE)
-        for player in online_players:
-            if player not in data:
-                data[player] = {
-                    "total_minutes": 0,
-                    "last_seen": now.isoformat()
-                }
+        online = await self.online_keys()
+        if online is None:
+            closed = self.sessions.close_all()
+        else:
+            _, closed = self.sessions.observe(online, int(time.time()))
+        await self.save_sessions(closed)
+
+    @staticmethod
+    def seen_as(legacy, owner):
+        """Whether UUID record `owner` was last seen online under `legacy`'s name, no earlier than `legacy`
+        was and within NAME_HOLD_DAYS of it: too soon for the name to have passed to another account."""
+        if (owner["name"] or "").lower() != legacy["player"].lower():
+            return False
+        try:
+            gap = datetime.fromisoformat(owner["last_seen"]) - datetime.fromisoformat(legacy["last_seen"])
+        except (TypeError, ValueError):
+            return False
+        return timedelta(0) <= gap < timedelta(days=NAME_HOLD_DAYS)
+
+    async def reconcile_playtime(self):
+        """Merge playtime still keyed by name (pre-UUID records, or players we couldn't resolve at the time)
+        into the owning UUID's record, sessions included. Returns (merged names, names left unresolved).
+
+        A linked name merges into its link's UUID; links remember the UUID behind a name even after the
+        player renames. An unlinked name only merges into the UUID Mojang gives for it if that UUID's
+        record was seen under the name right after this one (`seen_as`); names get reused, so anything
+        else is left unresolved.
+        """
+        rows = await self.storage.fetchall("SELECT player, name, last_seen FROM playtime")
+        by_key = {row["player"]: row for row in rows}
+        legacy = [row for row in rows if not is_uuid_key(row["player"])]
+        if not legacy:
+            return [], []
+        moves, unlinked = [], []
+        for row in legacy:
+            link = self.links.by_username(row["player"])
+            if link:
+                moves.append((row["player"], uuid_key(link["uuid"]), link["username"]))
             else:
-                last_seen = datetime.fromisoformat(data[player]["last_seen"])
-                elapsed = int((now - last_seen).total_seconds() / 60)
-                data[player]["total_minutes"] += elapsed
-                data[player]["last_seen"] = now.isoformat()
-
-        save_json(PLAYTIME_FILE, data)
+                unlinked.append(row)
+        if unlinked:
+            try:
+                profiles = await get_resolver().resolve_many(row["player"] for row in unlinked)
+            except MojangAPIError as e:
+                print(f"[Mojang] {e}")
+                profiles = {}
+            for row in unlinked:
+                profile = profiles.get(row["player"])
+                owner = by_key.get(profile.uuid) if profile else None
+                if owner and self.seen_as(row, owner):
+                    moves.append((row["player"], profile.uuid, profile.name))
+        names = [row["player"] for row in legacy]
+        if not moves:
+            return [], names
+
+        def merge(db):
+            for name, key, current in moves:
+                db.execute(
+                    """
+                    INSERT INTO playtime (player, name, total_minutes, last_seen)
+                        SELECT ?, ?, total_minutes, last_seen FROM playtime WHERE player = ?
+                    ON CONFLICT (player) DO UPDATE SET total_minutes = total_minutes + excluded.total_minutes,
+                                                       last_seen = MAX(last_seen, excluded.last_seen)
+                    """,
+                    (key, current, name),
+                )
+                db.execute("UPDATE play_sessions SET player = ? WHERE player = ?", (key, name))
+                db.execute("DELETE FROM playtime WHERE player = ?", (name,))
+            merged = {key for _, key, _ in moves}
+            return db.execute(
+                f"SELECT player, name, total_minutes FROM playtime WHERE player IN ({', '.join('?' * len(merged))})", list(merged)
+            ).fetchall()
+
+        for row in await self.storage.transaction(merge):
+            self.playtime_ranks.update(row["player"], row["total_minutes"])
+            self.remember_name(row["player"], row["name"])
+        for name, _, _ in moves:
+            self.playtime_ranks.remove(name)
+            self.forget_key(name)
+        merged = [name for name, _, _ in moves]
+        print(f"[Playtime] Reconciled {len(merged)} name-keyed record(s) into UUIDs, {len(names) - len(merged)} unresolved")
+        return merged, [name for name in names if name not in merged]
+
+    @tasks.loop(hours=6)
+    async def reconcile_playtime_job(self):
+        try:
+            await self.reconcile_playtime()
+        except Exception as e:
+            print(f"[Playtime] Reconciliation failed: {e}")
+
+    @commands.command(name="reconcileplaytime", aliases=["mergeplaytime"])
+    async def reconcileplaytime(self, ctx):
+        """Dev-only: merge name-keyed playtime records into their players' UUID records now."""
+        if ctx.author.id not in DEV_USER_ID:
+            return await ctx.send("🚫 Only devs can run this.")
+        merged, unresolved = await self.reconcile_playtime()
+        message = f"🔀 Merged **{len(merged)}** name-keyed record(s) into UUID records."
+        if unresolved:
+            shown = ", ".join(f"`{name}`" for name in unresolved[:20])
+            message += f"\n❔ Still unresolved ({len(unresolved)}): {shown}{' …' if len(unresolved) > 20 else ''}"
+        await ctx.send(message)
 
     @commands.command(name="forcecheck")
     async def forcecheck(self, ctx):
@@ -138,44 +261,32 @@ class RewardsCog(commands.Cog):
 
     @commands.command(name="forcecheckdry", aliases=["drycheck", "dryrun", "fdd"])
     async def forcecheckdry(self, ctx):
-        """Dry run playtime update — shows projected gains and new totals, sorted by time added."""
+        """Dry run playtime update — shows which sessions would start, continue or close, without saving."""
         if ctx.author.id not in DEV_USER_ID:
             return await ctx.send("🚫 Only devs can run dry checks.")
     
-        online_players = get_online_players()
-        if not online_players:
+        online = await self.online_keys()
+        if online is None:
+            return await ctx.send(f"⚠️ Couldn't reach the server. {len(self.sessions.open)} open session(s) would be closed.")
+        if not online and not self.sessions.open:
             return await ctx.send("<:beebo:1383282292478312519> No players online to check.")
-    
-        now = datetime.utcnow()
-        data = load_json(PLAYTIME_FILE)
+
+        now = int(time.time())
+        players = online | set(self.sessions.open)
         results = []
-    
-        for player in online_players:
-            if player not in data:
-                results.append({
-                    "name": player,
-                    "gain": 0,
-                    "new_total": 0,
-                    "note": "🆕 Would be added fresh."
-                })
+
+        for player in players:
+            total = self.playtime_ranks.score(player) or 0
+            name = self.names.get(player, player)
+            if player not in self.sessions.open:
+                results.append({"name": name, "gain": 0, "note": "🆕 Session would start."})
+                continue
+            gain = round((now - self.sessions.open[player]) / 60)
+            if player in online:
+                note = f"⏱️ In session for **{gain} min**, total so far: **{format_minutes(total + gain)}**"
             else:
-                last_seen = datetime.fromisoformat(data[player]["last_seen"])
-                elapsed = int((now - last_seen).total_seconds() / 60)
-                if elapsed > 0:
-                    new_total = data[player]["total_minutes"] + elapsed
-                    results.append({
-                        "name": player,
-                        "gain": elapsed,
-                        "new_total": new_total,
-                        "note": f"⏱️ +**{elapsed} min** ({elapsed//60}h {elapsed%60}m), total: **{new_total//60}h {new_total%60}m**"
-                    })
-                else:
-                    results.append({
-                        "name": player,
-                        "gain": 0,
-                        "new_total": data[player]["total_minutes"],
-                        "note": "🕒 Already up to date."
-                    })
+                note = f"👋 Session would close: +**{gain} min**, total: **{format_minutes(total + gain)}**"
+            results.append({"name": name, "gain": gain, "note": note})
     
         results.sort(key=lambda x: x["gain"], reverse=True)
         results = results[:10]  # Limit to top 10 for Discord embed safety
@@ -198,44 +309,46 @@ class RewardsCog(commands.Cog):
 
     @commands.command(name="playtime", aliases=["mctime", "timeplayed"])
     async def playtime(self, ctx, player_name: str = None):
-        data = load_json(PLAYTIME_FILE)
-        player_name = player_name or ctx.author.display_name
-        stats = data.get(player_name)
+        if player_name is None:
+            link = self.links.get(ctx.author.id)
+            if link is None:
+                await ctx.send("🔗 Link your Minecraft account with `!linkmc <username>` to see your playtime, or use `!playtime <username>`.")
+                return
+            key = uuid_key(link["uuid"])
+            player_name = self.names.get(key, link["username"])
+        else:
+            key, player_name = await self.find_player(player_name)
+        stored = self.playtime_ranks.score(key)
 
-        if not stats:
+        if stored is None and key not in self.sessions.open:
             await ctx.send(f"⏳ No playtime tracked yet for `{player_name}`.")
             return
 
-        total = stats["total_minutes"]
-        hours = total // 60
-        minutes = total % 60
-        await ctx.send(f"🕹️ `{player_name}` has played for **{hours}h {minutes}m**.")
+        total = (stored or 0) + self.live_minutes(key)
+        online = " (online now 🟢)" if key in self.sessions.open else ""
+        rank = self.playtime_ranks.rank_of_score(total)  # counts the live session, unlike rank()
+        await ctx.send(f"🕹️ `{player_name}` has played for **{format_minutes(total)}**{online}, #{rank} overall.")
 
     @commands.command(name="topplaytime", aliases=["leaderboard", "tophours"])
     async def topplaytime(self, ctx):
-        data = load_json(PLAYTIME_FILE)
-        if not data:
+        # Stored totals plus whatever the currently-online players have racked up this session
+        totals = dict(self.playtime_ranks.top(5))
+        for player in self.sessions.open:
+            totals[player] = (self.playtime_ranks.score(player) or 0) + self.live_minutes(player)
+        top = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:5]
+        if not top:
             await ctx.send("🏜️ No playtime data available yet.")
             return
 
-        top = sorted(data.items(), key=lambda x: x[1]["total_minutes"], reverse=True)[:5]
         embed = discord.Embed(title="🏆 Top Playtime", color=0x462f80)
-        for i, (name, stats) in enumerate(top, start=1):
-            total = stats["total_minutes"]
-            hours = total // 60
-            minutes = total % 60
-            embed.add_field(name=f"#{i}: {name}", value=f"{hours}h {minutes}m", inline=False)
+        for i, (player, total) in enumerate(top, start=1):
+            embed.add_field(name=f"#{i}: {self.names.get(player, player)}", value=format_minutes(total), inline=False)
 
         await ctx.send(embed=embed)
 
-
     @commands.command(name="unlinkmc")
     async def unlinkmc(self, ctx):
-        links = load_json(LINK_FILE)
-        user_id = str(ctx.author.id)
-        if user_id in links:
-            del links[user_id]
-            save_json(LINK_FILE, links)
+        if await self.links.delete(ctx.author.id):
             await ctx.send("❎ Your Minecraft link has been removed.")
         else:
             await ctx.send("⚠️ You don't have a Minecraft account linked.")
@@ -243,8 +356,7 @@ class RewardsCog(commands.Cog):
     @commands.command(name="rewardhistory")
     async def rewardhistory(self, ctx):
         history = load_json(REWARD_HISTORY_FILE)
-        user_id = str(ctx.author.id)
-        entries = history.get(user_id, [])
+        entries = history.get(str(ctx.author.id), [])
         if not entries:
             await ctx.send("📭 No reward history found.")
             return
@@ -256,22 +368,34 @@ class RewardsCog(commands.Cog):
 
     @commands.command(name="checkuuid")
     async def checkuuid(self, ctx, mc_username: str):
-        url = f"https://api.mojang.com/users/profiles/minecraft/{mc_username}"
-        response = requests.get(url)
-        if response.status_code != 200:
+        try:
+            profile = await get_resolver().resolve(mc_username)
+        except MojangAPIError as e:
+            print(f"[Mojang] {e}")
+            await ctx.send("⚠️ Couldn't reach Mojang right now, try again in a bit.")
+            return
+        if profile is None:
             await ctx.send(f"❌ No player found with name `{mc_username}`.")
             return
 
-        data = response.json()
-        formatted_uuid = f"{data['id'][:8]}-{data['id'][8:12]}-{data['id'][12:16]}-{data['id'][16:20]}-{data['id'][20:]}"
-        await ctx.send(f"🆔 UUID for `{mc_username}` is `{formatted_uuid}`.")
+        await ctx.send(f"🆔 UUID for `{profile.name}` is `{profile.dashed}`.")
+
+    @commands.command(name="whois", aliases=["mcwho"])
+    async def whois(self, ctx, player: str):
+        """Which Discord account a Minecraft player (name or UUID) is linked to."""
+        link = self.links.whois(player)
+        if not link:
+            await ctx.send(f"❓ `{player}` isn't linked to anyone here.")
+            return
+        status = "✅ verified" if link["verified"] else "⏳ pending verification"
+        await ctx.send(f"🔎 `{link['username']}` is <@{link['discord_id']}> ({status}).",
+                       allowed_mentions=discord.AllowedMentions.none())
 
     @commands.command(name="pooladd")
     @commands.has_permissions(administrator=True)
     async def pooladd(self, ctx, amount: float):
-        pool = load_json(POOL_FILE)
-        pool["credits"] = pool.get("credits", 0.0) + amount
-        save_json(POOL_FILE, pool)
+        async with get_cache().transaction(POOL_FILE) as pool:
+            pool["credits"] = pool.get("credits", 0.0) + amount
         await ctx.send(f"💸 Added **{amount:.2f}** credits. New pool balance: **{pool['credits']:.2f}**")
 
     @commands.command(name="linkmc", aliases=["uuidlink", "setuuid"])
@@ -294,42 +418,34 @@ class RewardsCog(commands.Cog):
                 return
             cooldowns[user_id] = now  # update
     
-        # Mojang UUID request
-        url = f"https://api.mojang.com/users/profiles/minecraft/{mc_username}"
-        response = requests.get(url)
+        # Mojang UUID lookup (cached, and batched with anyone else linking right now)
+        try:
+            profile = await get_resolver().resolve(mc_username)
+        except MojangAPIError as e:
+            print(f"[Mojang] {e}")
+            cooldowns.pop(user_id, None)  # not their fault, let them retry straight away
+            await ctx.send("⚠️ Couldn't reach Mojang right now, try again in a bit.")
+            return
     
-        if response.status_code != 200:
+        if profile is None:
             await ctx.send(f"❌ Could not find Minecraft user `{mc_username}`.")
             return
     
-        data = response.json()
-        uuid = data["id"]
-        formatted_uuid = f"{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}"
-    
-        links = load_json(LINK_FILE)
+        mc_username, uuid, formatted_uuid = profile.name, profile.uuid, profile.dashed
     
-        # Check if MC username already linked or flagged
-        for linked_id, entry in links.items():
-            if entry.get("username", "").lower() == mc_username.lower():
-                await ctx.send("❌ That Minecraft username is already claimed or under review by another Discord account.")
-    
-                # Optional logging
-                log_channel = self.bot.get_channel(MC_LOG_CHANNEL_ID)
-                if log_channel:
-                    embed = discord.Embed(title="⚠️ Link Attempt Blocked", color=discord.Color.red())
-                    embed.add_field(name="Attempted Username", value=mc_username)
-                    embed.add_field(name="By", value=f"{ctx.author} ({ctx.author.id})", inline=False)
-                    embed.timestamp = datetime.utcnow()
-                    await log_channel.send(embed=embed)
-                return
-    
-        # Flag as unverified until manually approved
-        links[str(user_id)] = {
-            "username": mc_username,
-            "uuid": uuid,
-            "verified": False
-        }
-        save_json(LINK_FILE, links)
+        # Link as unverified until manually approved, unless the MC username is already linked or flagged
+        if await self.links.claim(user_id, mc_username, uuid):
+            await ctx.send("❌ That Minecraft username is already claimed or under review by another Discord account.")
+
+            # Optional logging
+            log_channel = self.bot.get_channel(MC_LOG_CHANNEL_ID)
+            if log_channel:
+                embed = discord.Embed(title="⚠️ Link Attempt Blocked", color=discord.Color.red())
+                embed.add_field(name="Attempted Username", value=mc_username)
+                embed.add_field(name="By", value=f"{ctx.author} ({ctx.author.id})", inline=False)
+                embed.timestamp = datetime.utcnow()
+                await log_channel.send(embed=embed)
+            return
     
         await ctx.send(f"📝 Your account has been linked to **{mc_username}** and is pending verification.")
     
@@ -355,19 +471,17 @@ class RewardsCog(commands.Cog):
             await ctx.send("🚫 You don’t have permission to do this.")
             return
     
-        links = load_json(LINK_FILE)
-        user_id = str(member.id)
+        link = self.links.get(member.id)
     
-        if user_id not in links:
+        if not link:
             await ctx.send("❌ That user has no linked Minecraft account.")
             return
     
-        if links[user_id].get("verified", False):
+        if link["verified"]:
             await ctx.send("✅ This user is already verified.")
             return
     
-        links[user_id]["verified"] = True
-        save_json(LINK_FILE, links)
+        await self.links.verify(member.id)
     
         await ctx.send(f"✅ Verified **{member.display_name}**'s Minecraft link.")
     
@@ -379,8 +493,8 @@ class RewardsCog(commands.Cog):
             )
             embed.add_field(name="Verified By", value=ctx.author.mention, inline=False)
             embed.add_field(name="User", value=member.mention, inline=False)
-            embed.add_field(name="Minecraft Username", value=links[user_id].get("username", "N/A"), inline=True)
-            embed.add_field(name="UUID", value=links[user_id].get("uuid", "N/A"), inline=False)
+            embed.add_field(name="Minecraft Username", value=link["username"] or "N/A", inline=True)
+            embed.add_field(name="UUID", value=link["uuid"] or "N/A", inline=False)
             embed.set_footer(text="Manual verification complete")
             embed.timestamp = datetime.utcnow()
             await log_channel.send(embed=embed)
@@ -392,16 +506,12 @@ class RewardsCog(commands.Cog):
             await ctx.send("🚫 You don’t have permission to do this.")
             return
     
-        links = load_json(LINK_FILE)
-        user_id = str(member.id)
+        removed_entry = await self.links.delete(member.id)
     
-        if user_id not in links:
+        if not removed_entry:
             await ctx.send("❌ That user has no linked Minecraft account.")
             return
     
-        removed_entry = links.pop(user_id)
-        save_json(LINK_FILE, links)
-    
         await ctx.send(f"🗑️ Removed Minecraft link for **{member.display_name}**.")
     
         log_channel = self.bot.get_channel(MC_LOG_CHANNEL_ID)
@@ -425,19 +535,14 @@ class RewardsCog(commands.Cog):
             await ctx.send("🚫 You don’t have permission to do this.")
             return
     
-        links = load_json(LINK_FILE)
-        target_id = None
-        for uid, entry in links.items():
-            if entry.get("username", "").lower() == mc_username.lower():
-                target_id = uid
-                break
+        removed = self.links.whois(mc_username)
     
-        if not target_id:
+        if not removed:
             await ctx.send(f"❌ No Discord account is linked to `{mc_username}`.")
             return
     
-        removed = links.pop(target_id)
-        save_json(LINK_FILE, links)
+        target_id = removed["discord_id"]
+        await self.links.delete(target_id)
     
         await ctx.send(f"💥 Force-unlinked `{mc_username}` from <@{target_id}>.")
     
@@ -462,20 +567,17 @@ class RewardsCog(commands.Cog):
             await ctx.send("🚫 You don’t have permission to use this.")
             return
 
-        url = f"https://api.mojang.com/users/profiles/minecraft/{mc_username}"
-        response = requests.get(url)
-        if response.status_code != 200:
+        try:
+            profile = await get_resolver().resolve(mc_username)
+        except MojangAPIError as e:
+            await ctx.send(f"⚠️ Couldn't reach Mojang: {e}")
+            return
+        if profile is None:
             await ctx.send(f"❌ Minecraft user `{mc_username}` not found.")
             return
 
-        raw = response.json()["id"]
-        formatted_uuid = f"{raw[:8]}-{raw[8:12]}-{raw[12:16]}-{raw[16:20]}-{raw[20:]}"
-        links = load_json(LINK_FILE)
-        links[str(member.id)] = {
-            "username": mc_username,
-            "uuid": raw
-        }
-        save_json(LINK_FILE, links)
+        mc_username, formatted_uuid = profile.name, profile.dashed
+        await self.links.save(member.id, mc_username, profile.uuid)
 
         await ctx.send(f"🔧 Linked **{member.display_name}** to **{mc_username}**.")
         log_channel = self.bot.get_channel(MC_LOG_CHANNEL_ID)
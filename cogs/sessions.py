@@ -0,0 +1,48 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_SAMPLE_GAP_SECONDS = 15 * 60  # longer than this between good samples and we don't know who stayed
+
+Session = Tuple[str, int, int]  # (player, start, end), epoch seconds
+
+
+class SessionTracker:
+    """Turns successive online-player samples into play sessions.
+
+    A player who appears starts a session at that sample; one who disappears is
+    credited up to halfway between the last sample they were in and the first
+    they were missing from. A failed probe, or too long a gap since the last
+    good sample (bot downtime, a stuck loop), closes every open session at the
+    last time we actually saw the player, so unobserved time is never counted.
+    """
+
+    def __init__(self, max_gap: int = MAX_SAMPLE_GAP_SECONDS):
+        self.max_gap = max_gap
+        self.open: Dict[str, int] = {}  # player -> session start
+        self.last_sample: Optional[int] = None
+
+    def observe(self, players: Iterable[str], now: int) -> Tuple[List[str], List[Session]]:
+        """Feed one successful sample. Returns (joined players, closed sessions)."""
+        online = set(players)
+        closed: List[Session] = []
+        if self.last_sample is not None and now - self.last_sample > self.max_gap:
+            closed += self.close_all()
+        left_at = now if self.last_sample is None else (self.last_sample + now) // 2
+        for player in [p for p in self.open if p not in online]:
+            closed.append((player, self.open.pop(player), left_at))
+        joined = [p for p in online if p not in self.open]
+        for player in joined:
+            self.open[player] = now
+        self.last_sample = now
+        return joined, closed
+
+    def close_all(self) -> List[Session]:
+        """Close every open session at the last good sample (probe failed, or shutting down)."""
+        end = self.last_sample
+        closed = [(player, start, end) for player, start in self.open.items()]
+        self.open.clear()
+        return closed
+
+    def live_seconds(self, player: str, now: int) -> int:
+        """Length of the player's open session so far, or 0."""
+        start = self.open.get(player)
+        return 0 if start is None else max(0, min(now, self.last_sample or now) - start)
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from cogs.exaroton_api import STATUS_ONLINE
+
+HISTORY_DB = "data/status_history.db"
+HOUR = 3600
+DAY = 24 * HOUR
+MAX_GAP_SECONDS = 4 * HOUR  # longer than the slowest poll; anything beyond that is treated as unobserved
+RAW_RETENTION_SECONDS = 7 * DAY
+HOURLY_RETENTION_SECONDS = 90 * DAY
+DAILY_RETENTION_SECONDS = 2 * 365 * DAY
+CREDIT_RETENTION_SECONDS = 30 * DAY
+PRUNE_EVERY_SECONDS = HOUR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    ts REAL NOT NULL,
+    status INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    names TEXT NOT NULL,
+    source TEXT NOT NULL,
+    latency_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS probes_ts ON probes (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    samples INTEGER NOT NULL DEFAULT 0,
+    observed_seconds REAL NOT NULL DEFAULT 0,
+    online_seconds REAL NOT NULL DEFAULT 0,
+    player_seconds REAL NOT NULL DEFAULT 0,
+    peak_players INTEGER NOT NULL DEFAULT 0,
+    latency_sum INTEGER NOT NULL DEFAULT 0,
+    latency_count INTEGER NOT NULL DEFAULT 0,
+    names TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (period, start)
+);
+CREATE TABLE IF NOT EXISTS credit_samples (
+    ts REAL NOT NULL,
+    balance REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS credit_samples_ts ON credit_samples (ts);
+"""
+PERIODS = (("hour", HOUR), ("day", DAY))
+
+
+class StatusHistory:
+    """Append-only probe log plus hourly/daily rollups, in one SQLite file.
+
+    Rollups are updated as each probe lands: the time since the previous probe is
+    credited to the previous probe's state, split across hour/day boundaries, so
+    uptime is time-weighted no matter how often the scheduler happened to poll.
+    Raw probes are kept a week, hourly rollups 90 days, daily rollups two years.
+    Credit balance samples for the burn forecast live here too (30 days).
+    """
+
+    def __init__(self, path: str = HISTORY_DB):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._last = self._db.execute("SELECT ts, status, players FROM probes ORDER BY ts DESC LIMIT 1").fetchone()
+        self._last_prune = 0.0
+
+    # --- writes ---
+
+    def record_sync(self, status: int, names: List[str], source: str, latency_ms: Optional[int] = None, ts: float = None):
+        ts = time.time() if ts is None else ts
+        names = list(names or [])
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO probes (ts, status, players, names, source, latency_ms) VALUES (?, ?, ?, ?, ?, ?)",
+                (ts, status, len(names), json.dumps(names), source, latency_ms),
+            )
+            for period, size in PERIODS:
+                self._bump(period, int(ts // size * size), samples=1, peak=len(names), names=names, latency_ms=latency_ms)
+
+            last = self._last
+            if last and 0 < ts - last["ts"] <= MAX_GAP_SECONDS:
+                self._credit(last["ts"], ts, last["status"] == STATUS_ONLINE, last["players"])
+            self._last = {"ts": ts, "status": status, "players": len(names)}
+
+            if ts - self._last_prune >= PRUNE_EVERY_SECONDS:
+                self._prune(ts)
+
+    async def record(self, *args, **kwargs):
+        await asyncio.to_thread(self.record_sync, *args, **kwargs)
+
+    def record_credits_sync(self, balance: float, ts: float = None):
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO credit_samples (ts, balance) VALUES (?, ?)", (time.time() if ts is None else ts, balance))
+
+    def _credit(self, start: float, end: float, online: bool, players: int):
+        for period, size in PERIODS:
+            t = start
+            while t < end:
+                bucket = int(t // size * size)
+                span = min(end, bucket + size) - t
+                self._bump(period, bucket, observed=span, online=span if online else 0, player_seconds=span * players)
+                t += span
+
+    def _bump(self, period, start, samples=0, observed=0.0, online=0.0, player_seconds=0.0, peak=0, names=None, latency_ms=None):
+        row = self._db.execute("SELECT names FROM rollups WHERE period = ? AND start = ?", (period, start)).fetchone()
+        merged = sorted(set(json.loads(row["names"]) if row else []) | set(names or []))
+        self._db.execute(
+            """
+            INSERT INTO rollups (period, start, samples, observed_seconds, online_seconds, player_seconds,
+                                 peak_players, latency_sum, latency_count, names)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (period, start) DO UPDATE SET
+                samples = samples + excluded.samples,
+                observed_seconds = observed_seconds + excluded.observed_seconds,
+                online_seconds = online_seconds + excluded.online_seconds,
+                player_seconds = player_seconds + excluded.player_seconds,
+                peak_players = MAX(peak_players, excluded.peak_players),
+                latency_sum = latency_sum + excluded.latency_sum,
+                latency_count = latency_count + excluded.latency_count,
+                names = excluded.names
+            """,
+            (period, start, samples, observed, online, player_seconds, peak,
+             latency_ms or 0, 1 if latency_ms is not None else 0, json.dumps(merged)),
+        )
+
+    def _prune(self, now: float):
+        self._db.execute("DELETE FROM probes WHERE ts < ?", (now - RAW_RETENTION_SECONDS,))
+        self._db.execute("DELETE FROM rollups WHERE period = 'hour' AND start < ?", (now - HOURLY_RETENTION_SECONDS,))
+        self._db.execute("DELETE FROM rollups WHERE period = 'day' AND start < ?", (now - DAILY_RETENTION_SECONDS,))
+        self._db.execute("DELETE FROM credit_samples WHERE ts < ?", (now - CREDIT_RETENTION_SECONDS,))
+        self._last_prune = now
+
+    # --- reads ---
+
+    def rollups(self, period: str, since: float) -> List[dict]:
+        size = dict(PERIODS)[period]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM rollups WHERE period = ? AND start >= ? ORDER BY start",
+                (period, int(since // size * size)),
+            ).fetchall()
+        return [dict(row, names=json.loads(row["names"])) for row in rows]
+
+    def summary(self, period: str, since: float) -> dict:
+        """Fold a range of rollups into one set of totals."""
+        rows = self.rollups(period, since)
+        observed = sum(r["observed_seconds"] for r in rows)
+        latency_count = sum(r["latency_count"] for r in rows)
+        return {
+            "rows": rows,
+            "samples": sum(r["samples"] for r in rows),
+            "observed_seconds": observed,
+            "online_seconds": sum(r["online_seconds"] for r in rows),
+            "uptime": sum(r["online_seconds"] for r in rows) / observed if observed else None,
+            "avg_players": sum(r["player_seconds"] for r in rows) / observed if observed else 0.0,
+            "peak_players": max((r["peak_players"] for r in rows), default=0),
+            "avg_latency_ms": sum(r["latency_sum"] for r in rows) / latency_count if latency_count else None,
+            "names": sorted({name for r in rows for name in r["names"]}),
+        }
+
+    def credit_samples(self, since: float) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT ts, balance FROM credit_samples WHERE ts >= ? ORDER BY ts", (since,)
+            ).fetchall()
+
+    def online_seconds_between(self, start: float, end: float) -> float:
+        """Seconds the raw probe log says the server was online in [start, end)."""
+        with self._lock:
+            before = self._db.execute(
+                "SELECT ts, status FROM probes WHERE ts <= ? ORDER BY ts DESC LIMIT 1", (start,)
+            ).fetchall()
+            inside = self._db.execute(
+                "SELECT ts, status FROM probes WHERE ts > ? AND ts < ? ORDER BY ts", (start, end)
+            ).fetchall()
+        points = [(row["ts"], row["status"]) for row in before + inside]
+        total = 0.0
+        for (ts, status), next_ts in zip(points, [p[0] for p in points[1:]] + [end]):
+            if status == STATUS_ONLINE and next_ts - ts <= MAX_GAP_SECONDS:
+                total += next_ts - max(ts, start)
+        return total
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,36 @@
+import os
+
+STATUS_PAGE_URL = os.getenv("EXAROTON_STATUS_URL", "https://termite.exaroton.me/")
+PAGE_TIMEOUT_MS = int(os.getenv("STATUS_PAGE_TIMEOUT_MS", 15000))
+
+# Where the public Exaroton status page puts each piece; the MOTD and player list are absent while offline
+STATUS_SELECTOR = ".server-status"
+MOTD_SELECTOR = ".server-motd"
+PLAYER_SELECTOR = ".server-players .player-name"
+
+EXTRACT_JS = """
+([statusSel, motdSel, playerSel]) => {
+    const text = (el) => (el ? el.innerText : "").trim();
+    return {
+        status: text(document.querySelector(statusSel)),
+        motd: text(document.querySelector(motdSel)),
+        players: Array.from(document.querySelectorAll(playerSel), text).filter(Boolean),
+    };
+}
+"""
+
+
+async def scrape_status(page, url: str = STATUS_PAGE_URL) -> dict:
+    """Read the server's public status page in a (pooled) Playwright page.
+
+    Returns {"status", "players", "motd"}; the status is the page's own label
+    ("Online", "Offline", "Starting", ...). Navigation and selector timeouts raise.
+    """
+    await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT_MS)
+    await page.wait_for_selector(STATUS_SELECTOR, timeout=PAGE_TIMEOUT_MS)
+    scraped = await page.evaluate(EXTRACT_JS, [STATUS_SELECTOR, MOTD_SELECTOR, PLAYER_SELECTOR])
+    return {
+        "status": scraped.get("status") or "Unknown",
+        "players": scraped.get("players") or [],
+        "motd": scraped.get("motd") or "Unknown MOTD",
+    }
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+from cogs.exaroton_api import STATUS_ONLINE, OFFLINE_STATUSES
+
+POLL_FAST_SECONDS = int(os.getenv("STATUS_POLL_FAST", 30))  # around transitions / while starting or stopping
+POLL_ACTIVE_SECONDS = int(os.getenv("STATUS_POLL_ACTIVE", 60))  # online with players
+POLL_ONLINE_SECONDS = int(os.getenv("STATUS_POLL_ONLINE", 180))  # online but empty
+POLL_IDLE_MIN_SECONDS = int(os.getenv("STATUS_POLL_IDLE_MIN", 300))
+POLL_IDLE_MAX_SECONDS = int(os.getenv("STATUS_POLL_IDLE_MAX", 3 * 60 * 60))
+TRANSITION_WINDOW_SECONDS = 10 * 60
+JITTER = 0.2
+
+ONLINE = "online"
+OFFLINE = "offline"
+
+
+def classify(snapshot) -> Optional[str]:
+    """online / offline, or None while Exaroton reports a transitional state (starting, saving...)."""
+    server = getattr(snapshot, "server", None)
+    if server is not None and server.status != STATUS_ONLINE and server.status not in OFFLINE_STATUSES:
+        return None
+    return ONLINE if snapshot.online else OFFLINE
+
+
+class StatusScheduler:
+    """The one watcher for server up/down, and the owner of the announced state.
+
+    A single task polls `probe()` on an adaptive cadence: fast right after a
+    transition, steady while players are on, and backing off exponentially while
+    the server sleeps. Pushed updates (the websocket) go through `observe()` and
+    wake the loop early instead of starting a second probe.
+    """
+
+    def __init__(self, probe: Callable[[], Awaitable[object]], on_change: Callable[[str, object], Awaitable[None]],
+                 state: str = OFFLINE):
+        self.probe = probe
+        self.on_change = on_change
+        self.state = state
+        self.changed_at = 0.0
+        self.last_snapshot = None
+        self.last_probe_at: Optional[float] = None
+        self.next_probe_at: Optional[float] = None
+        self.interval = POLL_FAST_SECONDS
+        self.probe_count = 0
+        self.failures = 0
+        self._transitional = False
+        self._idle_streak = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def poke(self):
+        """Probe now rather than at the next scheduled tick."""
+        self._wake.set()
+
+    async def observe(self, snapshot):
+        """Feed one observation in; announces through `on_change` if the state flipped."""
+        async with self._lock:
+            self.last_snapshot = snapshot
+            new_state = classify(snapshot)
+            self._transitional = new_state is None
+            if new_state is None or new_state == self.state:
+                return False
+            print(f"[Status Scheduler] {self.state} -> {new_state}")
+            self.state = new_state
+            self.changed_at = time.time()
+            self._idle_streak = 0
+            try:
+                await self.on_change(new_state, snapshot)
+            except Exception as e:
+                print(f"[Status Scheduler] Announce failed: {e}")
+        # Reschedule around the new state instead of sleeping out the old interval
+        self.poke()
+        return True
+
+    def next_interval(self) -> float:
+        recently_changed = time.time() - self.changed_at < TRANSITION_WINDOW_SECONDS
+        if self._transitional or recently_changed:
+            return POLL_FAST_SECONDS
+        if self.state == ONLINE:
+            players = getattr(self.last_snapshot, "players", None)
+            return POLL_ACTIVE_SECONDS if players else POLL_ONLINE_SECONDS
+        return min(POLL_IDLE_MIN_SECONDS * 2 ** self._idle_streak, POLL_IDLE_MAX_SECONDS)
+
+    async def _tick(self):
+        self.probe_count += 1
+        self.last_probe_at = time.time()
+        try:
+            snapshot = await self.probe()
+        except Exception as e:
+            self.failures += 1
+            print(f"[Status Scheduler] Probe failed: {e}")
+            return
+        changed = await self.observe(snapshot)
+        if not changed and self.state == OFFLINE and not self._transitional:
+            self._idle_streak += 1
+
+    async def _run(self):
+        while True:
+            await self._tick()
+            self._wake.clear()  # the tick itself already saw anything that poked it
+
+            self.interval = self.next_interval()
+            delay = random.uniform(self.interval * (1 - JITTER), self.interval * (1 + JITTER))
+            self.next_probe_at = time.time() + delay
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+DB_FILE = "data/beebo.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pins (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ids are never reused, even after the newest pin is deleted
+    x INTEGER NOT NULL,
+    y INTEGER,
+    z INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    submitter_id TEXT NOT NULL,
+    attributed_user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    dimension TEXT NOT NULL DEFAULT 'overworld'
+);
+CREATE INDEX IF NOT EXISTS pins_submitter ON pins (submitter_id);
+CREATE INDEX IF NOT EXISTS pins_attributed ON pins (attributed_user_id);
+CREATE TABLE IF NOT EXISTS mc_links (
+    discord_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    verified INTEGER
+);
+CREATE INDEX IF NOT EXISTS mc_links_username ON mc_links (username COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS playtime (
+    player TEXT PRIMARY KEY,  -- undashed UUID; a name until reconciliation can resolve it
+    total_minutes INTEGER NOT NULL DEFAULT 0,
+    last_seen TEXT NOT NULL,
+    name TEXT  -- last name the player was seen under
+);
+CREATE INDEX IF NOT EXISTS playtime_total ON playtime (total_minutes DESC);
+CREATE TABLE IF NOT EXISTS play_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL,  -- same key as playtime.player
+    started_at INTEGER NOT NULL,  -- epoch seconds
+    ended_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS play_sessions_player ON play_sessions (player, started_at);
+CREATE TABLE IF NOT EXISTS donations (
+    user_id TEXT PRIMARY KEY,
+    total REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS donations_total ON donations (total DESC);
+CREATE TABLE IF NOT EXISTS elo (
+    user_id TEXT PRIMARY KEY,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS elo_score ON elo (score DESC);
+CREATE TABLE IF NOT EXISTS match_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    match_id TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS match_history_slug_user ON match_history (slug, user_id);
+CREATE TABLE IF NOT EXISTS suggestions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS challenges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS challenge_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    challenge_id INTEGER NOT NULL REFERENCES challenges (id) ON DELETE CASCADE,
+    user TEXT NOT NULL,
+    proof TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS challenge_entries_challenge ON challenge_entries (challenge_id);
+"""
+
+
+# Columns added after a table first shipped: (table, column, definition), applied with ALTER TABLE if missing
+SCHEMA_UPGRADES = (
+    ("pins", "dimension", "TEXT NOT NULL DEFAULT 'overworld'"),
+    ("playtime", "name", "TEXT"),
+)
+
+# Pins tables created before ids were AUTOINCREMENT are copied into a fresh one from SCHEMA.
+# sqlite_sequence then starts at the current highest id and only ever goes up.
+PINS_REBUILD = f"""
+BEGIN;
+ALTER TABLE pins RENAME TO pins_old;
+DROP INDEX pins_submitter;
+DROP INDEX pins_attributed;
+{SCHEMA}
+INSERT INTO pins (id, x, y, z, description, submitter_id, attributed_user_id, timestamp, dimension)
+    SELECT id, x, y, z, description, submitter_id, attributed_user_id, timestamp, dimension FROM pins_old;
+DROP TABLE pins_old;
+COMMIT;
+"""
+
+
+# --- one-shot JSON import ---
+
+def _import_pins(db, data):
+    db.executemany(
+        "INSERT OR REPLACE INTO pins (id, x, y, z, description, submitter_id, attributed_user_id, timestamp) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(int(pid), p["x"], p.get("y"), p["z"], p.get("description") or "", str(p.get("submitter_id", "")),
+          str(p.get("attributed_user_id", p.get("submitter_id", ""))), p.get("timestamp", "")) for pid, p in data.items()],
+    )
+
+
+def _import_links(db, data):
+    db.executemany(
+        "INSERT OR REPLACE INTO mc_links (discord_id, username, uuid, verified) VALUES (?, ?, ?, ?)",
+        [(uid, e.get("username", ""), e.get("uuid", ""), None if "verified" not in e else int(bool(e["verified"])))
+         for uid, e in data.items()],
+    )
+
+
+def _import_playtime(db, data):
+    db.executemany(
+        "INSERT OR REPLACE INTO playtime (player, total_minutes, last_seen) VALUES (?, ?, ?)",
+        [(name, s.get("total_minutes", 0), s.get("last_seen", "")) for name, s in data.items()],
+    )
+
+
+def _import_donations(db, data):
+    db.executemany("INSERT OR REPLACE INTO donations (user_id, total) VALUES (?, ?)", list(data.items()))
+
+
+def _import_elo(db, data):
+    db.executemany("INSERT OR REPLACE INTO elo (user_id, score) VALUES (?, ?)", list(data.items()))
+
+
+def _import_match_history(db, data):
+    db.executemany(
+        "INSERT INTO match_history (slug, user_id, match_id, opponent, result) VALUES (?, ?, ?, ?, ?)",
+        [(slug, uid, str(e["match_id"]), str(e["opponent"]), e["result"])
+         for slug, users in data.items() for uid, entries in users.items() for e in entries],
+    )
+
+
+def _import_suggestions(db, data):
+    db.executemany(
+        "INSERT INTO suggestions (user, user_id, message, timestamp) VALUES (?, ?, ?, ?)",
+        [(s.get("user", ""), s.get("user_id", 0), s.get("message", ""), s.get("timestamp", "")) for s in data],
+    )
+
+
+def _import_challenges(db, data):
+    for name, entries in data.items():
+        db.execute("INSERT OR IGNORE INTO challenges (name) VALUES (?)", (name,))
+        challenge_id = db.execute("SELECT id FROM challenges WHERE name = ?", (name,)).fetchone()[0]
+        db.executemany(
+            "INSERT INTO challenge_entries (challenge_id, user, proof, timestamp) VALUES (?, ?, ?, ?)",
+            [(challenge_id, e.get("user", ""), e.get("proof", ""), e.get("timestamp", "")) for e in entries],
+        )
+
+
+JSON_MIGRATIONS = (
+    ("data/pins.json", _import_pins),
+    ("data/mc_links.json", _import_links),
+    ("data/playtime_rewards.json", _import_playtime),
+    ("data/exaroton_donations.json", _import_donations),
+    ("data/elo_scores.json", _import_elo),
+    ("data/match_history.json", _import_match_history),
+    ("suggestions.json", _import_suggestions),
+    ("data/challenges.json", _import_challenges),
+)
+
+
+def _params(params):
+    return params if isinstance(params, dict) else tuple(params)
+
+
+class Storage:
+    """The bot's SQLite database (WAL mode), driven from one dedicated thread.
+
+    Every query runs on that thread, so callers never block the event loop and
+    writes are naturally serialized. The schema is created and any legacy JSON
+    files are imported the first time the database is opened.
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="beebo-db")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            db.executescript(SCHEMA)
+            self._upgrade_schema(db)
+            self._db = db
+            self._migrate_json()
+        return self._db
+
+    @staticmethod
+    def _upgrade_schema(db: sqlite3.Connection):
+        for table, column, definition in SCHEMA_UPGRADES:
+            if column not in {row["name"] for row in db.execute(f"PRAGMA table_info({table})")}:
+                with db:
+                    db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                print(f"[Storage] Added {table}.{column}")
+
+        pins_sql = db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'pins'").fetchone()[0]
+        if "AUTOINCREMENT" not in pins_sql.upper():
+            try:
+                db.executescript(PINS_REBUILD)
+            except sqlite3.Error:
+                if db.in_transaction:
+                    db.rollback()
+                raise
+            print("[Storage] Rebuilt pins with AUTOINCREMENT ids")
+
+    def _migrate_json(self):
+        for path, importer in JSON_MIGRATIONS:
+            key = f"migrated:{path}"
+            if not os.path.exists(path) or self._db.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                with self._db:
+                    importer(self._db, data)
+                    self._db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, path + ".migrated"))
+                os.replace(path, path + ".migrated")
+                print(f"[Storage] Imported {path} into {self.path}")
+            except Exception as e:
+                print(f"[Storage] Failed to import {path}: {e}")
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run `fn(connection)` on the database thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self._connect()))
+
+    async def transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Like `run`, but commits everything `fn` does atomically (or none of it)."""
+        def wrapped(db):
+            with db:
+                return fn(db)
+        return await self.run(wrapped)
+
+    async def execute(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        def op(db):
+            with db:
+                return db.execute(sql, _params(params))
+        return await self.run(op)
+
+    async def executemany(self, sql: str, rows: Iterable[Iterable]):
+        def op(db):
+            with db:
+                db.executemany(sql, [tuple(r) for r in rows])
+        await self.run(op)
+
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[dict]:
+        row = await self.run(lambda db: db.execute(sql, _params(params)).fetchone())
+        return dict(row) if row else None
+
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[dict]:
+        rows = await self.run(lambda db: db.execute(sql, _params(params)).fetchall())
+        return [dict(row) for row in rows]
+
+    async def fetchval(self, sql: str, params: Iterable = (), default=None):
+        row = await self.run(lambda db: db.execute(sql, _params(params)).fetchone())
+        return row[0] if row and row[0] is not None else default
+
+    async def close(self):
+        if self._db is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
+
+
+_storage: Optional[Storage] = None
+
+
+def get_storage() -> Storage:
+    global _storage
+    if _storage is None:
+        _storage = Storage()
+    return _storage
+
+
+async def close_storage():
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None